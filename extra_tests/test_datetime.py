@@ -83,6 +83,18 @@ def test_strptime():
     got = datetime.datetime.strptime(string, format)
     assert expected == got
 
+def test_strptime_subclass_new():
+    class MyDatetime(datetime.datetime):
+        def __new__(cls, year, month, day, hour=0, minute=0, second=0,
+                    microsecond=0, tzinfo=None):
+            return datetime.datetime.__new__(cls, year, month, day, hour,
+                                             minute, second, microsecond)
+    for format in ['%Y-%m-%d %H:%M:%S.%f', '%d %B %Y']:
+        string = datetime.datetime(2004, 12, 1, 13, 2, 47).strftime(format)
+        got = MyDatetime.strptime(string, format)
+        assert type(got) is MyDatetime
+        assert got == datetime.datetime.strptime(string, format)
+
 def test_datetime_rounding():
     b = 0.0000001
     a = 0.9999994
@@ -389,3 +389,69 @@ def test_description_delete():
         ("x", None, None, None, None, None, None),
         ("y", None, None, None, None, None, None),
     )
+
+
+def test_adapter_for_builtin_type(con):
+    # the common types are bound without calling adapt(), unless an
+    # adapter is registered for them
+    _sqlite3.register_adapter(int, lambda x: x * 2)
+    try:
+        cur = con.execute("select ?, ?", (21, 1.5))
+        assert cur.fetchall() == [(42, 1.5)]
+    finally:
+        del _sqlite3.adapters[(int, _sqlite3.PrepareProtocol)]
+    cur = con.execute("select ?", (21,))
+    assert cur.fetchall() == [(21,)]
+
+
+def test_fetchmany_row_factory(con):
+    con.execute("create table foo (x int)")
+    con.executemany("insert into foo values (?)", [(i,) for i in range(5)])
+    cur = con.execute("select x from foo")
+    cur.row_factory = lambda cursor, row: row[0]
+    assert cur.fetchmany(2) == [0, 1]
+    assert cur.fetchmany(0) == [2, 3, 4]
+    assert cur.fetchall() == []
+    cur.close()
+    with pytest.raises(_sqlite3.ProgrammingError):
+        cur.fetchmany(2)
+
+
+def test_fetch_columns(con):
+    con.execute("create table foo (x int, y real, z text)")
+    con.executemany("insert into foo values (?, ?, ?)",
+                    [(i, i / 2.0, str(i)) for i in range(5)])
+    cur = con.execute("select x, y, z from foo")
+    assert cur.fetch_columns(2) == [[0, 1], [0.0, 0.5], [u'0', u'1']]
+    assert cur.fetchone() == (2, 1.0, u'2')
+    assert cur.fetch_columns() == [[3, 4], [1.5, 2.0], [u'3', u'4']]
+    assert cur.fetch_columns() == []
+    cur = con.execute("select x from foo where x > 10")
+    assert cur.fetch_columns() == []
+    cur = con.cursor()
+    assert cur.fetch_columns() == []
+    cur = con.execute("select x from foo")
+    cur.row_factory = lambda cursor, row: row[0]
+    assert cur.fetch_columns(1) == [[0]]
+    assert cur.fetchone() == 1
+    assert cur.fetch_columns(0) == []
+    assert cur.fetch_columns(-1) == [[2, 3, 4]]
+    assert cur.fetch_columns(-1) == []
+
+
+def test_fetch_columns_converters():
+    con = _sqlite3.connect(":memory:", detect_types=_sqlite3.PARSE_DECLTYPES)
+    _sqlite3.register_converter("twice", lambda s: int(s) * 2)
+    try:
+        con.execute("create table foo (x twice, y int)")
+        con.executemany("insert into foo values (?, ?)",
+                        [(1, 1), (None, 2), (3, 3)])
+        cur = con.execute("select x, y from foo")
+        assert cur.fetch_columns() == [[2, None, 6], [1, 2, 3]]
+        con.execute("insert into foo values ('x', 4)")
+        cur = con.execute("select x, y from foo")
+        with pytest.raises(ValueError):
+            cur.fetch_columns()
+    finally:
+        del _sqlite3.converters["TWICE"]
+        con.close()
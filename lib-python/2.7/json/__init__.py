@@ -182,7 +182,8 @@ def dump(obj, fp, skipkeys=False, ensure_ascii=True, check_circular=True,
         check_circular and allow_nan and
         cls is None and indent is None and separators is None and
         encoding == 'utf-8' and default is None and not sort_keys and not kw):
-        iterable = _default_encoder.iterencode(obj)
+        _default_encoder._encode_to(obj, fp.write)
+        return
     else:
         if cls is None:
             cls = JSONEncoder
@@ -206,6 +206,11 @@ class JSONEncoder(object):
         '{"foo": ["bar", "baz"]}'
 
         """
+        if self.__can_encode_natively():
+            return _pypyjson_encode(o, self.__encode_fallback,
+                                    self.check_circular, self.allow_nan,
+                                    self.skipkeys, self.item_separator,
+                                    self.key_separator)
         if self.check_circular:
             markers = {}
         else:
@@ -217,6 +222,37 @@ class JSONEncoder(object):
         self.__encode(o, markers, builder, 0)
         return builder.build()
 
+    def _encode_to(self, o, write):
+        # like 'for chunk in self.iterencode(o): write(chunk)', but
+        # using the native encoder when possible
+        if self.__can_encode_natively():
+            _pypyjson_encode(o, self.__encode_fallback,
+                             self.check_circular, self.allow_nan,
+                             self.skipkeys, self.item_separator,
+                             self.key_separator, write)
+        else:
+            for chunk in self.iterencode(o):
+                write(chunk)
+
+    def __can_encode_natively(self):
+        return (_pypyjson_encode is not None and self.ensure_ascii and
+                self.indent is None and not self.sort_keys and
+                self.encoding == 'utf-8' and
+                type(self.item_separator) is str and
+                type(self.key_separator) is str)
+
+    def __encode_fallback(self, o):
+        # called by _pypyjson.encode() for the objects it does not handle
+        # itself, e.g. subclasses of the builtin types or objects that
+        # need self.default()
+        if self.check_circular:
+            markers = {}
+        else:
+            markers = None
+        builder = StringBuilder()
+        self.__encode(o, markers, builder, 0)
+        return builder.build()
+
     def __emit_indent(self, builder, _current_indent_level):
         if self.indent is not None:
             _current_indent_level += 1
@@ -536,3 +572,7 @@ try:
     from _pypyjson import raw_encode_basestring_ascii
 except ImportError:
     pass
+try:
+    from _pypyjson import encode as _pypyjson_encode
+except ImportError:
+    _pypyjson_encode = None
@@ -50,6 +50,16 @@ else:
 
 from _sqlite3_cffi import ffi as _ffi, lib as _lib
 
+# the per-row and per-parameter work is done at interp-level if possible
+try:
+    import _pypysqlite3
+except ImportError:
+    _pypysqlite3 = None
+else:
+    if (_pypysqlite3.sqlite_version_number() !=
+            _lib.sqlite3_libversion_number()):
+        _pypysqlite3 = None   # not linked to the same libsqlite3
+
 exported_sqlite_symbols = [
     'SQLITE_ALTER_TABLE',
     'SQLITE_ANALYZE',
@@ -770,44 +780,53 @@ class Cursor(object):
 
             self.__row_cast_map.append(converter)
 
+    def __get_row_cast_map(self):
+        if self.__connection._detect_types:
+            return self.__row_cast_map
+        return None
+
+    def __get_core_text_factory(self):
+        text_factory = self.__connection.text_factory
+        if text_factory is _unicode_text_factory:
+            return None    # _pypysqlite3 decodes from UTF-8 itself
+        return text_factory
+
     def __fetch_one_row(self):
-        num_cols = _lib.sqlite3_data_count(self.__statement._statement)
+        statement = self.__statement._statement
+        row_cast_map = self.__get_row_cast_map()
+        if _pypysqlite3 is not None:
+            return _pypysqlite3.fetch_row(statement,
+                                          self.__get_core_text_factory(),
+                                          row_cast_map)
+        num_cols = _lib.sqlite3_data_count(statement)
         row = newlist_hint(num_cols)
+        text_factory = self.__connection.text_factory
         for i in xrange(num_cols):
-            if self.__connection._detect_types:
-                converter = self.__row_cast_map[i]
-            else:
-                converter = None
-
-            if converter is not None:
-                blob = _lib.sqlite3_column_blob(self.__statement._statement, i)
-                if not blob:
-                    val = None
-                else:
-                    blob_len = _lib.sqlite3_column_bytes(self.__statement._statement, i)
-                    val = _ffi.buffer(blob, blob_len)[:]
-                    val = converter(val)
+            if row_cast_map is not None and row_cast_map[i] is not None:
+                val = _fetch_converted_column(statement, i, row_cast_map[i])
             else:
-                typ = _lib.sqlite3_column_type(self.__statement._statement, i)
-                if typ == _lib.SQLITE_NULL:
-                    val = None
-                elif typ == _lib.SQLITE_INTEGER:
-                    val = _lib.sqlite3_column_int64(self.__statement._statement, i)
-                    val = int(val)
-                elif typ == _lib.SQLITE_FLOAT:
-                    val = _lib.sqlite3_column_double(self.__statement._statement, i)
-                elif typ == _lib.SQLITE_TEXT:
-                    text = _lib.sqlite3_column_text(self.__statement._statement, i)
-                    text_len = _lib.sqlite3_column_bytes(self.__statement._statement, i)
-                    val = _ffi.buffer(text, text_len)[:]
-                    val = self.__connection.text_factory(val)
-                elif typ == _lib.SQLITE_BLOB:
-                    blob = _lib.sqlite3_column_blob(self.__statement._statement, i)
-                    blob_len = _lib.sqlite3_column_bytes(self.__statement._statement, i)
-                    val = _BLOB_TYPE(_ffi.buffer(blob, blob_len)[:])
+                val = _fetch_column(statement, i, text_factory)
             row.append(val)
         return tuple(row)
 
+    def __step_row(self):
+        # step the statement and return the new row, or None at the end
+        statement = self.__statement
+        if _pypysqlite3 is not None:
+            ret = _pypysqlite3.step_row(statement._statement,
+                                        self.__get_core_text_factory(),
+                                        self.__get_row_cast_map())
+            if type(ret) is tuple:
+                return ret
+        else:
+            ret = _lib.sqlite3_step(statement._statement)
+            if ret == _lib.SQLITE_ROW:
+                return self.__fetch_one_row()
+        statement._reset()
+        if ret != _lib.SQLITE_DONE:
+            raise self.__connection._get_exception(ret)
+        return None
+
     def __execute(self, multiple, sql, many_params):
         self.__locked = True
         self._reset = False
@@ -948,6 +967,9 @@ class Cursor(object):
     def __next__(self):
         self.__check_cursor()
         self.__check_reset()
+        return self.__fetch_next()
+
+    def __fetch_next(self):
         if not self.__statement:
             raise StopIteration
 
@@ -960,13 +982,9 @@ class Cursor(object):
         if self.row_factory is not None:
             next_row = self.row_factory(self, next_row)
 
-        ret = _lib.sqlite3_step(self.__statement._statement)
-        if ret == _lib.SQLITE_ROW:
-            self.__next_row = self.__fetch_one_row()
-        else:
-            self.__statement._reset()
-            if ret != _lib.SQLITE_DONE:
-                raise self.__connection._get_exception(ret)
+        row = self.__step_row()
+        if row is not None:
+            self.__next_row = row
         return next_row
 
     if sys.version_info[0] < 3:
@@ -979,15 +997,59 @@ class Cursor(object):
     def fetchmany(self, size=None):
         if size is None:
             size = self.arraysize
+        # check the cursor once, instead of once per row in next()
+        self.__check_cursor()
+        self.__check_reset()
         lst = []
-        for row in self:
-            lst.append(row)
-            if len(lst) == size:
-                break
+        try:
+            while True:
+                lst.append(self.__fetch_next())
+                if len(lst) == size:
+                    break
+        except StopIteration:
+            pass
         return lst
 
     def fetchall(self):
-        return list(self)
+        return self.fetchmany(-1)
+
+    def fetch_columns(self, size=None):
+        """Fetch up to 'size' rows, or all the remaining rows if 'size' is
+        None or negative, and return them as a list with one list per
+        column.  If no rows are left, or if 'size' is 0, return an empty
+        list, like fetchall().  The row_factory is not used.  Columns of
+        integers or floats are stored compactly.
+
+        If a converter raises, the rows that this call already fetched are
+        lost, as they are with fetchmany().
+        """
+        self.__check_cursor()
+        self.__check_reset()
+        if not self.__statement or size == 0:
+            return []
+        if size is not None and size < 0:
+            size = None
+        try:
+            first_row = self.__next_row
+        except AttributeError:
+            return []
+        del self.__next_row
+        columns = [[val] for val in first_row]
+        num_cols = len(columns)
+        count = 1
+        while size is None or count < size:
+            row = self.__step_row()
+            if row is None:
+                break
+            for i in xrange(num_cols):
+                columns[i].append(row[i])
+            count += 1
+        else:
+            # keep the next row for the next fetch, like execute() does
+            row = self.__step_row()
+            if row is not None:
+                self.__next_row = row
+        return columns
 
     def __get_connection(self):
         self.__check_cursor()
@@ -1123,10 +1185,19 @@ class Statement(object):
                             "just switch your application to Unicode strings.")
 
     def __set_param(self, idx, param):
-        try:
-            param = adapt(param)
-        except:
-            pass  # And use previous value
+        # the common types are bound directly, unless an adapter was
+        # registered for them
+        if (type(param) not in _BINDABLE_TYPES or
+                (type(param), PrepareProtocol) in adapters):
+            try:
+                param = adapt(param)
+            except:
+                pass  # And use previous value
+
+        if _pypysqlite3 is not None:
+            if isinstance(param, str) and not isinstance(param, unicode):
+                self.__check_decodable(param)
+            return _pypysqlite3.bind_param(self._statement, idx, param)
 
         if param is None:
             rc = _lib.sqlite3_bind_null(self._statement, idx)
@@ -1236,6 +1307,32 @@ class Row(object):
         return hash(tuple(self.description)) ^ hash(tuple(self.values))
 
 
+def _fetch_column(statement, i, text_factory):
+    typ = _lib.sqlite3_column_type(statement, i)
+    if typ == _lib.SQLITE_NULL:
+        return None
+    elif typ == _lib.SQLITE_INTEGER:
+        return int(_lib.sqlite3_column_int64(statement, i))
+    elif typ == _lib.SQLITE_FLOAT:
+        return _lib.sqlite3_column_double(statement, i)
+    elif typ == _lib.SQLITE_TEXT:
+        text = _lib.sqlite3_column_text(statement, i)
+        text_len = _lib.sqlite3_column_bytes(statement, i)
+        return text_factory(_ffi.buffer(text, text_len)[:])
+    elif typ == _lib.SQLITE_BLOB:
+        blob = _lib.sqlite3_column_blob(statement, i)
+        blob_len = _lib.sqlite3_column_bytes(statement, i)
+        return _BLOB_TYPE(_ffi.buffer(blob, blob_len)[:])
+
+
+def _fetch_converted_column(statement, i, converter):
+    blob = _lib.sqlite3_column_blob(statement, i)
+    if not blob:
+        return None
+    blob_len = _lib.sqlite3_column_bytes(statement, i)
+    return converter(_ffi.buffer(blob, blob_len)[:])
+
+
 def _check_remaining_sql(s):
     state = "NORMAL"
     for char in s:
@@ -1333,6 +1430,8 @@ def _function_callback(real_cb, context, nargs, c_params):
 
 converters = {}
 adapters = {}
+# types that adapt() leaves alone, if there is no adapter for them
+_BINDABLE_TYPES = frozenset([type(None), bool, int, long, float, unicode, str])
 
 
 class PrepareProtocol(object):
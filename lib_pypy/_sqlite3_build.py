@@ -104,6 +104,7 @@ static void *const SQLITE_TRANSIENT;
 #define SQLITE_FUNCTION ...
 
 const char *sqlite3_libversion(void);
+int sqlite3_libversion_number(void);
 
 typedef ... sqlite3;
 typedef ... sqlite3_stmt;
@@ -23,6 +23,11 @@ import struct as _struct
 
 # for cpyext, use these as base classes
 from __pypy__._pypydatetime import dateinterop, deltainterop, timeinterop
+# the calendar arithmetic and ISO formatting are done at interp-level
+from __pypy__._pypydatetime import (ymd2ord as _ymd2ord,
+    ord2ymd as _ord2ymd, format_date as _format_date,
+    format_time as _format_time, parse_datetime as _parse_datetime,
+    set_result_types as _set_result_types)
 
 _SENTINEL = object()
 
@@ -60,11 +65,6 @@ def _is_leap(year):
     "year -> 1 if leap year, else 0."
     return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
-def _days_before_year(year):
-    "year -> number of days before January 1st of year."
-    y = year - 1
-    return y*365 + y//4 - y//100 + y//400
-
 def _days_in_month(year, month):
     "year, month -> number of days in that month in that year."
     assert 1 <= month <= 12, month
@@ -77,31 +77,6 @@ def _days_before_month(year, month):
     assert 1 <= month <= 12, 'month must be in 1..12'
     return _DAYS_BEFORE_MONTH[month] + (month > 2 and _is_leap(year))
 
-def _ymd2ord(year, month, day):
-    "year, month, day -> ordinal, considering 01-Jan-0001 as day 1."
-    assert 1 <= month <= 12, 'month must be in 1..12'
-    dim = _days_in_month(year, month)
-    assert 1 <= day <= dim, ('day must be in 1..%d' % dim)
-    return (_days_before_year(year) +
-            _days_before_month(year, month) +
-            day)
-
-_DI400Y = _days_before_year(401)    # number of days in 400 years
-_DI100Y = _days_before_year(101)    #    "    "   "   " 100   "
-_DI4Y   = _days_before_year(5)      #    "    "   "   "   4   "
-
-# A 4-year cycle has an extra leap day over what we'd get from pasting
-# together 4 single years.
-assert _DI4Y == 4 * 365 + 1
-
-# Similarly, a 400-year cycle has an extra leap day over what we'd get from
-# pasting together 4 100-year cycles.
-assert _DI400Y == 4 * _DI100Y + 1
-
-# OTOH, a 100-year cycle has one fewer leap day than we'd get from
-# pasting together 25 4-year cycles.
-assert _DI100Y == 25 * _DI4Y - 1
-
 _US_PER_US = 1
 _US_PER_MS = 1000
 _US_PER_SECOND = 1000000
@@ -111,68 +86,6 @@ _US_PER_HOUR = 3600000000
 _US_PER_DAY = 86400000000
 _US_PER_WEEK = 604800000000
 
-def _ord2ymd(n):
-    "ordinal -> (year, month, day), considering 01-Jan-0001 as day 1."
-
-    # n is a 1-based index, starting at 1-Jan-1.  The pattern of leap years
-    # repeats exactly every 400 years.  The basic strategy is to find the
-    # closest 400-year boundary at or before n, then work with the offset
-    # from that boundary to n.  Life is much clearer if we subtract 1 from
-    # n first -- then the values of n at 400-year boundaries are exactly
-    # those divisible by _DI400Y:
-    #
-    #     D  M   Y            n              n-1
-    #     -- --- ----        ----------     ----------------
-    #     31 Dec -400        -_DI400Y       -_DI400Y -1
-    #      1 Jan -399         -_DI400Y +1   -_DI400Y      400-year boundary
-    #     ...
-    #     30 Dec  000        -1             -2
-    #     31 Dec  000         0             -1
-    #      1 Jan  001         1              0            400-year boundary
-    #      2 Jan  001         2              1
-    #      3 Jan  001         3              2
-    #     ...
-    #     31 Dec  400         _DI400Y        _DI400Y -1
-    #      1 Jan  401         _DI400Y +1     _DI400Y      400-year boundary
-    n -= 1
-    n400, n = divmod(n, _DI400Y)
-    year = n400 * 400 + 1   # ..., -399, 1, 401, ...
-
-    # Now n is the (non-negative) offset, in days, from January 1 of year, to
-    # the desired date.  Now compute how many 100-year cycles precede n.
-    # Note that it's possible for n100 to equal 4!  In that case 4 full
-    # 100-year cycles precede the desired day, which implies the desired
-    # day is December 31 at the end of a 400-year cycle.
-    n100, n = divmod(n, _DI100Y)
-
-    # Now compute how many 4-year cycles precede it.
-    n4, n = divmod(n, _DI4Y)
-
-    # And now how many single years.  Again n1 can be 4, and again meaning
-    # that the desired day is December 31 at the end of the 4-year cycle.
-    n1, n = divmod(n, 365)
-
-    year += n100 * 100 + n4 * 4 + n1
-    if n1 == 4 or n100 == 4:
-        assert n == 0
-        return year-1, 12, 31
-
-    # Now the year is correct, and n is the offset from January 1.  We find
-    # the month via an estimate that's either exact or one too large.
-    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
-    assert leapyear == _is_leap(year)
-    month = (n + 50) >> 5
-    preceding = _DAYS_BEFORE_MONTH[month] + (month > 2 and leapyear)
-    if preceding > n:  # estimate is too large
-        month -= 1
-        preceding -= _DAYS_IN_MONTH[month] + (month == 2 and leapyear)
-    n -= preceding
-    assert 0 <= n < _days_in_month(year, month)
-
-    # Now the year and month are correct, and n is the offset from the
-    # start of that month:  we're done!
-    return year, month, n+1
-
 # Month and day names.  For localized versions, see the calendar module.
 _MONTHNAMES = [None, "Jan", "Feb", "Mar", "Apr", "May", "Jun",
                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
@@ -184,13 +97,6 @@ def _build_struct_time(y, m, d, hh, mm, ss, dstflag):
     dnum = _days_before_month(y, m) + d
     return _timemodule.struct_time((y, m, d, hh, mm, ss, wday, dnum, dstflag))
 
-def _format_time(hh, mm, ss, us):
-    # Skip trailing microseconds when us==0.
-    result = "%02d:%02d:%02d" % (hh, mm, ss)
-    if us:
-        result += ".%06d" % us
-    return result
-
 # Correctly substitute for %z and %Z escapes in strftime formats.
 def _wrap_strftime(object, format, timetuple):
     year = timetuple[0]
@@ -453,7 +359,8 @@ class timedelta(deltainterop):
     Representation: (days, seconds, microseconds).  Why?  Because I
     felt like it.
     """
-    __slots__ = '_days', '_seconds', '_microseconds', '_hashcode'
+    # the fields, the arithmetic and the comparisons are in deltainterop
+    __slots__ = ()
 
     def __new__(cls, days=_SENTINEL, seconds=_SENTINEL, microseconds=_SENTINEL,
                 milliseconds=_SENTINEL, minutes=_SENTINEL, hours=_SENTINEL, weeks=_SENTINEL):
@@ -495,12 +402,7 @@ class timedelta(deltainterop):
         if not -_MAX_DELTA_DAYS <= d <= _MAX_DELTA_DAYS:
             raise OverflowError("days=%d; must have magnitude <= %d" % (d, _MAX_DELTA_DAYS))
 
-        self = deltainterop.__new__(cls)
-        self._days = d
-        self._seconds = s
-        self._microseconds = us
-        self._hashcode = -1
-        return self
+        return deltainterop.__new__(cls, d, s, us)
 
     def _to_microseconds(self):
         return ((self._days * _SECONDS_PER_DAY + self._seconds) * _US_PER_SECOND +
@@ -535,64 +437,6 @@ class timedelta(deltainterop):
         """Total seconds in the duration."""
         return self._to_microseconds() / 10**6
 
-    # Read-only field accessors
-    @property
-    def days(self):
-        """days"""
-        return self._days
-
-    @property
-    def seconds(self):
-        """seconds"""
-        return self._seconds
-
-    @property
-    def microseconds(self):
-        """microseconds"""
-        return self._microseconds
-
-    def __add__(self, other):
-        if isinstance(other, timedelta):
-            # for CPython compatibility, we cannot use
-            # our __class__ here, but need a real timedelta
-            return timedelta._create(self._days + other._days,
-                                     self._seconds + other._seconds,
-                                     self._microseconds + other._microseconds,
-                                     True)
-        return NotImplemented
-
-    def __sub__(self, other):
-        if isinstance(other, timedelta):
-            # for CPython compatibility, we cannot use
-            # our __class__ here, but need a real timedelta
-            return timedelta._create(self._days - other._days,
-                                     self._seconds - other._seconds,
-                                     self._microseconds - other._microseconds,
-                                     True)
-        return NotImplemented
-
-    def __neg__(self):
-        # for CPython compatibility, we cannot use
-        # our __class__ here, but need a real timedelta
-        return timedelta._create(-self._days,
-                                 -self._seconds,
-                                 -self._microseconds,
-                                 True)
-
-    def __pos__(self):
-        # for CPython compatibility, we cannot use
-        # our __class__ here, but need a real timedelta
-        return timedelta._create(self._days,
-                                 self._seconds,
-                                 self._microseconds,
-                                 False)
-
-    def __abs__(self):
-        if self._days < 0:
-            return -self
-        else:
-            return self
-
     def __mul__(self, other):
         if not isinstance(other, (int, long)):
             return NotImplemented
@@ -609,58 +453,6 @@ class timedelta(deltainterop):
 
     __floordiv__ = __div__
 
-    # Comparisons of timedelta objects with other.
-
-    def __eq__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) == 0
-        else:
-            return False
-
-    def __ne__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) != 0
-        else:
-            return True
-
-    def __le__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) <= 0
-        else:
-            _cmperror(self, other)
-
-    def __lt__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) < 0
-        else:
-            _cmperror(self, other)
-
-    def __ge__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) >= 0
-        else:
-            _cmperror(self, other)
-
-    def __gt__(self, other):
-        if isinstance(other, timedelta):
-            return self._cmp(other) > 0
-        else:
-            _cmperror(self, other)
-
-    def _cmp(self, other):
-        assert isinstance(other, timedelta)
-        return _cmp(self._getstate(), other._getstate())
-
-    def __hash__(self):
-        if self._hashcode == -1:
-            self._hashcode = hash(self._getstate())
-        return self._hashcode
-
-    def __nonzero__(self):
-        return (self._days != 0 or
-                self._seconds != 0 or
-                self._microseconds != 0)
-
     # Pickle support.
 
     def _getstate(self):
@@ -701,7 +493,9 @@ class date(dateinterop):
     Properties (readonly):
     year, month, day
     """
-    __slots__ = '_year', '_month', '_day', '_hashcode'
+    # the fields, toordinal(), isoformat(), the arithmetic and the
+    # comparisons are in dateinterop
+    __slots__ = ()
 
     def __new__(cls, year, month=None, day=None):
         """Constructor.
@@ -713,17 +507,10 @@ class date(dateinterop):
         if month is None and isinstance(year, bytes) and len(year) == 4 and \
                 1 <= ord(year[2]) <= 12:
             # Pickle support
-            self = dateinterop.__new__(cls)
-            self.__setstate(year)
-            self._hashcode = -1
-            return self
-        year, month, day = _check_date_fields(year, month, day)
-        self = dateinterop.__new__(cls)
-        self._year = year
-        self._month = month
-        self._day = day
-        self._hashcode = -1
-        return self
+            year, month, day = cls.__fromstate(year)
+        else:
+            year, month, day = _check_date_fields(year, month, day)
+        return dateinterop.__new__(cls, year, month, day)
 
     # Additional constructors
 
@@ -793,50 +580,13 @@ class date(dateinterop):
             return self.strftime(fmt)
         return str(self)
 
-    def isoformat(self):
-        """Return the date formatted according to ISO.
-
-        This is 'YYYY-MM-DD'.
-
-        References:
-        - http://www.w3.org/TR/NOTE-datetime
-        - http://www.cl.cam.ac.uk/~mgk25/iso-time.html
-        """
-        return "%04d-%02d-%02d" % (self._year, self._month, self._day)
-
-    __str__ = isoformat
-
-    # Read-only field accessors
-    @property
-    def year(self):
-        """year (1-9999)"""
-        return self._year
-
-    @property
-    def month(self):
-        """month (1-12)"""
-        return self._month
-
-    @property
-    def day(self):
-        """day (1-31)"""
-        return self._day
-
-    # Standard conversions, __cmp__, __hash__ (and helpers)
+    # Standard conversions
 
     def timetuple(self):
         "Return local time tuple compatible with time.localtime()."
         return _build_struct_time(self._year, self._month, self._day,
                                   0, 0, 0, -1)
 
-    def toordinal(self):
-        """Return proleptic Gregorian ordinal for the year, month and day.
-
-        January 1 of year 1 is day 1.  Only the year, month and day values
-        contribute to the result.
-        """
-        return _ymd2ord(self._year, self._month, self._day)
-
     def replace(self, year=None, month=None, day=None):
         """Return a new date with new values for the specified fields."""
         if year is None:
@@ -847,106 +597,8 @@ class date(dateinterop):
             day = self._day
         return date.__new__(type(self), year, month, day)
 
-    # Comparisons of date objects with other.
-
-    def __eq__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) == 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            return False
-
-    def __ne__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) != 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            return True
-
-    def __le__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) <= 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            _cmperror(self, other)
-
-    def __lt__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) < 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            _cmperror(self, other)
-
-    def __ge__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) >= 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            _cmperror(self, other)
-
-    def __gt__(self, other):
-        if isinstance(other, date):
-            return self._cmp(other) > 0
-        elif hasattr(other, "timetuple"):
-            return NotImplemented
-        else:
-            _cmperror(self, other)
-
-    def _cmp(self, other):
-        assert isinstance(other, date)
-        y, m, d = self._year, self._month, self._day
-        y2, m2, d2 = other._year, other._month, other._day
-        return _cmp((y, m, d), (y2, m2, d2))
-
-    def __hash__(self):
-        "Hash."
-        if self._hashcode == -1:
-            self._hashcode = hash(self._getstate())
-        return self._hashcode
-
-    # Computations
-
-    def _add_timedelta(self, other, factor):
-        y, m, d = _normalize_date(
-            self._year,
-            self._month,
-            self._day + other.days * factor)
-        return date(y, m, d)
-
-    def __add__(self, other):
-        "Add a date to a timedelta."
-        if isinstance(other, timedelta):
-            return self._add_timedelta(other, 1)
-        return NotImplemented
-
-    __radd__ = __add__
-
-    def __sub__(self, other):
-        """Subtract two dates, or a date and a timedelta."""
-        if isinstance(other, date):
-            days1 = self.toordinal()
-            days2 = other.toordinal()
-            return timedelta._create(days1 - days2, 0, 0, False)
-        if isinstance(other, timedelta):
-            return self._add_timedelta(other, -1)
-        return NotImplemented
-
-    def weekday(self):
-        "Return day of the week, where Monday == 0 ... Sunday == 6."
-        return (self.toordinal() + 6) % 7
-
     # Day-of-the-week and week-of-the-year, according to ISO
 
-    def isoweekday(self):
-        "Return day of the week, where Monday == 1 ... Sunday == 7."
-        # 1-Jan-0001 is a Monday
-        return self.toordinal() % 7 or 7
-
     def isocalendar(self):
         """Return a 3-tuple containing ISO year, week number, and weekday.
 
@@ -980,16 +632,20 @@ class date(dateinterop):
         yhi, ylo = divmod(self._year, 256)
         return (_struct.pack('4B', yhi, ylo, self._month, self._day),)
 
-    def __setstate(self, string):
-        yhi, ylo, self._month, self._day = (ord(string[0]), ord(string[1]),
-                                            ord(string[2]), ord(string[3]))
-        self._year = yhi * 256 + ylo
+    @staticmethod
+    def __fromstate(string):
+        yhi, ylo, month, day = (ord(string[0]), ord(string[1]),
+                                ord(string[2]), ord(string[3]))
+        return yhi * 256 + ylo, month, day
 
     def __reduce__(self):
         return (self.__class__, self._getstate())
 
 _date_class = date  # so functions w/ args named "date" can get at the class
 
+# the arithmetic of timedelta and date returns real timedeltas and dates
+_set_result_types(timedelta, date)
+
 date.min = date(1, 1, 1)
 date.max = date(9999, 12, 31)
 date.resolution = timedelta(days=1)
@@ -1090,7 +746,8 @@ class time(timeinterop):
     Properties (readonly):
     hour, minute, second, microsecond, tzinfo
     """
-    __slots__ = '_hour', '_minute', '_second', '_microsecond', '_tzinfo', '_hashcode'
+    # the fields and the comparisons are in timeinterop
+    __slots__ = '_hashcode',
 
     def __new__(cls, hour=0, minute=0, second=0, microsecond=0, tzinfo=None):
         """Constructor.
@@ -1103,89 +760,22 @@ class time(timeinterop):
         """
         if isinstance(hour, bytes) and len(hour) == 6 and ord(hour[0]) < 24:
             # Pickle support
-            self = timeinterop.__new__(cls)
-            self.__setstate(hour, minute or None)
-            self._hashcode = -1
-            return self
-        hour, minute, second, microsecond = _check_time_fields(
-            hour, minute, second, microsecond)
-        _check_tzinfo_arg(tzinfo)
-        self = timeinterop.__new__(cls)
-        self._hour = hour
-        self._minute = minute
-        self._second = second
-        self._microsecond = microsecond
-        self._tzinfo = tzinfo
+            hour, minute, second, microsecond, tzinfo = cls.__fromstate(
+                hour, minute or None)
+        else:
+            hour, minute, second, microsecond = _check_time_fields(
+                hour, minute, second, microsecond)
+            _check_tzinfo_arg(tzinfo)
+        self = timeinterop.__new__(cls, hour, minute, second, microsecond,
+                                   tzinfo)
         self._hashcode = -1
         return self
 
-    # Read-only field accessors
-    @property
-    def hour(self):
-        """hour (0-23)"""
-        return self._hour
-
-    @property
-    def minute(self):
-        """minute (0-59)"""
-        return self._minute
-
-    @property
-    def second(self):
-        """second (0-59)"""
-        return self._second
-
-    @property
-    def microsecond(self):
-        """microsecond (0-999999)"""
-        return self._microsecond
-
-    @property
-    def tzinfo(self):
-        """timezone info object"""
-        return self._tzinfo
-
     # Standard conversions, __hash__ (and helpers)
 
-    # Comparisons of time objects with other.
-
-    def __eq__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) == 0
-        else:
-            return False
-
-    def __ne__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) != 0
-        else:
-            return True
-
-    def __le__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) <= 0
-        else:
-            _cmperror(self, other)
-
-    def __lt__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) < 0
-        else:
-            _cmperror(self, other)
-
-    def __ge__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) >= 0
-        else:
-            _cmperror(self, other)
-
-    def __gt__(self, other):
-        if isinstance(other, time):
-            return self._cmp(other) > 0
-        else:
-            _cmperror(self, other)
 
     def _cmp(self, other):
+        # called by timeinterop when the tzinfos differ
         assert isinstance(other, time)
         mytz = self._tzinfo
         ottz = other._tzinfo
@@ -1383,14 +973,15 @@ class time(timeinterop):
         else:
             return (basestate, self._tzinfo)
 
-    def __setstate(self, string, tzinfo):
+    @staticmethod
+    def __fromstate(string, tzinfo):
         if tzinfo is not None and not isinstance(tzinfo, _tzinfo_class):
             raise TypeError("bad tzinfo state arg")
-        self._hour, self._minute, self._second, us1, us2, us3 = (
+        hour, minute, second, us1, us2, us3 = (
             ord(string[0]), ord(string[1]), ord(string[2]),
             ord(string[3]), ord(string[4]), ord(string[5]))
-        self._microsecond = (((us1 << 8) | us2) << 8) | us3
-        self._tzinfo = tzinfo
+        microsecond = (((us1 << 8) | us2) << 8) | us3
+        return hour, minute, second, microsecond, tzinfo
 
     def __reduce__(self):
         return (time, self._getstate())
@@ -1407,17 +998,17 @@ class datetime(date):
     The year, month and day arguments are required. tzinfo may be None, or an
     instance of a tzinfo subclass. The remaining arguments may be ints or longs.
     """
-    __slots__ = date.__slots__ + time.__slots__
+    # year, month and day are in dateinterop
+    __slots__ = ('_hour', '_minute', '_second', '_microsecond', '_tzinfo',
+                 '_hashcode')
 
     def __new__(cls, year, month=None, day=None, hour=0, minute=0, second=0,
                 microsecond=0, tzinfo=None):
         if isinstance(year, bytes) and len(year) == 10 and \
                 1 <= ord(year[2]) <= 12:
             # Pickle support
-            self = dateinterop.__new__(cls)
-            self.__setstate(year, month)
-            self._hashcode = -1
-            return self
+            (year, month, day, hour, minute, second, microsecond,
+                tzinfo) = cls.__fromstate(year, month)
         elif isinstance(year, tuple) and len(year) == 7:
             # Used by internal functions where the arguments are guaranteed to
             # be valid.
@@ -1427,10 +1018,7 @@ class datetime(date):
             hour, minute, second, microsecond = _check_time_fields(
                 hour, minute, second, microsecond)
         _check_tzinfo_arg(tzinfo)
-        self = dateinterop.__new__(cls)
-        self._year = year
-        self._month = month
-        self._day = day
+        self = dateinterop.__new__(cls, year, month, day)
         self._hour = hour
         self._minute = minute
         self._second = second
@@ -1626,7 +1214,8 @@ class datetime(date):
         Optional argument sep specifies the separator between date and
         time, default 'T'.
         """
-        s = ("%04d-%02d-%02d%c" % (self._year, self._month, self._day, sep) +
+        s = (_format_date(self._year, self._month, self._day) +
+             "%c" % (sep,) +
              _format_time(self._hour, self._minute, self._second,
                           self._microsecond))
         off = self._utcoffset()
@@ -1663,6 +1252,11 @@ class datetime(date):
     @classmethod
     def strptime(cls, date_string, format):
         'string, format -> new datetime parsed from a string (like time.strptime()).'
+        if type(date_string) is str and type(format) is str:
+            # fast path for the common numeric formats
+            fields = _parse_datetime(date_string, format)
+            if fields is not None:
+                return cls(*fields)
         from _strptime import _strptime
         # _strptime._strptime returns a two-element tuple.  The first
         # element is a time.struct_time object.  The second is the
@@ -1874,17 +1468,17 @@ class datetime(date):
         else:
             return (basestate, self._tzinfo)
 
-    def __setstate(self, string, tzinfo):
+    @staticmethod
+    def __fromstate(string, tzinfo):
         if tzinfo is not None and not isinstance(tzinfo, _tzinfo_class):
             raise TypeError("bad tzinfo state arg")
-        (yhi, ylo, self._month, self._day, self._hour,
-            self._minute, self._second, us1, us2, us3) = (ord(string[0]),
-                ord(string[1]), ord(string[2]), ord(string[3]),
-                ord(string[4]), ord(string[5]), ord(string[6]),
-                ord(string[7]), ord(string[8]), ord(string[9]))
-        self._year = yhi * 256 + ylo
-        self._microsecond = (((us1 << 8) | us2) << 8) | us3
-        self._tzinfo = tzinfo
+        (yhi, ylo, month, day, hour, minute, second, us1, us2, us3) = (
+            ord(string[0]), ord(string[1]), ord(string[2]), ord(string[3]),
+            ord(string[4]), ord(string[5]), ord(string[6]),
+            ord(string[7]), ord(string[8]), ord(string[9]))
+        microsecond = (((us1 << 8) | us2) << 8) | us3
+        return (yhi * 256 + ylo, month, day, hour, minute, second,
+                microsecond, tzinfo)
 
     def __reduce__(self):
         return (self.__class__, self._getstate())
@@ -106,6 +106,7 @@ module_dependencies = {
     'cpyext': [('objspace.usemodules.array', True)],
     '_cppyy': [('objspace.usemodules.cpyext', True)],
     'faulthandler': [('objspace.usemodules._vmprof', True)],
+    '_pypysqlite3': [('objspace.usemodules._cffi_backend', True)],
     }
 module_suggests = {
     # the reason you want _rawffi is for ctypes, which
@@ -25,7 +25,7 @@ class ExecutionContext(object):
     # XXX [fijal] but they're not. is_being_profiled is guarded a bit all
     #     over the place as well as w_tracefunc
 
-    _immutable_fields_ = ['profilefunc?', 'w_tracefunc?']
+    _immutable_fields_ = ['profilefunc?', 'profile_c_calls?', 'w_tracefunc?']
 
     def __init__(self, space):
         self.space = space
@@ -35,6 +35,7 @@ class ExecutionContext(object):
         self.compiler = space.createcompiler()
         self.profilefunc = None
         self.w_profilefuncarg = None
+        self.profile_c_calls = True
         self.thread_disappeared = False   # might be set to True after os.fork()
         # an instance of this will be raised the next time we switch to the
         # thread that self represents
@@ -105,7 +106,7 @@ class ExecutionContext(object):
         self._c_call_return_trace(frame, w_func, args, 'c_return')
 
     def _c_call_return_trace(self, frame, w_func, args, event):
-        if self.profilefunc is None:
+        if self.profilefunc is None or not self.profile_c_calls:
             frame.getorcreatedebug().is_being_profiled = False
         else:
             # undo the effect of the CALL_METHOD bytecode, which would be
@@ -123,7 +124,7 @@ class ExecutionContext(object):
 
     def c_exception_trace(self, frame, w_exc):
         "Profile function called upon OperationError."
-        if self.profilefunc is None:
+        if self.profilefunc is None or not self.profile_c_calls:
             frame.getorcreatedebug().is_being_profiled = False
         else:
             self._trace(frame, 'c_exception', w_exc)
@@ -132,7 +133,7 @@ class ExecutionContext(object):
         "Trace the call of a function"
         if self.gettrace() is not None or self.profilefunc is not None:
             self._trace(frame, 'call', self.space.w_None)
-            if self.profilefunc:
+            if self.profilefunc and self.profile_c_calls:
                 frame.getorcreatedebug().is_being_profiled = True
 
     def return_trace(self, frame, w_retval):
@@ -287,13 +288,18 @@ class ExecutionContext(object):
     def getprofile(self):
         return self.w_profilefuncarg
 
-    def setllprofile(self, func, w_arg):
+    def setllprofile(self, func, w_arg, c_calls=True):
+        # With c_calls=False, 'func' only gets the 'call' and 'return'
+        # events.  The frames are then not marked as 'is_being_profiled',
+        # which is a green of the JIT: the code keeps being compiled and
+        # run as without profiling, apart from the calls to 'func'.
         if func is not None:
             if w_arg is None:
                 raise ValueError("Cannot call setllprofile with real None")
-            self.force_all_frames(is_being_profiled=True)
+            self.force_all_frames(is_being_profiled=c_calls)
         self.profilefunc = func
         self.w_profilefuncarg = w_arg
+        self.profile_c_calls = c_calls
 
     def force_all_frames(self, is_being_profiled=False):
         # "Force" all frames in the sense of the jit, and optionally
@@ -7,6 +7,7 @@ The bytecode interpreter itself is implemented by the PyFrame class.
 import dis, imp, struct, types, new, sys, os
 
 from pypy.interpreter import eval
+from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.signature import Signature
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import unwrap_spec
@@ -52,6 +53,36 @@ def make_signature(code):
 class CodeHookCache(object):
     def __init__(self, space):
         self._code_hook = None
+        # set by pypyjit.set_warmup_profile()
+        self._warmup_profile = None
+
+class W_LazyCode(W_Root):
+    """ Stands for a code object in the co_consts_w of another one, kept in
+    marshal format until it is needed.  Never seen by app-level code: the
+    frames and the co_consts attribute see the code object instead.
+    """
+    w_code = None
+
+    def __init__(self, data, stringtable_w, nstrings):
+        self.data = data
+        # the interned strings that the data can refer to are the first
+        # 'nstrings'; the list is shared with the unmarshaller that made us
+        self.stringtable_w = stringtable_w
+        self.nstrings = nstrings
+
+    # always returns the same code object: a JIT trace that loads a lazy
+    # constant gets the code object as a constant too
+    @jit.elidable
+    def materialize(self, space):
+        w_code = self.w_code
+        if w_code is None:
+            from pypy.module.marshal.interp_marshal import load_lazy_code
+            w_code = load_lazy_code(space, self.data,
+                                    self.stringtable_w[:self.nstrings])
+            self.w_code = w_code
+            self.data = ''
+            self.stringtable_w = []
+        return w_code
 
 class PyCode(eval.Code):
     "CPython-style code objects."
@@ -107,7 +138,10 @@ class PyCode(eval.Code):
         return True
 
     def new_code_hook(self):
-        code_hook = self.space.fromcache(CodeHookCache)._code_hook
+        cache = self.space.fromcache(CodeHookCache)
+        if cache._warmup_profile is not None:
+            cache._warmup_profile.new_code(self)
+        code_hook = cache._code_hook
         if code_hook is not None:
             try:
                 self.space.call_function(code_hook, self)
@@ -244,7 +278,19 @@ class PyCode(eval.Code):
                 return w_first
         return space.w_None
 
+    def materialize_consts(self):
+        """Replace the lazy code objects in co_consts_w by the real ones.
+        Only for the code objects that are changed before they run, like
+        remove_docstrings() and update_code_filenames() do: co_consts_w is
+        immutable for the JIT, but no trace can have seen it yet.  Even
+        if one had, it would get the same code objects from materialize().
+        """
+        consts_w = self.co_consts_w
+        for i in range(len(consts_w)):
+            consts_w[i] = _materialize_const(self.space, consts_w[i])
+
     def remove_docstrings(self, space):
+        self.materialize_consts()
         if self.co_flags & CO_KILL_DOCSTRING:
             self.co_consts_w[0] = space.w_None
         for w_co in self.co_consts_w:
@@ -288,8 +334,20 @@ class PyCode(eval.Code):
         co = self._to_code()
         dis.dis(co)
 
+    def getconsts_w(self):
+        """co_consts_w, with the lazy code objects replaced by the real
+        ones."""
+        consts_w = self.co_consts_w
+        for w_const in consts_w:
+            if isinstance(w_const, W_LazyCode):
+                break
+        else:
+            return consts_w
+        return [_materialize_const(self.space, w_const)
+                for w_const in consts_w]
+
     def fget_co_consts(self, space):
-        return space.newtuple(self.co_consts_w)
+        return space.newtuple(self.getconsts_w())
 
     def fget_co_names(self, space):
         return space.newtuple(self.co_names_w)
@@ -405,7 +463,7 @@ class PyCode(eval.Code):
             space.newint(self.co_stacksize),
             space.newint(self.co_flags),
             space.newbytes(self.co_code),
-            space.newtuple(self.co_consts_w),
+            space.newtuple(self.getconsts_w()),
             space.newtuple(self.co_names_w),
             space.newtuple([space.newtext(v) for v in self.co_varnames]),
             space.newtext(self.co_filename),
@@ -465,9 +523,15 @@ def _code_const_eq(space, w_a, w_b):
     # use those.
     return space.eq_w(_convert_const(space, w_a), _convert_const(space, w_b))
 
+def _materialize_const(space, w_const):
+    if isinstance(w_const, W_LazyCode):
+        return w_const.materialize(space)
+    return w_const
+
 def _convert_const(space, w_a):
     # use id to convert constants. for tuples and frozensets use tuples and
     # frozensets of converted contents.
+    w_a = _materialize_const(space, w_a)
     w_type = space.type(w_a)
     if space.is_w(w_type, space.w_unicode):
         # unicodes are supposed to compare by value, but not equal to bytes
@@ -17,7 +17,7 @@ from pypy.interpreter import (
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.nestedscope import Cell
-from pypy.interpreter.pycode import PyCode, BytecodeCorruption
+from pypy.interpreter.pycode import PyCode, W_LazyCode, BytecodeCorruption
 from pypy.tool.stdlib_opcode import bytecode_spec
 
 @not_rpython
@@ -472,7 +472,10 @@ class __extend__(pyframe.PyFrame):
         return self.getcode().co_varnames[index]
 
     def getconstant_w(self, index):
-        return self.getcode().co_consts_w[index]
+        w_const = self.getcode().co_consts_w[index]
+        if isinstance(w_const, W_LazyCode):
+            w_const = w_const.materialize(self.space)
+        return w_const
 
     def getname_u(self, index):
         return self.space.text_w(self.getcode().co_names_w[index])
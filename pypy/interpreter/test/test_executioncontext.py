@@ -191,6 +191,22 @@ class TestExecutionContext:
         check_snippet('args = (1, 2); max(*args, **{})', 'builtin max')
         check_snippet('abs(val=0)', 'builtin abs')
 
+    def test_llprofile_no_c_calls(self):
+        l = []
+
+        def profile_func(space, w_arg, frame, event, w_aarg):
+            assert not frame.get_is_being_profiled()
+            l.append(event)
+
+        space = self.space
+        space.getexecutioncontext().setllprofile(profile_func, space.w_None,
+                                                 c_calls=False)
+        space.appexec([], """():
+        l = []; l.append(max(1, 2))
+        """)
+        space.getexecutioncontext().setllprofile(None, None)
+        assert l == ['call', 'return', 'call', 'return']
+
     def test_llprofile_c_exception(self):
         l = []
 
@@ -97,16 +97,20 @@ def _internal_crash(space, w_crash=None):
     raise ValueError    # RPython-level, uncaught
 
 def strategy(space, w_obj):
-    """ strategy(dict or list or set or instance)
+    """ strategy(dict or list or set or deque or instance)
 
-    Return the underlying strategy currently used by a dict, list or set object
+    Return the underlying strategy currently used by a dict, list, set or
+    deque object
     """
+    from pypy.module._collections.interp_deque import W_Deque
     if isinstance(w_obj, W_DictMultiObject):
         name = w_obj.get_strategy().__class__.__name__
     elif isinstance(w_obj, W_ListObject):
         name = w_obj.strategy.__class__.__name__
     elif isinstance(w_obj, W_BaseSetObject):
         name = w_obj.strategy.__class__.__name__
+    elif isinstance(w_obj, W_Deque):
+        name = w_obj.strategy.__class__.__name__
     else:
         m = w_obj._get_mapdict_map()
         if m is not None:
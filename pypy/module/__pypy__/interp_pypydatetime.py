@@ -1,24 +1,665 @@
 from pypy.interpreter.baseobjspace import W_Root
-from pypy.interpreter.typedef import TypeDef
-from pypy.interpreter.gateway import interp2app
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.typedef import (TypeDef, GetSetProperty,
+    interp_attrproperty, interp_attrproperty_w)
+from pypy.interpreter.gateway import interp2app, unwrap_spec, WrappedDefault
+from rpython.rlib.objectmodel import specialize
+from rpython.rlib.rstring import StringBuilder
 from rpython.tool.sourcetools import func_with_new_name
 
-def create_class(name):
-    class W_Class(W_Root):
-        'builtin base clasee for datetime.%s to allow interop with cpyext' % name
-        def descr_new__(space, w_type):
-            return space.allocate_instance(W_Class, w_type)
 
-    W_Class.typedef = TypeDef(name,
-        __new__ = interp2app(func_with_new_name(
-                                    W_Class.descr_new__.im_func,
-                                    '%s_new' % (name,))),
-        )
-    W_Class.typedef.acceptable_as_base_class = True
-    return W_Class
+# Calendar arithmetic and ISO formatting.  The functions below expect
+# fields that were already checked by the caller.
 
-W_DateTime_Time = create_class('pypydatetime_time')
-W_DateTime_Date = create_class('pypydatetime_date')
-W_DateTime_Delta = create_class('pypydatetime_delta')
+MAX_DELTA_DAYS = 999999999
+SECONDS_PER_DAY = 24 * 3600
+US_PER_SECOND = 1000000
 
+_DAYS_IN_MONTH = [-1, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+_DAYS_BEFORE_MONTH = [-1, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304,
+                      334]
 
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def _days_before_year(year):
+    y = year - 1
+    return y*365 + y//4 - y//100 + y//400
+
+def _days_in_month(year, month):
+    if month == 2 and _is_leap(year):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+_DI400Y = _days_before_year(401)    # number of days in 400 years
+_DI100Y = _days_before_year(101)    #    "    "   "   " 100   "
+_DI4Y   = _days_before_year(5)      #    "    "   "   "   4   "
+
+_MAXORDINAL = 3652059               # date.max.toordinal()
+
+def _ymd2ord(year, month, day):
+    days = _days_before_year(year) + _DAYS_BEFORE_MONTH[month] + day
+    if month > 2 and _is_leap(year):
+        days += 1
+    return days
+
+def _ord2ymd(n):
+    # The pattern of leap years repeats exactly every 400 years: find the
+    # closest 400-year boundary at or before n, then the 100-year, 4-year
+    # and single-year cycles after it.  See Dershowitz and Reingold,
+    # "Calendrical Calculations".
+    n -= 1
+    n400 = n // _DI400Y
+    n = n % _DI400Y
+    year = n400 * 400 + 1
+    n100 = n // _DI100Y
+    n = n % _DI100Y
+    n4 = n // _DI4Y
+    n = n % _DI4Y
+    n1 = n // 365
+    n = n % 365
+    year += n100 * 100 + n4 * 4 + n1
+    if n1 == 4 or n100 == 4:
+        # December 31 at the end of a 4-year or 400-year cycle
+        return year - 1, 12, 31
+    # the month is either this estimate or the one before
+    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month]
+    if month > 2 and leapyear:
+        preceding += 1
+    if preceding > n:
+        month -= 1
+        preceding -= _DAYS_IN_MONTH[month]
+        if month == 2 and leapyear:
+            preceding -= 1
+    return year, month, n - preceding + 1
+
+def _append_padded(builder, value, width):
+    digits = str(value)
+    for i in range(width - len(digits)):
+        builder.append('0')
+    builder.append(digits)
+
+def _format_date(year, month, day):
+    builder = StringBuilder(10)
+    _append_padded(builder, year, 4)
+    builder.append('-')
+    _append_padded(builder, month, 2)
+    builder.append('-')
+    _append_padded(builder, day, 2)
+    return builder.build()
+
+def _format_time(hour, minute, second, microsecond):
+    builder = StringBuilder(15)
+    _append_padded(builder, hour, 2)
+    builder.append(':')
+    _append_padded(builder, minute, 2)
+    builder.append(':')
+    _append_padded(builder, second, 2)
+    if microsecond:
+        builder.append('.')
+        _append_padded(builder, microsecond, 6)
+    return builder.build()
+
+
+@unwrap_spec(year=int, month=int, day=int)
+def ymd2ord(space, year, month, day):
+    "year, month, day -> ordinal, considering 01-Jan-0001 as day 1."
+    # like the asserts of the pure Python version
+    if not 1 <= month <= 12:
+        raise oefmt(space.w_AssertionError, "month must be in 1..12")
+    dim = _days_in_month(year, month)
+    if not 1 <= day <= dim:
+        raise oefmt(space.w_AssertionError, "day must be in 1..%d", dim)
+    return space.newint(_ymd2ord(year, month, day))
+
+@unwrap_spec(n=int)
+def ord2ymd(space, n):
+    "ordinal -> (year, month, day), considering 01-Jan-0001 as day 1."
+    year, month, day = _ord2ymd(n)
+    return space.newtuple([space.newint(year), space.newint(month),
+                           space.newint(day)])
+
+@unwrap_spec(year=int, month=int, day=int)
+def format_date(space, year, month, day):
+    "year, month, day -> 'YYYY-MM-DD'"
+    return space.newtext(_format_date(year, month, day))
+
+@unwrap_spec(hour=int, minute=int, second=int, microsecond=int)
+def format_time(space, hour, minute, second, microsecond):
+    "hour, minute, second, microsecond -> 'HH:MM:SS[.ffffff]'"
+    return space.newtext(_format_time(hour, minute, second, microsecond))
+
+
+# The base classes of datetime.timedelta, datetime.date (and so
+# datetime.datetime) and datetime.time.  They hold the fields, so that
+# cpyext can find them, and do the arithmetic and comparisons.
+# lib_pypy/datetime.py checks the arguments of the constructors, except
+# when unpickling, and implements the rest: formatting, time zones...
+
+class DateTimeTypes(object):
+    # the classes of the timedelta and date objects that the arithmetic
+    # returns, set by lib_pypy/datetime.py
+    def __init__(self, space):
+        self.w_timedelta = space.gettypeobject(W_DateTime_Delta.typedef)
+        self.w_date = space.gettypeobject(W_DateTime_Date.typedef)
+
+def set_result_types(space, w_timedelta, w_date):
+    """set_result_types(timedelta, date)
+
+    Set the classes of the objects returned by the arithmetic of
+    deltainterop and dateinterop.
+    """
+    if not space.issubtype_w(w_timedelta,
+                             space.gettypeobject(W_DateTime_Delta.typedef)):
+        raise oefmt(space.w_TypeError, "expected a subclass of deltainterop")
+    if not space.issubtype_w(w_date,
+                             space.gettypeobject(W_DateTime_Date.typedef)):
+        raise oefmt(space.w_TypeError, "expected a subclass of dateinterop")
+    types = space.fromcache(DateTimeTypes)
+    types.w_timedelta = w_timedelta
+    types.w_date = w_date
+
+def _cmp_int(a, b):
+    if a < b:
+        return -1
+    if a > b:
+        return 1
+    return 0
+
+@specialize.arg(1)
+def _compare_result(space, op, c):
+    if op == 'eq':
+        return space.newbool(c == 0)
+    elif op == 'ne':
+        return space.newbool(c != 0)
+    elif op == 'lt':
+        return space.newbool(c < 0)
+    elif op == 'le':
+        return space.newbool(c <= 0)
+    elif op == 'gt':
+        return space.newbool(c > 0)
+    else:
+        assert op == 'ge'
+        return space.newbool(c >= 0)
+
+@specialize.arg(1)
+def _compare_mismatch(space, op, w_obj, w_other):
+    # '==' and '!=' say that the objects differ, the other comparisons
+    # raise, as for the pure Python version
+    if op == 'eq':
+        return space.w_False
+    elif op == 'ne':
+        return space.w_True
+    raise oefmt(space.w_TypeError, "can't compare '%T' to '%T'",
+                w_obj, w_other)
+
+def _make_compare(op):
+    def descr_compare(self, space, w_other):
+        c = self.compare(space, w_other)
+        if c == -2:
+            return space.w_NotImplemented
+        if c == -3:
+            return _compare_mismatch(space, op, self, w_other)
+        return _compare_result(space, op, c)
+    return func_with_new_name(descr_compare, 'descr_' + op)
+
+def _compare_methods(cls):
+    # -> the __eq__, __ne__... entries of the typedef
+    methods = {}
+    for op in ['eq', 'ne', 'lt', 'le', 'gt', 'ge']:
+        name = 'descr_' + op
+        setattr(cls, name, _make_compare(op))
+        methods['__%s__' % op] = interp2app(getattr(cls, name))
+    return methods
+
+
+class W_DateTime_Delta(W_Root):
+    """ builtin base class for datetime.timedelta """
+    _immutable_fields_ = ['days', 'seconds', 'microseconds']
+
+    def __init__(self, days, seconds, microseconds):
+        self.days = days
+        self.seconds = seconds
+        self.microseconds = microseconds
+        self.hashcode = -1
+
+    def compare(self, space, w_other):
+        # -> -1, 0, 1, or -3 if w_other is not a timedelta
+        if not isinstance(w_other, W_DateTime_Delta):
+            return -3
+        c = _cmp_int(self.days, w_other.days)
+        if c == 0:
+            c = _cmp_int(self.seconds, w_other.seconds)
+            if c == 0:
+                c = _cmp_int(self.microseconds, w_other.microseconds)
+        return c
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_DateTime_Delta):
+            return space.w_NotImplemented
+        return new_delta(space, self.days + w_other.days,
+                         self.seconds + w_other.seconds,
+                         self.microseconds + w_other.microseconds)
+
+    def descr_sub(self, space, w_other):
+        if not isinstance(w_other, W_DateTime_Delta):
+            return space.w_NotImplemented
+        return new_delta(space, self.days - w_other.days,
+                         self.seconds - w_other.seconds,
+                         self.microseconds - w_other.microseconds)
+
+    def descr_neg(self, space):
+        return new_delta(space, -self.days, -self.seconds, -self.microseconds)
+
+    def descr_pos(self, space):
+        # a real timedelta, even for subclasses, as CPython does
+        return new_delta(space, self.days, self.seconds, self.microseconds)
+
+    def descr_abs(self, space):
+        if self.days < 0:
+            return self.descr_neg(space)
+        return self
+
+    def descr_nonzero(self, space):
+        return space.newbool(self.days != 0 or self.seconds != 0 or
+                             self.microseconds != 0)
+
+    def descr_hash(self, space):
+        if self.hashcode == -1:
+            self.hashcode = space.hash_w(space.newtuple([
+                space.newint(self.days), space.newint(self.seconds),
+                space.newint(self.microseconds)]))
+        return space.newint(self.hashcode)
+
+def new_delta(space, days, seconds, microseconds, w_type=None):
+    # normalize, and return a datetime.timedelta
+    seconds += microseconds // US_PER_SECOND
+    microseconds = microseconds % US_PER_SECOND
+    days += seconds // SECONDS_PER_DAY
+    seconds = seconds % SECONDS_PER_DAY
+    if not -MAX_DELTA_DAYS <= days <= MAX_DELTA_DAYS:
+        raise oefmt(space.w_OverflowError,
+                    "days=%d; must have magnitude <= %d",
+                    days, MAX_DELTA_DAYS)
+    if w_type is None:
+        w_type = space.fromcache(DateTimeTypes).w_timedelta
+    w_delta = space.allocate_instance(W_DateTime_Delta, w_type)
+    W_DateTime_Delta.__init__(w_delta, days, seconds, microseconds)
+    return w_delta
+
+@unwrap_spec(days=int, seconds=int, microseconds=int)
+def descr_new_delta(space, w_type, days=0, seconds=0, microseconds=0):
+    """ deltainterop.__new__(cls, days=0, seconds=0, microseconds=0) """
+    return new_delta(space, days, seconds, microseconds, w_type)
+
+W_DateTime_Delta.typedef = TypeDef('pypydatetime_delta',
+    __new__ = interp2app(descr_new_delta),
+    days = interp_attrproperty('days', W_DateTime_Delta, doc="days",
+                               wrapfn="newint"),
+    seconds = interp_attrproperty('seconds', W_DateTime_Delta,
+                                  doc="seconds", wrapfn="newint"),
+    microseconds = interp_attrproperty('microseconds', W_DateTime_Delta,
+                                       doc="microseconds", wrapfn="newint"),
+    _days = interp_attrproperty('days', W_DateTime_Delta, wrapfn="newint"),
+    _seconds = interp_attrproperty('seconds', W_DateTime_Delta,
+                                   wrapfn="newint"),
+    _microseconds = interp_attrproperty('microseconds', W_DateTime_Delta,
+                                        wrapfn="newint"),
+    __add__ = interp2app(W_DateTime_Delta.descr_add),
+    __radd__ = interp2app(W_DateTime_Delta.descr_add),
+    __sub__ = interp2app(W_DateTime_Delta.descr_sub),
+    __neg__ = interp2app(W_DateTime_Delta.descr_neg),
+    __pos__ = interp2app(W_DateTime_Delta.descr_pos),
+    __abs__ = interp2app(W_DateTime_Delta.descr_abs),
+    __nonzero__ = interp2app(W_DateTime_Delta.descr_nonzero),
+    __hash__ = interp2app(W_DateTime_Delta.descr_hash),
+    **_compare_methods(W_DateTime_Delta)
+    )
+W_DateTime_Delta.typedef.acceptable_as_base_class = True
+
+
+class W_DateTime_Date(W_Root):
+    """ builtin base class for datetime.date and datetime.datetime """
+    _immutable_fields_ = ['year', 'month', 'day']
+
+    def __init__(self, year, month, day):
+        self.year = year
+        self.month = month
+        self.day = day
+        self.hashcode = -1
+
+    def toordinal(self):
+        return _ymd2ord(self.year, self.month, self.day)
+
+    def compare(self, space, w_other):
+        # -> -1, 0, 1, -2 for NotImplemented or -3 if w_other is not
+        # comparable to a date
+        if not isinstance(w_other, W_DateTime_Date):
+            if space.findattr(w_other, space.newtext('timetuple')):
+                return -2
+            return -3
+        c = _cmp_int(self.year, w_other.year)
+        if c == 0:
+            c = _cmp_int(self.month, w_other.month)
+            if c == 0:
+                c = _cmp_int(self.day, w_other.day)
+        return c
+
+    def add_days(self, space, days):
+        ordinal = self.toordinal() + days
+        if not 1 <= ordinal <= _MAXORDINAL:
+            raise oefmt(space.w_OverflowError, "date value out of range")
+        year, month, day = _ord2ymd(ordinal)
+        w_type = space.fromcache(DateTimeTypes).w_date
+        w_date = space.allocate_instance(W_DateTime_Date, w_type)
+        W_DateTime_Date.__init__(w_date, year, month, day)
+        return w_date
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_DateTime_Delta):
+            return space.w_NotImplemented
+        return self.add_days(space, w_other.days)
+
+    def descr_sub(self, space, w_other):
+        if isinstance(w_other, W_DateTime_Date):
+            return new_delta(space, self.toordinal() - w_other.toordinal(),
+                             0, 0)
+        if isinstance(w_other, W_DateTime_Delta):
+            return self.add_days(space, -w_other.days)
+        return space.w_NotImplemented
+
+    def descr_hash(self, space):
+        if self.hashcode == -1:
+            self.hashcode = space.hash_w(space.newtuple([
+                space.newint(self.year), space.newint(self.month),
+                space.newint(self.day)]))
+        return space.newint(self.hashcode)
+
+    def descr_toordinal(self, space):
+        """Return proleptic Gregorian ordinal for the year, month and day.
+
+        January 1 of year 1 is day 1.  Only the year, month and day values
+        contribute to the result.
+        """
+        return space.newint(self.toordinal())
+
+    def descr_weekday(self, space):
+        "Return day of the week, where Monday == 0 ... Sunday == 6."
+        return space.newint((self.toordinal() + 6) % 7)
+
+    def descr_isoweekday(self, space):
+        "Return day of the week, where Monday == 1 ... Sunday == 7."
+        # 1-Jan-0001 is a Monday
+        return space.newint(self.toordinal() % 7 or 7)
+
+    def descr_isoformat(self, space):
+        """Return the date formatted according to ISO.
+
+        This is 'YYYY-MM-DD'.
+        """
+        return space.newtext(_format_date(self.year, self.month, self.day))
+
+@unwrap_spec(year=int, month=int, day=int)
+def descr_new_date(space, w_type, year=1, month=1, day=1):
+    """ dateinterop.__new__(cls, year=1, month=1, day=1) """
+    # like CPython for pickles, check only the month: the other fields
+    # may be insane, but the calendar arithmetic cannot crash
+    if not 1 <= month <= 12:
+        raise oefmt(space.w_ValueError, "month must be in 1..12")
+    w_date = space.allocate_instance(W_DateTime_Date, w_type)
+    W_DateTime_Date.__init__(w_date, year, month, day)
+    return w_date
+
+W_DateTime_Date.typedef = TypeDef('pypydatetime_date',
+    __new__ = interp2app(descr_new_date),
+    year = interp_attrproperty('year', W_DateTime_Date, doc="year (1-9999)",
+                               wrapfn="newint"),
+    month = interp_attrproperty('month', W_DateTime_Date, doc="month (1-12)",
+                                wrapfn="newint"),
+    day = interp_attrproperty('day', W_DateTime_Date, doc="day (1-31)",
+                              wrapfn="newint"),
+    _year = interp_attrproperty('year', W_DateTime_Date, wrapfn="newint"),
+    _month = interp_attrproperty('month', W_DateTime_Date, wrapfn="newint"),
+    _day = interp_attrproperty('day', W_DateTime_Date, wrapfn="newint"),
+    toordinal = interp2app(W_DateTime_Date.descr_toordinal),
+    weekday = interp2app(W_DateTime_Date.descr_weekday),
+    isoweekday = interp2app(W_DateTime_Date.descr_isoweekday),
+    isoformat = interp2app(W_DateTime_Date.descr_isoformat),
+    __str__ = interp2app(W_DateTime_Date.descr_isoformat),
+    __add__ = interp2app(W_DateTime_Date.descr_add),
+    __radd__ = interp2app(W_DateTime_Date.descr_add),
+    __sub__ = interp2app(W_DateTime_Date.descr_sub),
+    __hash__ = interp2app(W_DateTime_Date.descr_hash),
+    **_compare_methods(W_DateTime_Date)
+    )
+W_DateTime_Date.typedef.acceptable_as_base_class = True
+
+
+class W_DateTime_Time(W_Root):
+    """ builtin base class for datetime.time """
+    _immutable_fields_ = ['hour', 'minute', 'second', 'microsecond',
+                          'w_tzinfo']
+
+    def __init__(self, hour, minute, second, microsecond, w_tzinfo):
+        self.hour = hour
+        self.minute = minute
+        self.second = second
+        self.microsecond = microsecond
+        self.w_tzinfo = w_tzinfo
+
+    def compare(self, space, w_other):
+        # -> -1, 0, 1, or -3 if w_other is not a time
+        if not isinstance(w_other, W_DateTime_Time):
+            return -3
+        if self.w_tzinfo is not w_other.w_tzinfo:
+            # the UTC offsets may differ: see time._cmp()
+            w_res = space.call_method(self, '_cmp', w_other)
+            return _cmp_int(space.int_w(w_res), 0)
+        c = _cmp_int(self.hour, w_other.hour)
+        if c == 0:
+            c = _cmp_int(self.minute, w_other.minute)
+            if c == 0:
+                c = _cmp_int(self.second, w_other.second)
+                if c == 0:
+                    c = _cmp_int(self.microsecond, w_other.microsecond)
+        return c
+
+@unwrap_spec(hour=int, minute=int, second=int, microsecond=int,
+             w_tzinfo=WrappedDefault(None))
+def descr_new_time(space, w_type, hour=0, minute=0, second=0, microsecond=0,
+                   w_tzinfo=None):
+    """ timeinterop.__new__(cls, hour=0, minute=0, second=0, microsecond=0,
+    tzinfo=None) """
+    w_time = space.allocate_instance(W_DateTime_Time, w_type)
+    W_DateTime_Time.__init__(w_time, hour, minute, second, microsecond,
+                             w_tzinfo)
+    return w_time
+
+W_DateTime_Time.typedef = TypeDef('pypydatetime_time',
+    __new__ = interp2app(descr_new_time),
+    hour = interp_attrproperty('hour', W_DateTime_Time, doc="hour (0-23)",
+                               wrapfn="newint"),
+    minute = interp_attrproperty('minute', W_DateTime_Time,
+                                 doc="minute (0-59)", wrapfn="newint"),
+    second = interp_attrproperty('second', W_DateTime_Time,
+                                 doc="second (0-59)", wrapfn="newint"),
+    microsecond = interp_attrproperty('microsecond', W_DateTime_Time,
+                                      doc="microsecond (0-999999)",
+                                      wrapfn="newint"),
+    tzinfo = interp_attrproperty_w('w_tzinfo', W_DateTime_Time,
+                                   doc="timezone info object"),
+    _hour = interp_attrproperty('hour', W_DateTime_Time, wrapfn="newint"),
+    _minute = interp_attrproperty('minute', W_DateTime_Time,
+                                  wrapfn="newint"),
+    _second = interp_attrproperty('second', W_DateTime_Time,
+                                  wrapfn="newint"),
+    _microsecond = interp_attrproperty('microsecond', W_DateTime_Time,
+                                       wrapfn="newint"),
+    _tzinfo = interp_attrproperty_w('w_tzinfo', W_DateTime_Time),
+    **_compare_methods(W_DateTime_Time)
+    )
+W_DateTime_Time.typedef.acceptable_as_base_class = True
+
+
+# A parser for the common numeric strptime() formats, like '%Y-%m-%d
+# %H:%M:%S.%f' or '%Y-%m-%dT%H:%M:%S'.  The formats are compiled once to a
+# list of codes: a character code for a literal character, or one of the
+# negative codes below.  It follows the same rules as the regular
+# expressions of lib-python's _strptime.py, and gives up (returns None)
+# whenever the result might differ, leaving the work and the error
+# messages to _strptime.
+
+_PARSE_WHITESPACE = -1
+_PARSE_YEAR = -2
+_PARSE_MONTH = -3
+_PARSE_DAY = -4
+_PARSE_HOUR = -5
+_PARSE_MINUTE = -6
+_PARSE_SECOND = -7
+_PARSE_FRACTION = -8
+
+_PARSE_DIRECTIVES = {'Y': _PARSE_YEAR, 'm': _PARSE_MONTH, 'd': _PARSE_DAY,
+                     'H': _PARSE_HOUR, 'M': _PARSE_MINUTE,
+                     'S': _PARSE_SECOND, 'f': _PARSE_FRACTION}
+
+_FORMAT_CACHE_SIZE = 100
+
+class StrptimeCache(object):
+    def __init__(self, space):
+        # {format: list of codes, or None if the format is not supported}
+        self.formats = {}
+
+def _is_whitespace(c):
+    return c == ' ' or '\t' <= c <= '\r'
+
+def _lower_code(c):
+    if 'A' <= c <= 'Z':
+        return ord(c) + 32
+    return ord(c)
+
+def _compile_format(format):
+    codes = []
+    i = 0
+    length = len(format)
+    while i < length:
+        c = format[i]
+        if c == '%':
+            i += 1
+            if i == length:
+                return None
+            c = format[i]
+            if c == '%':
+                codes.append(ord('%'))
+            elif c in _PARSE_DIRECTIVES:
+                codes.append(_PARSE_DIRECTIVES[c])
+            else:
+                return None
+            i += 1
+        elif _is_whitespace(c):
+            while i < length and _is_whitespace(format[i]):
+                i += 1
+            codes.append(_PARSE_WHITESPACE)
+        else:
+            codes.append(_lower_code(c))
+            i += 1
+    return codes
+
+def _get_compiled_format(space, format):
+    cache = space.fromcache(StrptimeCache)
+    try:
+        return cache.formats[format]
+    except KeyError:
+        pass
+    codes = _compile_format(format)
+    if len(cache.formats) >= _FORMAT_CACHE_SIZE:
+        cache.formats.clear()
+    cache.formats[format] = codes
+    return codes
+
+def _parse_digits(s, pos, maxdigits):
+    value = 0
+    end = min(len(s), pos + maxdigits)
+    while pos < end and '0' <= s[pos] <= '9':
+        value = value * 10 + (ord(s[pos]) - ord('0'))
+        pos += 1
+    return value, pos
+
+def _parse_fields(codes, s):
+    year = 1900
+    month = 1
+    day = 1
+    hour = 0
+    minute = 0
+    second = 0
+    microsecond = 0
+    pos = 0
+    length = len(s)
+    for code in codes:
+        start = pos
+        if code >= 0:
+            if pos == length or _lower_code(s[pos]) != code:
+                return None
+            pos += 1
+        elif code == _PARSE_WHITESPACE:
+            while pos < length and _is_whitespace(s[pos]):
+                pos += 1
+            if pos == start:
+                return None
+        elif code == _PARSE_FRACTION:
+            value, pos = _parse_digits(s, pos, 6)
+            if pos == start:
+                return None
+            for i in range(6 - (pos - start)):
+                value *= 10
+            microsecond = value
+        elif code == _PARSE_YEAR:
+            value, pos = _parse_digits(s, pos, 4)
+            if pos - start != 4 or value < 1:
+                return None
+            year = value
+        else:
+            # the other fields are one or two digits.  If the first two
+            # don't make a valid value, _strptime might backtrack and take
+            # only one: give up instead
+            value, pos = _parse_digits(s, pos, 2)
+            if pos == start:
+                return None
+            if code == _PARSE_MONTH:
+                if not 1 <= value <= 12:
+                    return None
+                month = value
+            elif code == _PARSE_DAY:
+                if not 1 <= value <= 31:
+                    return None
+                day = value
+            elif code == _PARSE_HOUR:
+                if value > 23:
+                    return None
+                hour = value
+            elif code == _PARSE_MINUTE:
+                if value > 59:
+                    return None
+                minute = value
+            else:
+                assert code == _PARSE_SECOND
+                if value > 59:
+                    return None
+                second = value
+    if pos != length or day > _days_in_month(year, month):
+        return None
+    return [year, month, day, hour, minute, second, microsecond]
+
+@unwrap_spec(string='bytes', format='bytes')
+def parse_datetime(space, string, format):
+    """parse_datetime(string, format) -> (year, month, day, hour, minute,
+    second, microsecond), or None if the format is not one of the simple
+    numeric ones, or if the string doesn't match it."""
+    codes = _get_compiled_format(space, format)
+    if codes is None:
+        return space.w_None
+    fields = _parse_fields(codes, string)
+    if fields is None:
+        return space.w_None
+    return space.newtuple([space.newint(x) for x in fields])
@@ -66,6 +66,12 @@ class PyPyDateTime(MixedModule):
         'dateinterop'  : 'interp_pypydatetime.W_DateTime_Date',
         'timeinterop'  : 'interp_pypydatetime.W_DateTime_Time',
         'deltainterop' : 'interp_pypydatetime.W_DateTime_Delta',
+        'ymd2ord'      : 'interp_pypydatetime.ymd2ord',
+        'ord2ymd'      : 'interp_pypydatetime.ord2ymd',
+        'format_date'  : 'interp_pypydatetime.format_date',
+        'format_time'  : 'interp_pypydatetime.format_time',
+        'parse_datetime': 'interp_pypydatetime.parse_datetime',
+        'set_result_types': 'interp_pypydatetime.set_result_types',
     }
 
 class PyPyBufferable(MixedModule):
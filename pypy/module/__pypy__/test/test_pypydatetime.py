@@ -0,0 +1,171 @@
+class AppTestPyPyDateTime:
+    spaceconfig = dict(usemodules=['__pypy__'])
+
+    def test_ymd2ord(self):
+        from __pypy__._pypydatetime import ymd2ord
+        assert ymd2ord(1, 1, 1) == 1
+        assert ymd2ord(1, 12, 31) == 365
+        assert ymd2ord(2000, 3, 1) == 730180
+        assert ymd2ord(9999, 12, 31) == 3652059
+        # like the asserts of the pure Python version; the tests replace
+        # AssertionError with a subclass
+        builtin_AssertionError = AssertionError.__bases__[0]
+        raises(builtin_AssertionError, ymd2ord, 2001, 2, 29)
+        raises(builtin_AssertionError, ymd2ord, 2001, 13, 1)
+
+    def test_ord2ymd(self):
+        from __pypy__._pypydatetime import ymd2ord, ord2ymd
+        assert ord2ymd(1) == (1, 1, 1)
+        assert ord2ymd(365) == (1, 12, 31)
+        assert ord2ymd(0) == (0, 12, 31)
+        assert ord2ymd(3652059) == (9999, 12, 31)
+        for year in [1, 4, 100, 399, 400, 1900, 2000, 2003, 2004]:
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            for month, days in enumerate([31, 28 + leap, 31, 30, 31, 30, 31,
+                                          31, 30, 31, 30, 31]):
+                for day in range(1, days + 1):
+                    n = ymd2ord(year, month + 1, day)
+                    assert ord2ymd(n) == (year, month + 1, day)
+
+    def test_format(self):
+        from __pypy__._pypydatetime import format_date, format_time
+        assert format_date(1, 2, 3) == '0001-02-03'
+        assert format_date(2019, 12, 31) == '2019-12-31'
+        assert format_time(0, 0, 0, 0) == '00:00:00'
+        assert format_time(23, 5, 9, 0) == '23:05:09'
+        assert format_time(23, 5, 9, 42) == '23:05:09.000042'
+
+    def test_parse_datetime(self):
+        from __pypy__._pypydatetime import parse_datetime
+        assert parse_datetime('2019-12-31 23:59:58', '%Y-%m-%d %H:%M:%S') == (
+            2019, 12, 31, 23, 59, 58, 0)
+        assert parse_datetime('2019-1-2t3:04:05.12', '%Y-%m-%dT%H:%M:%S.%f') == (
+            2019, 1, 2, 3, 4, 5, 120000)
+        assert parse_datetime('5/6 %', '%m/%d  %%') == (1900, 5, 6, 0, 0, 0, 0)
+        # unsupported directives, or strings that _strptime has to check
+        assert parse_datetime('Jan 2019', '%b %Y') is None
+        assert parse_datetime('2019-02-29', '%Y-%m-%d') is None
+        assert parse_datetime('2019-13-01', '%Y-%m-%d') is None
+        assert parse_datetime('2019-12-01 ', '%Y-%m-%d') is None
+        assert parse_datetime('19-12-01', '%Y-%m-%d') is None
+
+    def test_delta(self):
+        from __pypy__._pypydatetime import deltainterop
+        a = deltainterop(1, 2, 3)
+        assert (a.days, a.seconds, a.microseconds) == (1, 2, 3)
+        assert a._days == 1
+        b = a + deltainterop(0, 86399, 999999)
+        assert type(b) is deltainterop
+        assert (b.days, b.seconds, b.microseconds) == (2, 2, 2)
+        b = a - deltainterop(2, 0, 0)
+        assert (b.days, b.seconds, b.microseconds) == (-1, 2, 3)
+        b = -a
+        assert (b.days, b.seconds, b.microseconds) == (-2, 86397, 999997)
+        assert abs(b) == a
+        assert +a == a and +a is not a
+        assert not deltainterop() and a
+        assert hash(a) == hash(deltainterop(1, 2, 3))
+        raises(OverflowError, "deltainterop(999999999) + a")
+        b = deltainterop(0, 86400, -1)
+        assert (b.days, b.seconds, b.microseconds) == (0, 86399, 999999)
+        raises(OverflowError, deltainterop, 999999999, 86400)
+        assert a.__add__(42) is NotImplemented
+
+    def test_delta_compare(self):
+        from __pypy__._pypydatetime import deltainterop
+        a = deltainterop(1, 2, 3)
+        b = deltainterop(1, 2, 4)
+        assert a < b and a <= b and a != b and not a == b
+        assert b > a and b >= a
+        assert a == deltainterop(1, 2, 3)
+        assert a != 42 and not a == 42
+        exc = raises(TypeError, "a < 42")
+        assert str(exc.value) == "can't compare 'pypydatetime_delta' to 'int'"
+
+    def test_date(self):
+        from __pypy__._pypydatetime import dateinterop, deltainterop
+        d = dateinterop(2019, 12, 31)
+        assert (d.year, d.month, d.day) == (2019, 12, 31)
+        assert d.toordinal() == 737424
+        assert d.weekday() == 1 and d.isoweekday() == 2
+        assert d.isoformat() == str(d) == '2019-12-31'
+        e = d + deltainterop(1, 86399, 0)
+        assert type(e) is dateinterop
+        assert (e.year, e.month, e.day) == (2020, 1, 1)
+        assert deltainterop(1) + d == e
+        assert e - d == deltainterop(1)
+        assert e - deltainterop(1) == d
+        assert d < e and e >= d and d != e
+        assert hash(d) == hash(dateinterop(2019, 12, 31))
+        assert d != 42
+        raises(TypeError, "d < 42")
+        class FakeDateTime(object):
+            def timetuple(self):
+                pass
+            def __eq__(self, other):
+                return 'fake'
+        assert (d == FakeDateTime()) == 'fake'
+        raises(OverflowError, "dateinterop(9999, 12, 31) + deltainterop(1)")
+        raises(ValueError, dateinterop, 2019, 13, 1)
+
+    def test_time(self):
+        from __pypy__._pypydatetime import timeinterop
+        t = timeinterop(12, 30, 15, 500)
+        assert (t.hour, t.minute, t.second, t.microsecond) == (12, 30, 15, 500)
+        assert t.tzinfo is None
+        assert t < timeinterop(12, 30, 15, 501)
+        assert t == timeinterop(12, 30, 15, 500)
+        assert t != 42
+        raises(TypeError, "t > 42")
+        class Time(timeinterop):
+            def _cmp(self, other):
+                return -5
+        tz = object()
+        assert Time(1, tzinfo=tz).tzinfo is tz
+        assert Time(1, tzinfo=tz) < timeinterop(0)
+
+    def test_set_result_types(self):
+        from __pypy__._pypydatetime import (dateinterop, deltainterop,
+            set_result_types)
+        class delta(deltainterop):
+            pass
+        class date(dateinterop):
+            pass
+        raises(TypeError, set_result_types, date, delta)
+        set_result_types(delta, date)
+        try:
+            assert type(deltainterop(1) + deltainterop(1)) is delta
+            assert type(date(2000, 1, 1) + delta(1)) is date
+            assert type(date(2000, 1, 1) - date(2000, 1, 1)) is delta
+        finally:
+            set_result_types(deltainterop, dateinterop)
+
+
+def test_parse_fields_like_strptime():
+    from datetime import datetime
+    from pypy.module.__pypy__.interp_pypydatetime import (_compile_format,
+        _parse_fields)
+    cases = [
+        ('%Y-%m-%d %H:%M:%S', ['2019-12-31 23:59:59', '2019-1-1 1:1:1',
+                               '2019-01-01\t 00:00:00', '2019-1-1 24:00:00',
+                               '2019-1-1 0:60:00', '2019-1-1 0:0:60',
+                               '2019-02-28 12:00:00', '2019-02-29 12:00:00',
+                               '2019-1-1 0:0:0x', '2019-1-1 0:0']),
+        ('%Y%m%d%H%M%S', ['20191231235959', '2019131', '201911']),
+        ('%Y-%m-%dT%H:%M:%S.%f', ['2019-05-06T07:08:09.1',
+                                  '2019-05-06t07:08:09.123456',
+                                  '2019-05-06T07:08:09.1234567',
+                                  '2019-05-06T07:08:09.']),
+        ('%d/%m/%Y', ['31/12/2019', '1/2/0000', '31/4/2019', ' 1/2/2019']),
+    ]
+    for format, strings in cases:
+        codes = _compile_format(format)
+        for s in strings:
+            fields = _parse_fields(codes, s)
+            try:
+                expected = datetime.strptime(s, format)
+            except ValueError:
+                assert fields is None
+            else:
+                if fields is not None:
+                    assert datetime(*fields) == expected
@@ -1,7 +1,7 @@
 import sys
 
 from rpython.rlib.objectmodel import specialize
-from rpython.rlib import jit
+from rpython.rlib import jit, rerased
 from rpython.rlib.debug import check_nonneg
 from pypy.interpreter import gateway
 from pypy.interpreter.baseobjspace import W_Root
@@ -44,10 +44,97 @@ CENTER   = ((BLOCKLEN - 1) / 2)
 
 class Block(object):
     __slots__ = ('leftlink', 'rightlink', 'data')
-    def __init__(self, leftlink, rightlink):
+    def __init__(self, leftlink, rightlink, data):
         self.leftlink = leftlink
         self.rightlink = rightlink
-        self.data = [None] * BLOCKLEN
+        self.data = data     # erased list of length BLOCKLEN, see below
+
+
+# The 'data' of all the blocks of a deque is stored according to the
+# deque's strategy: as a list of W_Root, or as a list of unwrapped ints
+# or floats if all the items of the deque are exactly ints or floats.
+# An empty deque picks its strategy again from the type of the next item
+# added; adding an item of another type to a non-empty deque switches it
+# to ObjectDequeStrategy.
+
+class DequeStrategy(object):
+    def __init__(self, space):
+        self.space = space
+
+    def new_data(self):
+        raise NotImplementedError("abstract base class")
+
+    def is_correct_type(self, w_item):
+        raise NotImplementedError("abstract base class")
+
+    def getitem(self, block, index):
+        raise NotImplementedError("abstract base class")
+
+    def setitem(self, block, index, w_item):
+        "Store 'w_item', which must be of the correct type."
+        raise NotImplementedError("abstract base class")
+
+    def clearitem(self, block, index):
+        pass
+
+
+class ObjectDequeStrategy(DequeStrategy):
+    erase, unerase = rerased.new_erasing_pair("deque_object")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def new_data(self):
+        return self.erase([None] * BLOCKLEN)
+
+    def is_correct_type(self, w_item):
+        return True
+
+    def getitem(self, block, index):
+        return self.unerase(block.data)[index]
+
+    def setitem(self, block, index, w_item):
+        self.unerase(block.data)[index] = w_item
+
+    def clearitem(self, block, index):
+        self.unerase(block.data)[index] = None
+
+
+class IntDequeStrategy(DequeStrategy):
+    erase, unerase = rerased.new_erasing_pair("deque_int")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def new_data(self):
+        return self.erase([0] * BLOCKLEN)
+
+    def is_correct_type(self, w_item):
+        space = self.space
+        return space.is_w(space.type(w_item), space.w_int)
+
+    def getitem(self, block, index):
+        return self.space.newint(self.unerase(block.data)[index])
+
+    def setitem(self, block, index, w_item):
+        self.unerase(block.data)[index] = self.space.int_w(w_item)
+
+
+class FloatDequeStrategy(DequeStrategy):
+    erase, unerase = rerased.new_erasing_pair("deque_float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def new_data(self):
+        return self.erase([0.0] * BLOCKLEN)
+
+    def is_correct_type(self, w_item):
+        space = self.space
+        return space.is_w(space.type(w_item), space.w_float)
+
+    def getitem(self, block, index):
+        return self.space.newfloat(self.unerase(block.data)[index])
+
+    def setitem(self, block, index, w_item):
+        self.unerase(block.data)[index] = self.space.float_w(w_item)
 
 class Lock(object):
     pass
@@ -88,6 +175,7 @@ class W_Deque(W_Root):
     def __init__(self, space):
         self.space = space
         self.maxlen = sys.maxint
+        self.strategy = space.fromcache(ObjectDequeStrategy)
         self.clear()
         check_nonneg(self.leftindex)
         check_nonneg(self.rightindex)
@@ -136,41 +224,80 @@ class W_Deque(W_Root):
 
     def append(self, w_x):
         "Add an element to the right side of the deque."
+        self.check_strategy(w_x)
         ri = self.rightindex + 1
         if ri >= BLOCKLEN:
-            b = Block(self.rightblock, None)
+            b = Block(self.rightblock, None, self.strategy.new_data())
             self.rightblock.rightlink = b
             self.rightblock = b
             ri = 0
         self.rightindex = ri
-        self.rightblock.data[ri] = w_x
+        self.strategy.setitem(self.rightblock, ri, w_x)
         self.len += 1
         self.trimleft()
         self.modified()
 
     def appendleft(self, w_x):
         "Add an element to the left side of the deque."
+        self.check_strategy(w_x)
         li = self.leftindex - 1
         if li < 0:
-            b = Block(None, self.leftblock)
+            b = Block(None, self.leftblock, self.strategy.new_data())
             self.leftblock.leftlink = b
             self.leftblock = b
             li = BLOCKLEN - 1
         self.leftindex = li
-        self.leftblock.data[li] = w_x
+        self.strategy.setitem(self.leftblock, li, w_x)
         self.len += 1
         self.trimright()
         self.modified()
 
     def clear(self):
         "Remove all elements from the deque."
-        self.leftblock = Block(None, None)
+        self.leftblock = Block(None, None, self.strategy.new_data())
         self.rightblock = self.leftblock
         self.leftindex = CENTER + 1
         self.rightindex = CENTER
         self.len = 0
         self.modified()
 
+    def check_strategy(self, w_x):
+        """Make sure that the strategy can store 'w_x'.  Must be called
+        before storing an item."""
+        if self.len == 0:
+            strategy = self.select_strategy(w_x)
+            if strategy is not self.strategy:
+                self.strategy = strategy
+                self.clear()
+        elif not self.strategy.is_correct_type(w_x):
+            self.switch_to_object_strategy()
+
+    def select_strategy(self, w_x):
+        space = self.space
+        w_type = space.type(w_x)
+        if space.is_w(w_type, space.w_int):
+            return space.fromcache(IntDequeStrategy)
+        elif space.is_w(w_type, space.w_float):
+            return space.fromcache(FloatDequeStrategy)
+        return space.fromcache(ObjectDequeStrategy)
+
+    def switch_to_object_strategy(self):
+        strategy = self.space.fromcache(ObjectDequeStrategy)
+        block = self.leftblock
+        index = self.leftindex
+        data_w = [None] * BLOCKLEN
+        for i in range(self.len):
+            data_w[index] = self.strategy.getitem(block, index)
+            index += 1
+            if index >= BLOCKLEN:
+                block.data = strategy.erase(data_w)
+                block = block.rightlink
+                data_w = [None] * BLOCKLEN
+                index = 0
+        if block is not None:
+            block.data = strategy.erase(data_w)
+        self.strategy = strategy
+
     def count(self, w_x):
         "Return number of occurrences of value."
         result = self._find_or_count(w_x, is_find=False)
@@ -217,8 +344,8 @@ class W_Deque(W_Root):
             raise oefmt(self.space.w_IndexError, "pop from an empty deque")
         self.len -= 1
         ri = self.rightindex
-        w_obj = self.rightblock.data[ri]
-        self.rightblock.data[ri] = None
+        w_obj = self.strategy.getitem(self.rightblock, ri)
+        self.strategy.clearitem(self.rightblock, ri)
         ri -= 1
         if ri < 0:
             if self.len == 0:
@@ -240,8 +367,8 @@ class W_Deque(W_Root):
             raise oefmt(self.space.w_IndexError, "pop from an empty deque")
         self.len -= 1
         li = self.leftindex
-        w_obj = self.leftblock.data[li]
-        self.leftblock.data[li] = None
+        w_obj = self.strategy.getitem(self.leftblock, li)
+        self.strategy.clearitem(self.leftblock, li)
         li += 1
         if li >= BLOCKLEN:
             if self.len == 0:
@@ -266,7 +393,7 @@ class W_Deque(W_Root):
         result = 0
         for i in range(self.len):
             find_jmp.jit_merge_point(tp=tp, is_find=is_find)
-            w_item = block.data[index]
+            w_item = self.strategy.getitem(block, index)
             equal = space.eq_w(w_item, w_x)
             self.checklock(lock)
             if is_find:
@@ -297,8 +424,11 @@ class W_Deque(W_Root):
         lb = self.leftblock
         ri = self.rightindex
         rb = self.rightblock
+        strategy = self.strategy
         for i in range(self.len >> 1):
-            lb.data[li], rb.data[ri] = rb.data[ri], lb.data[li]
+            w_left = strategy.getitem(lb, li)
+            strategy.setitem(lb, li, strategy.getitem(rb, ri))
+            strategy.setitem(rb, ri, w_left)
             li += 1
             if li >= BLOCKLEN:
                 lb = lb.rightlink
@@ -390,7 +520,7 @@ class W_Deque(W_Root):
         start, stop, step, _ = space.decode_index4(w_index, self)
         if step == 0:  # index only
             b, i = self.locate(start)
-            return b.data[i]
+            return self.strategy.getitem(b, i)
         else:
             raise oefmt(space.w_TypeError, "deque[:] is not supported")
 
@@ -398,8 +528,9 @@ class W_Deque(W_Root):
         space = self.space
         start, stop, step, _ = space.decode_index4(w_index, self)
         if step == 0:  # index only
+            self.check_strategy(w_newobj)
             b, i = self.locate(start)
-            b.data[i] = w_newobj
+            self.strategy.setitem(b, i, w_newobj)
         else:
             raise oefmt(space.w_TypeError, "deque[:] is not supported")
 
@@ -543,7 +674,7 @@ class W_DequeIter(W_Root):
             raise OperationError(space.w_StopIteration, space.w_None)
         self.counter -= 1
         ri = self.index
-        w_x = self.block.data[ri]
+        w_x = self.deque.strategy.getitem(self.block, ri)
         ri += 1
         if ri == BLOCKLEN:
             self.block = self.block.rightlink
@@ -585,7 +716,7 @@ class W_DequeRevIter(W_Root):
             raise OperationError(space.w_StopIteration, space.w_None)
         self.counter -= 1
         ri = self.index
-        w_x = self.block.data[ri]
+        w_x = self.deque.strategy.getitem(self.block, ri)
         ri -= 1
         if ri < 0:
             self.block = self.block.leftlink
@@ -298,3 +298,72 @@ def test_index_method_mutates():
     d = deque([1, 2, 3, 4, 5])
     with raises(IndexError):
         d[A()] = 2
+
+def test_strategies():
+    from __pypy__ import strategy
+    d = deque()
+    assert strategy(d) == "ObjectDequeStrategy"
+    d.extend(range(100))
+    assert strategy(d) == "IntDequeStrategy"
+    d.appendleft(-1)
+    assert list(d) == range(-1, 100)
+    assert d.popleft() == -1
+    assert d.pop() == 99
+    d.rotate(3)
+    d.reverse()
+    assert strategy(d) == "IntDequeStrategy"
+    assert list(d) == list(reversed(range(96, 99) + range(0, 96)))
+    d[5] = 42
+    assert d[5] == 42 and type(d[5]) is int
+    assert d.count(42) == 2
+    d.remove(42)
+    assert strategy(d) == "IntDequeStrategy"
+    d.append(True)
+    assert strategy(d) == "ObjectDequeStrategy"
+    assert d[-1] is True
+    assert len(d) == 99
+    assert list(d)[:3] == [95, 94, 93]
+    d.clear()
+    d.append(1.5)
+    assert strategy(d) == "FloatDequeStrategy"
+    d.appendleft(0.5)
+    assert list(d) == [0.5, 1.5]
+    assert type(d.pop()) is float
+
+def test_strategies_switch():
+    from __pypy__ import strategy
+    for items, extra in [(range(200), 'x'), ([i + 0.5 for i in range(150)], 1),
+                         (range(62), 1.5), (range(61), 1L)]:
+        d = deque(items)
+        d.popleft()
+        d.append(extra)
+        assert strategy(d) == "ObjectDequeStrategy"
+        assert list(d) == items[1:] + [extra]
+        d = deque(items)
+        d[len(items) // 2] = extra
+        assert strategy(d) == "ObjectDequeStrategy"
+        items = items[:]
+        items[len(items) // 2] = extra
+        assert list(d) == items
+
+def test_strategies_empty_reselects():
+    from __pypy__ import strategy
+    d = deque([1, 2, 3], maxlen=3)
+    d.append(4)
+    assert list(d) == [2, 3, 4]
+    while d:
+        d.pop()
+    d.append(2.5)
+    assert strategy(d) == "FloatDequeStrategy"
+    d.append(3.5)
+    d.append(4.5)
+    d.append(5.5)
+    assert list(d) == [3.5, 4.5, 5.5]
+    assert list(reversed(d)) == [5.5, 4.5, 3.5]
+
+def test_strategies_mutation_during_iteration():
+    d = deque(range(10))
+    it = iter(d)
+    assert next(it) == 0
+    d.append('x')
+    raises(RuntimeError, next, it)
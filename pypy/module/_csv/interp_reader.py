@@ -1,4 +1,7 @@
-from rpython.rlib.rstring import StringBuilder
+from rpython.rlib.rstring import StringBuilder, ParseStringError
+from rpython.rlib.rstring import ParseStringOverflowError
+from rpython.rlib.rarithmetic import string_to_int
+from rpython.rlib.rfloat import string_to_float
 from rpython.rlib import objectmodel
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError, oefmt
@@ -14,14 +17,21 @@ from pypy.objspace.std.util import wrap_parsestringerror
  IN_QUOTED_FIELD, ESCAPE_IN_QUOTED_FIELD, QUOTE_IN_QUOTED_FIELD,
  EAT_CRNL) = range(8)
 
+# what to do with the fields of a column, see 'converters' in csv_reader()
+(CONVERT_NONE, CONVERT_INT, CONVERT_FLOAT, CONVERT_CALL) = range(4)
+
 
 class W_Reader(W_Root):
 
-    def __init__(self, space, dialect, w_iter):
+    def __init__(self, space, dialect, w_iter, converters=None,
+                 converters_w=None):
         self.space = space
         self.dialect = dialect
         self.w_iter = w_iter
         self.line_num = 0
+        # a CONVERT_* for each column, and for CONVERT_CALL the callable
+        self.converters = converters
+        self.converters_w = converters_w
 
     def iter_w(self):
         return self
@@ -42,9 +52,14 @@ class W_Reader(W_Root):
     def save_field(self, field_builder):
         space = self.space
         field = field_builder.build()
+        converters = self.converters
+        if converters is not None:
+            index = len(self.fields_w)
+            if index < len(converters) and converters[index] != CONVERT_NONE:
+                self.numeric_field = False
+                self.fields_w.append(self.convert_field(index, field))
+                return
         if self.numeric_field:
-            from rpython.rlib.rstring import ParseStringError
-            from rpython.rlib.rfloat import string_to_float
             self.numeric_field = False
             try:
                 ff = string_to_float(field)
@@ -55,7 +70,65 @@ class W_Reader(W_Root):
             w_obj = space.newtext(field)
         self.fields_w.append(w_obj)
 
+    def convert_field(self, index, field):
+        space = self.space
+        kind = self.converters[index]
+        if kind == CONVERT_CALL:
+            return space.call_function(self.converters_w[index],
+                                       space.newtext(field))
+        if not field:
+            return space.w_None
+        if kind == CONVERT_INT:
+            try:
+                return space.newint(string_to_int(field))
+            except ParseStringError as e:
+                raise wrap_parsestringerror(space, e, space.newtext(field))
+            except ParseStringOverflowError:
+                return space.call_function(space.w_int, space.newtext(field))
+        else:
+            assert kind == CONVERT_FLOAT
+            try:
+                return space.newfloat(string_to_float(field))
+            except ParseStringError as e:
+                raise wrap_parsestringerror(space, e, space.newtext(field))
+
     def next_w(self):
+        return self.space.newlist(self.read_record())
+
+    @unwrap_spec(n=int, columns=bool)
+    def read_batch_w(self, space, n, columns=False):
+        """read_batch(n, columns=False) -> list
+
+        Read up to n records.  Fewer are returned only at the end of the
+        input, and an empty list when there is nothing left.  With
+        columns=True, return a list of columns instead, each one a list
+        of the fields of that column in the records read; missing fields
+        of short records are None."""
+        records = []
+        while len(records) < n:
+            try:
+                records.append(self.read_record())
+            except OperationError as e:
+                if not e.match(space, space.w_StopIteration):
+                    raise
+                break
+        if not columns:
+            return space.newlist([space.newlist(fields_w)
+                                  for fields_w in records])
+        num_columns = 0
+        for fields_w in records:
+            num_columns = max(num_columns, len(fields_w))
+        columns_w = []
+        for index in range(num_columns):
+            column_w = [space.w_None] * len(records)
+            for i in range(len(records)):
+                fields_w = records[i]
+                if index < len(fields_w):
+                    column_w[i] = fields_w[index]
+            columns_w.append(space.newlist(column_w))
+        return space.newlist(columns_w)
+
+    def read_record(self):
         space = self.space
         dialect = self.dialect
         self.fields_w = []
@@ -209,9 +282,9 @@ class W_Reader(W_Root):
             else:
                 break
         #
-        w_result = space.newlist(self.fields_w)
+        fields_w = self.fields_w
         self.fields_w = None
-        return w_result
+        return fields_w
 
 
 def csv_reader(space, w_iterator, w_dialect=None,
@@ -223,6 +296,7 @@ def csv_reader(space, w_iterator, w_dialect=None,
                   w_quoting          = None,
                   w_skipinitialspace = None,
                   w_strict           = None,
+                  w_converters       = None,
                   ):
     """
     csv_reader = reader(iterable [, dialect='excel']
@@ -237,12 +311,39 @@ def csv_reader(space, w_iterator, w_dialect=None,
     provided by the dialect.
 
     The returned object is an iterator.  Each iteration returns a row
-    of the CSV file (which can span multiple input lines)"""
+    of the CSV file (which can span multiple input lines).  The reader
+    also has a read_batch() method to get many rows, or columns, at once.
+
+    The optional \"converters\" keyword argument is a sequence giving,
+    for each column, how to convert its fields: int or float parse the
+    field, and give None for an empty field; str or None leave the field
+    unchanged; any other callable is called with the field.  Columns
+    after the end of the sequence are left unchanged."""
     w_iter = space.iter(w_iterator)
     dialect = _build_dialect(space, w_dialect, w_delimiter, w_doublequote,
                              w_escapechar, w_lineterminator, w_quotechar,
                              w_quoting, w_skipinitialspace, w_strict)
-    return W_Reader(space, dialect, w_iter)
+    if space.is_none(w_converters):
+        return W_Reader(space, dialect, w_iter)
+    converters = []
+    converters_w = []
+    for w_converter in space.fixedview(w_converters):
+        if (space.is_none(w_converter) or
+                space.is_w(w_converter, space.w_bytes)):
+            kind = CONVERT_NONE
+        elif space.is_w(w_converter, space.w_int):
+            kind = CONVERT_INT
+        elif space.is_w(w_converter, space.w_float):
+            kind = CONVERT_FLOAT
+        elif space.callable_w(w_converter):
+            kind = CONVERT_CALL
+        else:
+            raise oefmt(space.w_TypeError,
+                        "converters must be callables or None, not %T",
+                        w_converter)
+        converters.append(kind)
+        converters_w.append(w_converter)
+    return W_Reader(space, dialect, w_iter, converters, converters_w)
 
 W_Reader.typedef = TypeDef(
         '_csv.reader',
@@ -251,6 +352,7 @@ W_Reader.typedef = TypeDef(
             wrapfn="newint"),
         __iter__ = interp2app(W_Reader.iter_w),
         next = interp2app(W_Reader.next_w),
+        read_batch = interp2app(W_Reader.read_batch_w),
         __doc__ = """CSV reader
 
 Reader objects are responsible for reading and parsing tabular data
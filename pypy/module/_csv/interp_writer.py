@@ -2,17 +2,28 @@ from rpython.rlib.rstring import StringBuilder
 from rpython.rlib import objectmodel
 from pypy.interpreter.baseobjspace import W_Root
 from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import unwrap_spec
 from pypy.interpreter.typedef import TypeDef, interp2app
 from pypy.interpreter.typedef import interp_attrproperty_w
 from pypy.module._csv.interp_csv import _build_dialect
 from pypy.module._csv.interp_csv import (QUOTE_MINIMAL, QUOTE_ALL,
                                          QUOTE_NONNUMERIC, QUOTE_NONE)
+from pypy.objspace.std.floatobject import float_repr
+
+
+WRITEROWS_CHUNK = 65536
 
 
 class W_Writer(W_Root):
-    def __init__(self, space, dialect, w_fileobj):
+    def __init__(self, space, dialect, w_fileobj, buffer_size=0):
         self.space = space
         self.dialect = dialect
+        # when buffer_size > 0, the rows are kept in 'buffer' until it
+        # is larger than buffer_size, or flush() is called
+        self.buffer_size = buffer_size
+        self.buffer = None
+        if buffer_size > 0:
+            self.buffer = StringBuilder(buffer_size)
         self.w_filewrite = space.getattr(w_fileobj, space.newtext('write'))
         # precompute this
         special = dialect.delimiter + dialect.lineterminator
@@ -29,14 +40,100 @@ class W_Writer(W_Root):
         w_error = space.getattr(w_module, space.newtext('Error'))
         raise OperationError(w_error, space.newtext(msg))
 
-    def writerow(self, w_fields):
-        """Construct and write a CSV record from a sequence of fields.
-        Non-string elements will be converted to string."""
-        space = self.space
-        fields_w = space.listview(w_fields)
+    def append_field(self, rec, field, quoted, field_index, num_fields):
         dialect = self.dialect
-        rec = StringBuilder(80)
-        #
+        # If field is empty check if it needs to be quoted
+        if len(field) == 0 and num_fields == 1:
+            if dialect.quoting == QUOTE_NONE:
+                raise self.error("single empty field record "
+                                 "must be quoted")
+            quoted = True
+
+        # If this is not the first field we need a field separator
+        if field_index > 0:
+            rec.append(dialect.delimiter)
+
+        # Handle preceding quote
+        if quoted:
+            rec.append(dialect.quotechar)
+
+        # Copy field data
+        special_characters = self.special_characters
+        for c in field:
+            if c in special_characters:
+                if dialect.quoting == QUOTE_NONE:
+                    want_escape = True
+                else:
+                    want_escape = False
+                    if c == dialect.quotechar:
+                        if dialect.doublequote:
+                            rec.append(dialect.quotechar)
+                        else:
+                            want_escape = True
+                if want_escape:
+                    if dialect.escapechar == '\0':
+                        raise self.error("need to escape, "
+                                         "but no escapechar set")
+                    rec.append(dialect.escapechar)
+                else:
+                    assert quoted
+            # Copy field character into record buffer
+            rec.append(c)
+
+        # Handle final quote
+        if quoted:
+            rec.append(dialect.quotechar)
+
+    def must_quote(self, field, numeric):
+        dialect = self.dialect
+        if dialect.quoting == QUOTE_NONNUMERIC:
+            return not numeric
+        elif dialect.quoting == QUOTE_ALL:
+            return True
+        elif dialect.quoting == QUOTE_MINIMAL:
+            # Find out if we really quoting
+            special_characters = self.special_characters
+            for c in field:
+                if c in special_characters:
+                    if c != dialect.quotechar or dialect.doublequote:
+                        return True
+            return False
+        else:
+            return False
+
+    def append_record(self, rec, w_fields):
+        space = self.space
+        # fast paths for lists of ints, floats or strings, which don't
+        # need to call str() or repr() on each field
+        ints = space.listview_int(w_fields)
+        if ints is not None:
+            for field_index in range(len(ints)):
+                field = str(ints[field_index])
+                self.append_field(rec, field, self.must_quote(field, True),
+                                  field_index, len(ints))
+        else:
+            floats = space.listview_float(w_fields)
+            if floats is not None:
+                for field_index in range(len(floats)):
+                    field = float_repr(floats[field_index])
+                    self.append_field(rec, field,
+                                      self.must_quote(field, True),
+                                      field_index, len(floats))
+            else:
+                strings = space.listview_bytes(w_fields)
+                if strings is not None:
+                    for field_index in range(len(strings)):
+                        field = strings[field_index]
+                        self.append_field(rec, field,
+                                          self.must_quote(field, False),
+                                          field_index, len(strings))
+                else:
+                    self.append_fields_w(rec, space.listview(w_fields))
+        # Add line terminator
+        rec.append(self.dialect.lineterminator)
+
+    def append_fields_w(self, rec, fields_w):
+        space = self.space
         for field_index in range(len(fields_w)):
             w_field = fields_w[field_index]
             if space.is_w(w_field, space.w_None):
@@ -46,74 +143,50 @@ class W_Writer(W_Root):
             else:
                 field = space.text_w(space.str(w_field))
             #
-            if dialect.quoting == QUOTE_NONNUMERIC:
+            numeric = False
+            if self.dialect.quoting == QUOTE_NONNUMERIC:
                 try:
                     space.float_w(w_field)    # is it an int/long/float?
-                    quoted = False
+                    numeric = True
                 except OperationError as e:
                     if e.async(space):
                         raise
-                    quoted = True
-            elif dialect.quoting == QUOTE_ALL:
-                quoted = True
-            elif dialect.quoting == QUOTE_MINIMAL:
-                # Find out if we really quoting
-                special_characters = self.special_characters
-                for c in field:
-                    if c in special_characters:
-                        if c != dialect.quotechar or dialect.doublequote:
-                            quoted = True
-                            break
-                else:
-                    quoted = False
-            else:
-                quoted = False
-
-            # If field is empty check if it needs to be quoted
-            if len(field) == 0 and len(fields_w) == 1:
-                if dialect.quoting == QUOTE_NONE:
-                    raise self.error("single empty field record "
-                                     "must be quoted")
-                quoted = True
+            self.append_field(rec, field, self.must_quote(field, numeric),
+                              field_index, len(fields_w))
 
-            # If this is not the first field we need a field separator
-            if field_index > 0:
-                rec.append(dialect.delimiter)
-
-            # Handle preceding quote
-            if quoted:
-                rec.append(dialect.quotechar)
+    def flush_buffer(self):
+        space = self.space
+        rec = self.buffer
+        if rec is None or rec.getlength() == 0:
+            return
+        self.buffer = StringBuilder(self.buffer_size)
+        space.call_function(self.w_filewrite, space.newtext(rec.build()))
 
-            # Copy field data
-            special_characters = self.special_characters
-            for c in field:
-                if c in special_characters:
-                    if dialect.quoting == QUOTE_NONE:
-                        want_escape = True
-                    else:
-                        want_escape = False
-                        if c == dialect.quotechar:
-                            if dialect.doublequote:
-                                rec.append(dialect.quotechar)
-                            else:
-                                want_escape = True
-                    if want_escape:
-                        if dialect.escapechar == '\0':
-                            raise self.error("need to escape, "
-                                             "but no escapechar set")
-                        rec.append(dialect.escapechar)
-                    else:
-                        assert quoted
-                # Copy field character into record buffer
-                rec.append(c)
-
-            # Handle final quote
-            if quoted:
-                rec.append(dialect.quotechar)
-
-        # Add line terminator
-        rec.append(dialect.lineterminator)
+    def buffer_record(self, w_fields):
+        rec = self.buffer
+        length = rec.getlength()
+        try:
+            self.append_record(rec, w_fields)
+        except OperationError:
+            # drop the part of the record that was already added
+            if rec.getlength() > length:
+                data = rec.build()
+                rec = StringBuilder(self.buffer_size)
+                rec.append_slice(data, 0, length)
+                self.buffer = rec
+            raise
+        if rec.getlength() >= self.buffer_size:
+            self.flush_buffer()
 
+    def writerow(self, w_fields):
+        """Construct and write a CSV record from a sequence of fields.
+        Non-string elements will be converted to string."""
+        space = self.space
+        if self.buffer is not None:
+            self.buffer_record(w_fields)
+            return space.w_None
+        rec = StringBuilder(80)
+        self.append_record(rec, w_fields)
         line = rec.build()
         return space.call_function(self.w_filewrite, space.newtext(line))
 
@@ -122,6 +195,23 @@ class W_Writer(W_Root):
         Non-string elements will be converted to string."""
         space = self.space
         w_iter = space.iter(w_seqseq)
+        if self.buffer is not None:
+            self._writerows(w_iter)
+            return
+        # not a buffered writer: still, write the rows in big chunks
+        self.buffer = StringBuilder(WRITEROWS_CHUNK)
+        self.buffer_size = WRITEROWS_CHUNK
+        try:
+            self._writerows(w_iter)
+        finally:
+            try:
+                self.flush_buffer()
+            finally:
+                self.buffer = None
+                self.buffer_size = 0
+
+    def _writerows(self, w_iter):
+        space = self.space
         while True:
             try:
                 w_seq = space.next(w_iter)
@@ -129,9 +219,15 @@ class W_Writer(W_Root):
                 if e.match(space, space.w_StopIteration):
                     break
                 raise
-            self.writerow(w_seq)
+            self.buffer_record(w_seq)
 
+    def flush(self):
+        """Write the rows kept in the buffer, if the writer was created
+        with a buffer_size."""
+        self.flush_buffer()
 
+
+@unwrap_spec(buffer_size=int)
 def csv_writer(space, w_fileobj, w_dialect=None,
                   w_delimiter        = None,
                   w_doublequote      = None,
@@ -141,6 +237,7 @@ def csv_writer(space, w_fileobj, w_dialect=None,
                   w_quoting          = None,
                   w_skipinitialspace = None,
                   w_strict           = None,
+                  buffer_size        = 0,
                   ):
     """
     csv_writer = csv.writer(fileobj [, dialect='excel']
@@ -154,17 +251,22 @@ def csv_writer(space, w_fileobj, w_dialect=None,
                             [optional keyword args])
     csv_writer.writerows(rows)
 
-    The \"fileobj\" argument can be any object that supports the file API."""
+    The \"fileobj\" argument can be any object that supports the file API.
+
+    If \"buffer_size\" is given, the rows are collected and only written
+    to the file when they add up to more than buffer_size bytes.  Call
+    csv_writer.flush() to write the rest."""
     dialect = _build_dialect(space, w_dialect, w_delimiter, w_doublequote,
                              w_escapechar, w_lineterminator, w_quotechar,
                              w_quoting, w_skipinitialspace, w_strict)
-    return W_Writer(space, dialect, w_fileobj)
+    return W_Writer(space, dialect, w_fileobj, buffer_size)
 
 W_Writer.typedef = TypeDef(
         '_csv.writer',
         dialect = interp_attrproperty_w('dialect', W_Writer),
         writerow = interp2app(W_Writer.writerow),
         writerows = interp2app(W_Writer.writerows),
+        flush = interp2app(W_Writer.flush),
         __doc__ = """CSV writer
 
 Writer objects are responsible for generating tabular data
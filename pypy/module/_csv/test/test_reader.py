@@ -104,3 +104,28 @@ class AppTestReader(object):
         self._read_test(['a,"'], 'Error', strict=True)
         self._read_test(['"a'], 'Error', strict=True)
         self._read_test(['^'], 'Error', escapechar='^', strict=True)
+
+    def test_read_converters(self):
+        import _csv as csv
+        self._read_test(['1,2.5,x,y,z\n', ',,,,\n'],
+                        [[1, 2.5, 'x', 'Y', 'z'], [None, None, '', '', '']],
+                        converters=[int, float, str, lambda s: s.upper()])
+        self._read_test(['12345678901234567890,a'],
+                        [[12345678901234567890, 'a']], converters=[int, None])
+        self._read_test(['"1",2'], [[1, 2]], converters=(int, int))
+        self._read_test(['a,b'], [['a', 'b']], converters=[])
+        raises(ValueError, self._read_test, ['x'], [], converters=[int])
+        raises(ValueError, self._read_test, ['x'], [], converters=[float])
+        raises(TypeError, csv.reader, [], converters=[42])
+
+    def test_read_batch(self):
+        import _csv as csv
+        r = csv.reader(['1,a\n', '2,b\n', '3\n'], converters=[int])
+        assert r.read_batch(2) == [[1, 'a'], [2, 'b']]
+        assert r.read_batch(2) == [[3]]
+        assert r.read_batch(2) == []
+        assert r.line_num == 3
+        r = csv.reader(['1,a\n', '2,b\n', '3\n'], converters=[int])
+        assert r.read_batch(10, columns=True) == [[1, 2, 3],
+                                                  ['a', 'b', None]]
+        assert r.read_batch(10, columns=True) == []
@@ -85,3 +85,54 @@ class AppTestWriter(object):
 
     def test_writerows(self):
         self._write_test([['a'],['b','c']], 'a\r\nb,c')
+
+    def test_write_list_strategies(self):
+        import _csv as csv
+        self._write_test([1, -2, 3], '1,-2,3')
+        self._write_test([1.5, 2.0], '1.5,2.0')
+        self._write_test(['a', 'p,q', ''], 'a,"p,q",')
+        self._write_test([1, 2], '1,2', quoting=csv.QUOTE_NONNUMERIC)
+        self._write_test([1.5], '1.5', quoting=csv.QUOTE_NONNUMERIC)
+        self._write_test(['a', 'b'], '"a","b"', quoting=csv.QUOTE_NONNUMERIC)
+        self._write_test([1, 23], '12"23"', delimiter='2')
+        self._write_test([[1, 2], [3.5], ['x']], '1,2\r\n3.5\r\nx')
+        self._write_test([''], '""')
+
+    def test_writerows_chunks(self):
+        import _csv
+        class File(object):
+            def __init__(self):
+                self.writes = []
+            def write(self, data):
+                self.writes.append(data)
+        f = File()
+        _csv.writer(f).writerows([[i, 'x' * 100] for i in range(1000)])
+        assert 1 < len(f.writes) < 10
+        assert ''.join(f.writes) == ''.join(['%d,%s\r\n' % (i, 'x' * 100)
+                                             for i in range(1000)])
+        # the complete rows are written when there is an error
+        f = File()
+        raises(_csv.Error, _csv.writer(f, escapechar=None,
+                                       quoting=_csv.QUOTE_NONE).writerows,
+               [['a'], ['b'], ['c', 'd,e']])
+        assert f.writes == ['a\r\nb\r\n']
+
+    def test_buffered_writer(self):
+        import _csv
+        class File(object):
+            def __init__(self):
+                self.writes = []
+            def write(self, data):
+                self.writes.append(data)
+        f = File()
+        w = _csv.writer(f, buffer_size=10, escapechar=None,
+                        quoting=_csv.QUOTE_NONE)
+        assert w.writerow(['abc']) is None
+        assert f.writes == []
+        raises(_csv.Error, w.writerow, ['a', 'b,c'])
+        w.writerows([['defgh'], ['i']])
+        assert f.writes == ['abc\r\ndefgh\r\n']
+        w.flush()
+        assert f.writes == ['abc\r\ndefgh\r\n', 'i\r\n']
+        w.flush()
+        assert len(f.writes) == 2
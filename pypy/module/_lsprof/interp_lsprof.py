@@ -293,6 +293,8 @@ def lsprof_call(space, w_self, frame, event, w_arg):
 
 
 class W_Profiler(W_Root):
+    _immutable_fields_ = ['w_callable', 'subcalls?', 'builtins?']
+
     def __init__(self, space, w_callable, time_unit, subcalls, builtins):
         self.subcalls = subcalls
         self.builtins = builtins
@@ -334,9 +336,13 @@ class W_Profiler(W_Root):
         self.is_enabled = True
         self.total_real_time -= time.time()
         self.total_timestamp -= read_timestamp()
-        # set profiler hook
+        # set profiler hook.  Without 'builtins', we don't need the
+        # 'c_call' events: then the frames are not marked as being
+        # profiled, and the JIT can keep running the same machine code,
+        # with only the 'call' and 'return' events added in it.
         c_setup_profiling()
-        space.getexecutioncontext().setllprofile(lsprof_call, self)
+        space.getexecutioncontext().setllprofile(lsprof_call, self,
+                                                 c_calls=self.builtins)
 
     @jit.elidable
     def _get_or_make_entry(self, f_code, make=True):
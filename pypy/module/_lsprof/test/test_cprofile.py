@@ -26,6 +26,27 @@ class AppTestCProfile(object):
         for entry in stats:
             assert entry.code in expected
 
+    def test_no_builtins(self):
+        import _lsprof
+        prof = _lsprof.Profiler(builtins=False)
+        lst = []
+        def f1():
+            lst.append(len(lst))
+        prof.enable()
+        for i in range(5):
+            f1()
+        prof.disable()
+        entry, = prof.getstats()
+        assert entry.code is f1.__code__
+        assert entry.callcount == 5
+        assert entry.calls is None
+        prof.enable(builtins=True)
+        f1()
+        prof.disable()
+        codes = [entry.code for entry in prof.getstats()]
+        assert "<len>" in codes
+        assert f1.__code__ in codes
+
     def test_builtins_callers(self):
         import _lsprof
         prof = _lsprof.Profiler(subcalls=True)
@@ -1195,3 +1195,34 @@ def loads(space, w_s):
     finally:
         decoder.close()
 
+@jit.dont_look_inside
+def loads_lines(space, w_s):
+    """ Decode a string that contains one JSON document per line, and return
+    the list of decoded values.  Blank lines are ignored.  All the documents
+    are decoded by the same decoder, so the caches of keys and strings are
+    shared between them. """
+    if space.isinstance_w(w_s, space.w_unicode):
+        raise oefmt(space.w_TypeError,
+                    "Expected utf8-encoded str, got unicode")
+    s = space.bytes_w(w_s)
+    decoder = JSONDecoder(space, s)
+    result_w = []
+    try:
+        i = decoder.skip_whitespace(0)
+        while i < len(s):
+            result_w.append(decoder.decode_any(i))
+            i = decoder.pos
+            # only whitespace may follow a document on its line
+            while True:
+                ch = decoder.ll_chars[i]
+                if ch == '\n' or not is_whitespace(ch):
+                    break
+                i += 1
+            if i < len(s) and ch != '\n':
+                raise oefmt(space.w_ValueError,
+                            "Extra data: char %d", i)
+            i = decoder.skip_whitespace(i)
+    finally:
+        decoder.close()
+    return space.newlist(result_w)
+
@@ -1,6 +1,12 @@
+import math
+
 from rpython.rlib.rstring import StringBuilder
+from rpython.rlib.rfloat import isfinite
 from rpython.rlib import rutf8
 from pypy.interpreter import unicodehelper
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.objspace.std.floatobject import float_repr
 
 
 HEX = '0123456789abcdef'
@@ -16,35 +22,7 @@ ESCAPE_BEFORE_SPACE = [ESCAPE_DICT.get(chr(_i), '\\u%04x' % _i)
                        for _i in range(32)]
 
 
-def raw_encode_basestring_ascii(space, w_string):
-    if space.isinstance_w(w_string, space.w_bytes):
-        s = space.bytes_w(w_string)
-        for i in range(len(s)):
-            c = s[i]
-            if c >= ' ' and c <= '~' and c != '"' and c != '\\':
-                pass
-            else:
-                first = i
-                break
-        else:
-            # the input is a string with only non-special ascii chars
-            return w_string
-
-        unicodehelper.check_utf8_or_raise(space, s)
-        sb = StringBuilder(len(s))
-        sb.append_slice(s, 0, first)
-    else:
-        # We used to check if 'u' contains only safe characters, and return
-        # 'w_string' directly.  But this requires an extra pass over all
-        # characters, and the expected use case of this function, from
-        # json.encoder, will anyway re-encode a unicode result back to
-        # a string (with the ascii encoding).  This requires two passes
-        # over the characters.  So we may as well directly turn it into a
-        # string here --- only one pass.
-        s = space.utf8_w(w_string)
-        sb = StringBuilder(len(s))
-        first = 0
-
+def _escape_into(sb, s, first):
     it = rutf8.Utf8StringIterator(s)
     for i in range(first):
         it.next()
@@ -77,5 +55,344 @@ def raw_encode_basestring_ascii(space, w_string):
                 sb.append(HEX[(s2 >> 4) & 0x0f])
                 sb.append(HEX[s2 & 0x0f])
 
+
+def raw_encode_basestring_ascii(space, w_string):
+    if space.isinstance_w(w_string, space.w_bytes):
+        s = space.bytes_w(w_string)
+        for i in range(len(s)):
+            c = s[i]
+            if c >= ' ' and c <= '~' and c != '"' and c != '\\':
+                pass
+            else:
+                first = i
+                break
+        else:
+            # the input is a string with only non-special ascii chars
+            return w_string
+
+        unicodehelper.check_utf8_or_raise(space, s)
+        sb = StringBuilder(len(s))
+        sb.append_slice(s, 0, first)
+    else:
+        # We used to check if 'u' contains only safe characters, and return
+        # 'w_string' directly.  But this requires an extra pass over all
+        # characters, and the expected use case of this function, from
+        # json.encoder, will anyway re-encode a unicode result back to
+        # a string (with the ascii encoding).  This requires two passes
+        # over the characters.  So we may as well directly turn it into a
+        # string here --- only one pass.
+        s = space.utf8_w(w_string)
+        sb = StringBuilder(len(s))
+        first = 0
+
+    _escape_into(sb, s, first)
     res = sb.build()
     return space.newtext(res)
+
+
+def _append_string(space, sb, w_string):
+    if space.isinstance_w(w_string, space.w_bytes):
+        s = space.bytes_w(w_string)
+        unicodehelper.check_utf8_or_raise(space, s)
+    else:
+        s = space.utf8_w(w_string)
+    sb.append('"')
+    _escape_into(sb, s, 0)
+    sb.append('"')
+
+
+# flush the output to 'write' whenever the buffer grows beyond this
+FLUSH_SIZE = 65536
+
+
+class JSONEncoder(object):
+    """Walks a tree of exact dicts, lists, tuples, strings, numbers, bools
+    and None, producing ASCII-only JSON.  Everything else (including
+    subclasses of the builtin types) is handed to 'w_fallback', which
+    must return the encoded str for that object.
+
+    Dicts using the JsonDictStrategy or the MapDictStrategy share their
+    keys with all other dicts of the same map; the encoded '"key": '
+    fragments are computed once per map and call.
+    """
+
+    def __init__(self, space, w_fallback, check_circular, allow_nan,
+                 skipkeys, item_separator, key_separator, w_write):
+        self.space = space
+        self.w_fallback = w_fallback
+        self.check_circular = check_circular
+        self.allow_nan = allow_nan
+        self.skipkeys = skipkeys
+        self.item_separator = item_separator
+        self.key_separator = key_separator
+        self.w_write = w_write
+        self.sb = StringBuilder()
+        self.markers = {}
+        self.jsondict_keys = {}
+        self.mapdict_keys = {}
+
+    def maybe_flush(self):
+        if self.w_write is not None and self.sb.getlength() >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        s = self.sb.build()
+        self.sb = StringBuilder()
+        if s:
+            self.space.call_function(self.w_write, self.space.newbytes(s))
+
+    def mark(self, w_obj):
+        if self.check_circular:
+            if w_obj in self.markers:
+                raise oefmt(self.space.w_ValueError,
+                            "Circular reference detected")
+            self.markers[w_obj] = None
+
+    def unmark(self, w_obj):
+        if self.check_circular:
+            del self.markers[w_obj]
+
+    def floatstr(self, x):
+        if isfinite(x):
+            return float_repr(x)
+        if math.isnan(x):
+            text = 'NaN'
+        elif x > 0.0:
+            text = 'Infinity'
+        else:
+            text = '-Infinity'
+        if not self.allow_nan:
+            raise oefmt(self.space.w_ValueError,
+                        "Out of range float values are not JSON compliant: "
+                        "%s", float_repr(x))
+        return text
+
+    def encode(self, w_obj):
+        space = self.space
+        w_type = space.type(w_obj)
+        if space.is_w(w_type, space.w_bytes) or space.is_w(w_type,
+                                                            space.w_unicode):
+            _append_string(space, self.sb, w_obj)
+        elif space.is_w(w_obj, space.w_None):
+            self.sb.append('null')
+        elif space.is_w(w_obj, space.w_True):
+            self.sb.append('true')
+        elif space.is_w(w_obj, space.w_False):
+            self.sb.append('false')
+        elif space.is_w(w_type, space.w_int):
+            self.sb.append(str(space.int_w(w_obj)))
+        elif space.is_w(w_type, space.w_long):
+            self.sb.append(space.text_w(space.str(w_obj)))
+        elif space.is_w(w_type, space.w_float):
+            self.sb.append(self.floatstr(space.float_w(w_obj)))
+        elif space.is_w(w_type, space.w_list):
+            self.encode_list(w_obj)
+        elif space.is_w(w_type, space.w_tuple):
+            self.encode_tuple(w_obj)
+        elif space.is_w(w_type, space.w_dict):
+            self.encode_dict(w_obj)
+        else:
+            self.mark(w_obj)
+            w_res = space.call_function(self.w_fallback, w_obj)
+            self.sb.append(space.bytes_w(w_res))
+            self.unmark(w_obj)
+
+    def encode_list(self, w_list):
+        from pypy.objspace.std.listobject import W_ListObject
+        assert isinstance(w_list, W_ListObject)
+        length = w_list.length()
+        if length == 0:
+            self.sb.append('[]')
+            return
+        # ints and floats cannot call back into app-level code, so the
+        # unboxed storage cannot change under our feet
+        intlist = w_list.getitems_int()
+        if intlist is not None:
+            self.sb.append('[')
+            for i in range(len(intlist)):
+                if i > 0:
+                    self.sb.append(self.item_separator)
+                self.sb.append(str(intlist[i]))
+            self.sb.append(']')
+            self.maybe_flush()
+            return
+        floatlist = w_list.getitems_float()
+        if floatlist is not None:
+            self.sb.append('[')
+            for i in range(len(floatlist)):
+                if i > 0:
+                    self.sb.append(self.item_separator)
+                self.sb.append(self.floatstr(floatlist[i]))
+            self.sb.append(']')
+            self.maybe_flush()
+            return
+        self.mark(w_list)
+        self.sb.append('[')
+        i = 0
+        while i < w_list.length():
+            if i > 0:
+                self.sb.append(self.item_separator)
+            self.encode(w_list.getitem(i))
+            self.maybe_flush()
+            i += 1
+        self.sb.append(']')
+        self.unmark(w_list)
+
+    def encode_tuple(self, w_tuple):
+        items_w = self.space.fixedview(w_tuple)
+        if len(items_w) == 0:
+            self.sb.append('[]')
+            return
+        self.mark(w_tuple)
+        self.sb.append('[')
+        for i in range(len(items_w)):
+            if i > 0:
+                self.sb.append(self.item_separator)
+            self.encode(items_w[i])
+            self.maybe_flush()
+        self.sb.append(']')
+        self.unmark(w_tuple)
+
+    def encode_dict(self, w_dict):
+        from pypy.objspace.std.dictmultiobject import W_DictObject
+        from pypy.objspace.std.jsondict import JsonDictStrategy
+        from pypy.objspace.std.mapdict import MapDictStrategy
+        assert isinstance(w_dict, W_DictObject)
+        if w_dict.length() == 0:
+            self.sb.append('{}')
+            return
+        self.mark(w_dict)
+        self.sb.append('{')
+        strategy = w_dict.get_strategy()
+        if isinstance(strategy, JsonDictStrategy):
+            self.encode_jsondict_items(w_dict, strategy)
+        elif isinstance(strategy, MapDictStrategy):
+            self.encode_mapdict_items(w_dict, strategy)
+        else:
+            self.encode_dict_items(w_dict)
+        self.sb.append('}')
+        self.unmark(w_dict)
+
+    def _encode_key_fragment(self, w_key):
+        sb = StringBuilder()
+        _append_string(self.space, sb, w_key)
+        sb.append(self.key_separator)
+        return sb.build()
+
+    def _dict_changed(self):
+        return oefmt(self.space.w_RuntimeError,
+                     "dictionary changed size during iteration")
+
+    def encode_jsondict_items(self, w_dict, strategy):
+        fragments = self.jsondict_keys.get(strategy, None)
+        if fragments is None:
+            keys_w = strategy.jsonmap.get_keys_in_order()
+            fragments = [self._encode_key_fragment(w_key) for w_key in keys_w]
+            self.jsondict_keys[strategy] = fragments
+        values_w = strategy.unerase(w_dict.dstorage)
+        for i in range(len(fragments)):
+            if w_dict.get_strategy() is not strategy:
+                raise self._dict_changed()
+            if i > 0:
+                self.sb.append(self.item_separator)
+            self.sb.append(fragments[i])
+            self.encode(values_w[i])
+            self.maybe_flush()
+
+    def encode_mapdict_items(self, w_dict, strategy):
+        from pypy.objspace.std.mapdict import DICT
+        w_obj = strategy.unerase(w_dict.dstorage)
+        map = w_obj._get_mapdict_map()
+        entry = self.mapdict_keys.get(map, None)
+        if entry is None:
+            # same order as MapDictIteratorItems
+            names = []
+            curr_map = map.search(DICT)
+            while curr_map is not None:
+                names.append(curr_map.name)
+                curr_map = curr_map.back.search(DICT)
+            names.reverse()
+            fragments = [self._encode_key_fragment(self.space.newtext(name))
+                         for name in names]
+            entry = self.mapdict_keys[map] = MapDictKeys(names, fragments)
+        for i in range(len(entry.names)):
+            if (w_dict.get_strategy() is not strategy or
+                    w_obj._get_mapdict_map() is not map):
+                raise self._dict_changed()
+            if i > 0:
+                self.sb.append(self.item_separator)
+            self.sb.append(entry.fragments[i])
+            self.encode(w_obj.getdictvalue(self.space, entry.names[i]))
+            self.maybe_flush()
+
+    def encode_dict_items(self, w_dict):
+        space = self.space
+        first = True
+        iterator = w_dict.iteritems()
+        while True:
+            w_key, w_value = iterator.next_item()
+            if w_key is None:
+                break
+            if space.isinstance_w(w_key, space.w_basestring):
+                key = None
+            elif space.isinstance_w(w_key, space.w_float):
+                key = self.floatstr(space.float_w(w_key))
+            elif space.is_w(w_key, space.w_True):
+                key = 'true'
+            elif space.is_w(w_key, space.w_False):
+                key = 'false'
+            elif space.is_w(w_key, space.w_None):
+                key = 'null'
+            elif (space.isinstance_w(w_key, space.w_int) or
+                      space.isinstance_w(w_key, space.w_long)):
+                key = space.text_w(space.str(w_key))
+            elif self.skipkeys:
+                continue
+            else:
+                raise oefmt(space.w_TypeError, "key %R is not a string",
+                            w_key)
+            if first:
+                first = False
+            else:
+                self.sb.append(self.item_separator)
+            if key is None:
+                _append_string(space, self.sb, w_key)
+            else:
+                self.sb.append('"')
+                self.sb.append(key)
+                self.sb.append('"')
+            self.sb.append(self.key_separator)
+            self.encode(w_value)
+            self.maybe_flush()
+
+
+class MapDictKeys(object):
+    def __init__(self, names, fragments):
+        self.names = names
+        self.fragments = fragments
+
+
+@unwrap_spec(check_circular=bool, allow_nan=bool, skipkeys=bool,
+             item_separator='text', key_separator='text')
+def encode(space, w_obj, w_fallback, check_circular=True, allow_nan=True,
+           skipkeys=False, item_separator=', ', key_separator=': ',
+           w_write=None):
+    """encode(obj, fallback, check_circular=True, allow_nan=True,
+              skipkeys=False, item_separator=', ', key_separator=': ',
+              write=None)
+
+    Encode 'obj' as ASCII-only JSON.  'fallback' is called for objects
+    that are not exact dicts, lists, tuples, strings, numbers, bools or
+    None, and must return their encoding as a str.  If 'write' is given,
+    the output is passed to it in chunks and None is returned;
+    otherwise the whole document is returned as a str.
+    """
+    if space.is_none(w_write):
+        w_write = None
+    encoder = JSONEncoder(space, w_fallback, check_circular, allow_nan,
+                          skipkeys, item_separator, key_separator, w_write)
+    encoder.encode(w_obj)
+    if w_write is not None:
+        encoder.flush()
+        return space.w_None
+    return space.newbytes(encoder.sb.build())
@@ -0,0 +1,243 @@
+from rpython.rlib import jit
+from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.error import OperationError, oefmt
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import TypeDef
+from pypy.module._pypyjson.interp_decoder import JSONDecoder, is_whitespace
+
+# states of the top-level array, when decoding its items one by one
+ARRAY_START = 0     # expecting '['
+ARRAY_FIRST = 1     # expecting the first item or ']'
+ARRAY_COMMA = 2     # expecting ',' or ']'
+ARRAY_ITEM = 3      # expecting an item
+ARRAY_DONE = 4      # after the closing ']'
+
+
+class W_IncrementalDecoder(W_Root):
+    """ Decodes a stream of JSON data that is fed to it in chunks.
+
+    The chunks are not decoded as they arrive.  They are only scanned to
+    find where each complete value ends, which needs very little state
+    (nesting depth and whether we are inside a string).  As soon as some
+    values are complete, they are decoded together by a regular
+    JSONDecoder, and only the data of the value that is still incomplete
+    is kept around.  In 'items' mode, the stream is a single JSON array
+    and its items are the values produced, so an arbitrarily long array
+    can be decoded with memory proportional to the size of its items.
+    """
+
+    def __init__(self, space, items):
+        self.space = space
+        self.items = items
+        self.array_state = ARRAY_START
+        self.eof = False
+        # unconsumed data: the chunks, and the stream offset of the first one
+        self.pending = []
+        self.base = 0
+        # the scanner state.  All positions are offsets in the whole stream
+        self.scanpos = 0
+        self.start = -1     # start of the current value, or -1
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.in_scalar = False
+        # [start0, end0, start1, end1, ...] of the complete values that are
+        # not decoded yet
+        self.bounds = []
+        # decoded values that were not returned yet
+        self.values_w = []
+        self.values_index = 0
+
+    def _value_found(self, start, end):
+        self.bounds.append(start)
+        self.bounds.append(end)
+        self.start = -1
+        if self.items:
+            self.array_state = ARRAY_COMMA
+
+    def _raise(self, msg, pos):
+        raise oefmt(self.space.w_ValueError, "%s: char %d", msg, pos)
+
+    @jit.dont_look_inside
+    def _scan(self, s, offset):
+        i = self.scanpos - offset
+        length = len(s)
+        while i < length:
+            ch = s[i]
+            if self.start < 0:
+                if is_whitespace(ch):
+                    i += 1
+                    continue
+                if self.items:
+                    state = self.array_state
+                    if state == ARRAY_START:
+                        if ch != '[':
+                            self._raise("Expecting '['", offset + i)
+                        self.array_state = ARRAY_FIRST
+                        i += 1
+                        continue
+                    elif state == ARRAY_FIRST or state == ARRAY_COMMA:
+                        if ch == ']':
+                            self.array_state = ARRAY_DONE
+                            i += 1
+                            continue
+                        if state == ARRAY_COMMA:
+                            if ch != ',':
+                                self._raise("Unexpected '%s' when decoding "
+                                            "array" % (ch,), offset + i)
+                            self.array_state = ARRAY_ITEM
+                            i += 1
+                            continue
+                    elif state == ARRAY_DONE:
+                        self._raise("Extra data", offset + i)
+                self.start = offset + i
+                if ch == '{' or ch == '[':
+                    self.depth = 1
+                elif ch == '"':
+                    self.in_string = True
+                elif ch == ',' or ch == ']' or ch == '}':
+                    # not a valid value, let the decoder complain about it
+                    self._value_found(offset + i, offset + i + 1)
+                else:
+                    self.in_scalar = True
+                i += 1
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 0:
+                        self._value_found(self.start, offset + i + 1)
+                i += 1
+            elif self.in_scalar:
+                if (is_whitespace(ch) or ch == ',' or ch == ']' or
+                        ch == '}' or ch == '[' or ch == '{' or ch == '"'):
+                    self.in_scalar = False
+                    self._value_found(self.start, offset + i)
+                else:
+                    i += 1
+            else:
+                if ch == '"':
+                    self.in_string = True
+                elif ch == '{' or ch == '[':
+                    self.depth += 1
+                elif ch == '}' or ch == ']':
+                    self.depth -= 1
+                    if self.depth == 0:
+                        self._value_found(self.start, offset + i + 1)
+                i += 1
+        self.scanpos = offset + i
+
+    @jit.dont_look_inside
+    def _decode_complete_values(self):
+        bounds = self.bounds
+        if not bounds:
+            return
+        space = self.space
+        if len(self.pending) == 1:
+            data = self.pending[0]
+        else:
+            data = ''.join(self.pending)
+        base = self.base
+        first = bounds[0] - base
+        last = bounds[-1] - base
+        assert first >= 0
+        assert last >= first
+        decoder = JSONDecoder(space, data[first:last])
+        try:
+            for k in range(0, len(bounds), 2):
+                end = bounds[k + 1] - base - first
+                w_value = decoder.decode_any(bounds[k] - base - first)
+                if decoder.pos != end:
+                    self._raise("Extra data", decoder.pos + first + base)
+                self.values_w.append(w_value)
+        finally:
+            decoder.close()
+        self.bounds = []
+        # drop everything up to the value that is still incomplete
+        if self.start >= 0:
+            cut = self.start
+        else:
+            cut = self.scanpos
+        cut -= base
+        assert cut >= 0
+        self.pending = [data[cut:]]
+        self.base = base + cut
+
+    @jit.dont_look_inside
+    def descr_feed(self, space, w_data):
+        """ Feed a chunk of utf8-encoded data to the decoder.  The values
+        that are complete can then be retrieved by iterating over the
+        decoder. """
+        if space.isinstance_w(w_data, space.w_unicode):
+            raise oefmt(space.w_TypeError,
+                        "Expected utf8-encoded str, got unicode")
+        if self.eof:
+            raise oefmt(space.w_ValueError, "feed() after close()")
+        data = space.bytes_w(w_data)
+        if not data:
+            return
+        offset = self.scanpos
+        self.pending.append(data)
+        self._scan(data, offset)
+        self._decode_complete_values()
+
+    @jit.dont_look_inside
+    def descr_close(self, space):
+        """ Signal the end of the stream.  A number at the very end of the
+        stream is only known to be complete at this point.  Raises
+        ValueError if the stream ends in the middle of a value. """
+        if self.eof:
+            return
+        self.eof = True
+        if self.in_scalar:
+            self.in_scalar = False
+            self._value_found(self.start, self.scanpos)
+        self._decode_complete_values()
+        if self.start >= 0:
+            self._raise("Unterminated value starting at", self.start)
+        if self.items and self.array_state != ARRAY_DONE:
+            self._raise("Unterminated array", self.scanpos)
+
+    def descr_iter(self, space):
+        return self
+
+    def descr_next(self, space):
+        """ Return the next decoded value.  Raises StopIteration if no
+        complete value is available; iterating again after feeding more
+        data may produce more values. """
+        index = self.values_index
+        if index == len(self.values_w):
+            if index > 0:
+                self.values_w = []
+                self.values_index = 0
+            raise OperationError(space.w_StopIteration, space.w_None)
+        w_value = self.values_w[index]
+        self.values_w[index] = None
+        self.values_index = index + 1
+        return w_value
+
+
+@unwrap_spec(items=bool)
+def descr_new_incremental_decoder(space, w_subtype, items=False):
+    return W_IncrementalDecoder(space, items)
+
+
+W_IncrementalDecoder.typedef = TypeDef("_pypyjson.IncrementalDecoder",
+    __doc__ = """IncrementalDecoder(items=False)
+
+    Decode JSON data that arrives in chunks.  Call feed() with each chunk
+    and iterate over the decoder to get the values that are complete so
+    far, then call close() at the end of the stream.  The stream can
+    contain any number of JSON values separated by whitespace.  With
+    items=True it must instead be a single JSON array, whose items are
+    produced one by one as they become complete.""",
+    __new__ = interp2app(descr_new_incremental_decoder),
+    feed = interp2app(W_IncrementalDecoder.descr_feed),
+    close = interp2app(W_IncrementalDecoder.descr_close),
+    __iter__ = interp2app(W_IncrementalDecoder.descr_iter),
+    next = interp2app(W_IncrementalDecoder.descr_next),
+)
+W_IncrementalDecoder.typedef.acceptable_as_base_class = False
@@ -533,6 +533,37 @@ class AppTest(object):
             exc = raises(ValueError, _pypyjson.loads, inputtext)
             assert str(exc.value) == errmsg
 
+    def test_loads_lines(self):
+        import _pypyjson
+        res = _pypyjson.loads_lines('{"a": 1, "b": [1.5, null]}\n'
+                                    '  {"a": 2, "b": []}  \r\n'
+                                    '\n'
+                                    '"x"\n'
+                                    '42')
+        assert res == [{u"a": 1, u"b": [1.5, None]}, {u"a": 2, u"b": []},
+                       u"x", 42]
+        assert _pypyjson.loads_lines('') == []
+        assert _pypyjson.loads_lines('\n \n') == []
+        assert _pypyjson.loads_lines('[1,\n2]\n') == [[1, 2]]
+        raises(TypeError, _pypyjson.loads_lines, u"42")
+
+    def test_loads_lines_shares_keys(self):
+        import _pypyjson
+        import __pypy__
+        lines = '\n'.join(['{"name": "x%s", "value": %s}' % (i, i)
+                           for i in range(100)])
+        res = _pypyjson.loads_lines(lines)
+        assert len(res) == 100
+        assert res[42] == {u"name": u"x42", u"value": 42}
+        assert __pypy__.strategy(res[99]) == "JsonDictStrategy"
+
+    def test_loads_lines_errors(self):
+        import _pypyjson
+        exc = raises(ValueError, _pypyjson.loads_lines, '1\n2 3\n')
+        assert str(exc.value) == "Extra data: char 4"
+        exc = raises(ValueError, _pypyjson.loads_lines, '[1]\n[2,')
+        assert str(exc.value).endswith("at char 7")
+
     def test_repeated_key(self):
         import _pypyjson
         a = '{"abc": "4", "k": 1, "k": 2}'
@@ -541,3 +572,141 @@ class AppTest(object):
         a = '{"abc": "4", "k": 1, "k": 1.5, "c": null, "k": 2}'
         d = _pypyjson.loads(a)
         assert d == {u"abc": u"4", u"c": None, u"k": 2}
+
+    def test_encode(self):
+        import _pypyjson
+        def fallback(o):
+            return '"fallback %s"' % (o.__class__.__name__,)
+        e = lambda o, **kw: _pypyjson.encode(o, fallback, **kw)
+        assert e(None) == 'null'
+        assert e([True, False, 1, -2L, 1.5, 1e100]) == (
+            '[true, false, 1, -2, 1.5, 1e+100]')
+        assert e((1, u"\u1234\n", "a\"b\\")) == (
+            '[1, "\\u1234\\n", "a\\"b\\\\"]')
+        assert e([]) == e(()) == '[]'
+        assert e({}) == '{}'
+        assert e({"a": [1.5, 2.5]}) == '{"a": [1.5, 2.5]}'
+        assert e({1.5: 1, None: 2}, key_separator=':') in (
+            '{"1.5":1, "null":2}', '{"null":2, "1.5":1}')
+        assert e([object(), 1], item_separator=',') == (
+            '["fallback object",1]')
+        class MyInt(int):
+            pass
+        assert e([MyInt(5)]) == '["fallback MyInt"]'
+        assert e([float('nan'), float('-inf')]) == '[NaN, -Infinity]'
+        exc = raises(ValueError, e, [float('inf')], allow_nan=False)
+        assert str(exc.value) == (
+            "Out of range float values are not JSON compliant: inf")
+        raises(TypeError, e, {(1, 2): 3})
+        assert e({(1, 2): 3, "a": 4}, skipkeys=True) == '{"a": 4}'
+        raises(UnicodeDecodeError, e, '\xff')
+
+    def test_encode_circular(self):
+        import _pypyjson
+        l = [1, 2]
+        l.append(l)
+        exc = raises(ValueError, _pypyjson.encode, l, None)
+        assert str(exc.value) == "Circular reference detected"
+        d = {}
+        d['d'] = [d]
+        raises(ValueError, _pypyjson.encode, d, None)
+        x = [1]
+        assert _pypyjson.encode([x, x], None) == '[[1], [1]]'
+        assert _pypyjson.encode([x, x], None, check_circular=False) == (
+            '[[1], [1]]')
+
+    def test_encode_map_dicts(self):
+        import _pypyjson
+        import __pypy__
+        res = _pypyjson.loads('[{"a": 1, "b\\u1234": [2]}, '
+                              '{"a": 3, "b\\u1234": null}]')
+        assert __pypy__.strategy(res[0]) == "JsonDictStrategy"
+        assert _pypyjson.encode(res, None) == (
+            '[{"a": 1, "b\\u1234": [2]}, {"a": 3, "b\\u1234": null}]')
+        class A(object):
+            def __init__(self, x):
+                self.x = x
+                self.y = "y"
+        objs = [A(1).__dict__, A(2).__dict__]
+        assert __pypy__.strategy(objs[0]) == "MapDictStrategy"
+        assert _pypyjson.encode(objs, None) == (
+            '[{"x": 1, "y": "y"}, {"x": 2, "y": "y"}]')
+
+    def test_encode_write(self):
+        import _pypyjson
+        chunks = []
+        data = [u"x" * 1000] * 200
+        res = _pypyjson.encode(data, None, write=chunks.append)
+        assert res is None
+        assert len(chunks) > 1
+        assert ''.join(chunks) == _pypyjson.encode(data, None)
+        chunks = []
+        _pypyjson.encode({}, None, write=chunks.append)
+        assert chunks == ['{}']
+
+    def test_incremental_decoder(self):
+        import _pypyjson
+        dec = _pypyjson.IncrementalDecoder()
+        assert list(dec) == []
+        dec.feed('{"a": [1, "x}\\\\"], "b')
+        assert list(dec) == []
+        dec.feed('": null}  "str\\"')
+        assert list(dec) == [{u"a": [1, u"x}\\"], u"b": None}]
+        dec.feed('ing" 12')
+        assert list(dec) == [u'str"ing']
+        dec.feed('3 tru')
+        assert list(dec) == [123]
+        dec.feed('e -1.5')
+        assert list(dec) == [True]
+        dec.close()
+        assert list(dec) == [-1.5]
+        raises(ValueError, dec.feed, '1')
+
+    def test_incremental_decoder_one_byte_at_a_time(self):
+        import _pypyjson
+        s = '[{"a": 1, "b": [true, null]}, "x", -2.5e3, [], {}]  7 '
+        dec = _pypyjson.IncrementalDecoder()
+        res = []
+        for c in s:
+            dec.feed(c)
+            res.extend(dec)
+        dec.close()
+        res.extend(dec)
+        assert res == [_pypyjson.loads(s[:-4]), 7]
+
+    def test_incremental_decoder_items(self):
+        import _pypyjson
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        dec.feed(' [ {"a": 1}, 2')
+        assert list(dec) == [{u"a": 1}]
+        dec.feed(', "three" , [4]')
+        assert list(dec) == [2, u"three", [4]]
+        dec.feed(' ] \n')
+        dec.close()
+        assert list(dec) == []
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        dec.feed('[]')
+        dec.close()
+        assert list(dec) == []
+
+    def test_incremental_decoder_errors(self):
+        import _pypyjson
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        raises(ValueError, dec.feed, '{')
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        raises(ValueError, dec.feed, '[1 2]')
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        raises(ValueError, dec.feed, '[1, ]')
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        dec.feed('[1]')
+        raises(ValueError, dec.feed, ' 2')
+        dec = _pypyjson.IncrementalDecoder(items=True)
+        dec.feed('[1, 2')
+        raises(ValueError, dec.close)
+        dec = _pypyjson.IncrementalDecoder()
+        dec.feed('{"a": ')
+        exc = raises(ValueError, dec.close)
+        assert str(exc.value) == "Unterminated value starting at: char 0"
+        dec = _pypyjson.IncrementalDecoder()
+        raises(ValueError, dec.feed, '12ab ')
+        raises(TypeError, dec.feed, u'1')
@@ -0,0 +1,223 @@
+"""
+The per-row and per-parameter work of lib_pypy/_sqlite3.py: stepping a
+statement, converting the columns of the current row and building the row
+tuple, and binding the parameters of the builtin types.  Connections,
+transactions, callbacks and the statement cache stay at app-level, on top
+of _sqlite3_cffi; the statements are passed here as its cdata pointers.
+"""
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter import unicodehelper
+from pypy.module._cffi_backend.cdataobj import W_CData
+from pypy.module._cffi_backend.ctypeptr import W_CTypePtrOrArray
+from rpython.rlib.rarithmetic import intmask
+from rpython.rtyper.lltypesystem import rffi, lltype
+from rpython.rtyper.tool import rffi_platform
+from rpython.translator.tool.cbuild import ExternalCompilationInfo
+from rpython.translator.platform import platform
+
+
+eci = ExternalCompilationInfo(
+    libraries=['sqlite3'],
+    library_dirs=platform.preprocess_library_dirs([]),
+    includes=['sqlite3.h'],
+    include_dirs=platform.preprocess_include_dirs([]),
+    # SQLITE_TRANSIENT is a cast of -1 to a function pointer
+    post_include_bits=[
+        "RPY_EXTERN\n"
+        "int pypy_sqlite3_bind_text(sqlite3_stmt *, int, const char *, int);\n"
+        "RPY_EXTERN\n"
+        "int pypy_sqlite3_bind_blob(sqlite3_stmt *, int, const char *, int);\n"
+        ],
+    separate_module_sources=['''
+        int pypy_sqlite3_bind_text(sqlite3_stmt *stmt, int i,
+                                   const char *s, int n) {
+            return sqlite3_bind_text(stmt, i, s, n, SQLITE_TRANSIENT);
+        }
+        int pypy_sqlite3_bind_blob(sqlite3_stmt *stmt, int i,
+                                   const char *s, int n) {
+            return sqlite3_bind_blob(stmt, i, s, n, SQLITE_TRANSIENT);
+        }
+        '''],
+    )
+eci = rffi_platform.configure_external_library(
+    'sqlite3', eci,
+    [dict(prefix='sqlite-'),
+     ])
+
+class CConfigure:
+    _compilation_info_ = eci
+
+for name in ['SQLITE_OK', 'SQLITE_ROW', 'SQLITE_DONE', 'SQLITE_INTEGER',
+             'SQLITE_FLOAT', 'SQLITE_TEXT', 'SQLITE_BLOB', 'SQLITE_NULL']:
+    setattr(CConfigure, name, rffi_platform.ConstantInteger(name))
+
+globals().update(rffi_platform.configure(CConfigure))
+
+sqlite3_stmt = rffi.COpaquePtr('sqlite3_stmt')
+
+def external(name, args, result, **kwds):
+    return rffi.llexternal(name, args, result, compilation_info=eci, **kwds)
+
+# sqlite3_step() may wait for a lock: release the GIL, like cffi does.
+# The other calls only read the current row.
+sqlite3_step = external('sqlite3_step', [sqlite3_stmt], rffi.INT)
+sqlite3_libversion_number = external('sqlite3_libversion_number', [],
+                                     rffi.INT, releasegil=False)
+sqlite3_data_count = external('sqlite3_data_count', [sqlite3_stmt], rffi.INT,
+                              releasegil=False)
+sqlite3_column_type = external('sqlite3_column_type',
+                               [sqlite3_stmt, rffi.INT], rffi.INT,
+                               releasegil=False)
+sqlite3_column_int64 = external('sqlite3_column_int64',
+                                [sqlite3_stmt, rffi.INT], rffi.LONGLONG,
+                                releasegil=False)
+sqlite3_column_double = external('sqlite3_column_double',
+                                 [sqlite3_stmt, rffi.INT], rffi.DOUBLE,
+                                 releasegil=False)
+sqlite3_column_text = external('sqlite3_column_text',
+                               [sqlite3_stmt, rffi.INT], rffi.CCHARP,
+                               releasegil=False)
+sqlite3_column_blob = external('sqlite3_column_blob',
+                               [sqlite3_stmt, rffi.INT], rffi.CCHARP,
+                               releasegil=False)
+sqlite3_column_bytes = external('sqlite3_column_bytes',
+                                [sqlite3_stmt, rffi.INT], rffi.INT,
+                                releasegil=False)
+sqlite3_bind_null = external('sqlite3_bind_null', [sqlite3_stmt, rffi.INT],
+                             rffi.INT, releasegil=False)
+sqlite3_bind_int64 = external('sqlite3_bind_int64',
+                              [sqlite3_stmt, rffi.INT, rffi.LONGLONG],
+                              rffi.INT, releasegil=False)
+sqlite3_bind_double = external('sqlite3_bind_double',
+                               [sqlite3_stmt, rffi.INT, rffi.DOUBLE],
+                               rffi.INT, releasegil=False)
+sqlite3_bind_text = external('pypy_sqlite3_bind_text',
+                             [sqlite3_stmt, rffi.INT, rffi.CCHARP, rffi.INT],
+                             rffi.INT, releasegil=False)
+sqlite3_bind_blob = external('pypy_sqlite3_bind_blob',
+                             [sqlite3_stmt, rffi.INT, rffi.CCHARP, rffi.INT],
+                             rffi.INT, releasegil=False)
+
+
+def stmt_w(space, w_stmt):
+    w_cdata = space.interp_w(W_CData, w_stmt)
+    if not isinstance(w_cdata.ctype, W_CTypePtrOrArray):
+        raise oefmt(space.w_TypeError,
+                    "expected a 'sqlite3_stmt *', got '%s'",
+                    w_cdata.ctype.name)
+    return rffi.cast(sqlite3_stmt, w_cdata.unsafe_escaping_ptr())
+
+def get_bytes(stmt, i, ptr):
+    # must be called after sqlite3_column_text() or sqlite3_column_blob()
+    if not ptr:
+        return ''     # a zero-length blob
+    length = intmask(sqlite3_column_bytes(stmt, i))
+    return rffi.charpsize2str(ptr, length)
+
+def fetch_column(space, stmt, i, w_text_factory):
+    typ = intmask(sqlite3_column_type(stmt, i))
+    if typ == SQLITE_INTEGER:
+        value = sqlite3_column_int64(stmt, i)
+        return space.newint(value)
+    elif typ == SQLITE_FLOAT:
+        return space.newfloat(sqlite3_column_double(stmt, i))
+    elif typ == SQLITE_TEXT:
+        s = get_bytes(stmt, i, sqlite3_column_text(stmt, i))
+        if space.is_none(w_text_factory):
+            length = unicodehelper.check_utf8_or_raise(space, s)
+            return space.newutf8(s, length)
+        return space.call_function(w_text_factory, space.newbytes(s))
+    elif typ == SQLITE_BLOB:
+        s = get_bytes(stmt, i, sqlite3_column_blob(stmt, i))
+        return space.call_function(space.w_buffer, space.newbytes(s))
+    return space.w_None
+
+def fetch_converted_column(space, stmt, i, w_converter):
+    ptr = sqlite3_column_blob(stmt, i)
+    if not ptr:
+        return space.w_None
+    return space.call_function(w_converter,
+                               space.newbytes(get_bytes(stmt, i, ptr)))
+
+def _fetch_row(space, stmt, w_text_factory, w_cast_map):
+    num_cols = intmask(sqlite3_data_count(stmt))
+    if space.is_none(w_cast_map):
+        converters_w = None
+    else:
+        converters_w = space.listview(w_cast_map)
+        if len(converters_w) < num_cols:
+            raise oefmt(space.w_ValueError, "cast map too short")
+    items_w = [None] * num_cols
+    for i in range(num_cols):
+        if converters_w is not None and not space.is_none(converters_w[i]):
+            w_value = fetch_converted_column(space, stmt, i, converters_w[i])
+        else:
+            w_value = fetch_column(space, stmt, i, w_text_factory)
+        items_w[i] = w_value
+    return space.newtuple(items_w)
+
+
+def sqlite_version_number(space):
+    """ Return sqlite3_libversion_number() of the libsqlite3 this module is
+    linked to. """
+    return space.newint(intmask(sqlite3_libversion_number()))
+
+def fetch_row(space, w_stmt, w_text_factory, w_cast_map):
+    """ fetch_row(stmt, text_factory, cast_map) -> tuple
+
+    Return the current row of 'stmt'.  TEXT columns are passed to
+    text_factory, or decoded from UTF-8 if it is None.  If cast_map is not
+    None, it lists a converter or None for each column, and the converters
+    are called with the raw bytes of the column instead.
+    """
+    return _fetch_row(space, stmt_w(space, w_stmt), w_text_factory,
+                      w_cast_map)
+
+def step_row(space, w_stmt, w_text_factory, w_cast_map):
+    """ step_row(stmt, text_factory, cast_map) -> tuple or int
+
+    Call sqlite3_step() on 'stmt'.  If it returns SQLITE_ROW, return the
+    new row as fetch_row() does; otherwise return the result code.
+    """
+    stmt = stmt_w(space, w_stmt)
+    rc = intmask(sqlite3_step(stmt))
+    if rc != SQLITE_ROW:
+        return space.newint(rc)
+    return _fetch_row(space, stmt, w_text_factory, w_cast_map)
+
+@unwrap_spec(idx=int)
+def bind_param(space, w_stmt, idx, w_param):
+    """ bind_param(stmt, idx, param) -> int
+
+    Bind None, an integer, a float, a unicode string (as UTF-8), a str or a
+    buffer to the parameter 'idx' of 'stmt', and return the result code of
+    sqlite3_bind_*(), or -1 for the other types.
+    """
+    stmt = stmt_w(space, w_stmt)
+    if space.is_w(w_param, space.w_None):
+        rc = sqlite3_bind_null(stmt, idx)
+    elif space.isinstance_w(w_param, space.w_int):
+        value = rffi.cast(rffi.LONGLONG, space.int_w(w_param))
+        rc = sqlite3_bind_int64(stmt, idx, value)
+    elif space.isinstance_w(w_param, space.w_long):
+        value = space.r_longlong_w(w_param)
+        rc = sqlite3_bind_int64(stmt, idx, value)
+    elif space.isinstance_w(w_param, space.w_float):
+        rc = sqlite3_bind_double(stmt, idx, space.float_w(w_param))
+    elif space.isinstance_w(w_param, space.w_unicode):
+        s = space.utf8_w(w_param)
+        with rffi.scoped_nonmovingbuffer(s) as buf:
+            rc = sqlite3_bind_text(stmt, idx, buf, len(s))
+    elif space.isinstance_w(w_param, space.w_bytes):
+        s = space.bytes_w(w_param)
+        with rffi.scoped_nonmovingbuffer(s) as buf:
+            rc = sqlite3_bind_text(stmt, idx, buf, len(s))
+    elif space.isinstance_w(w_param, space.w_buffer):
+        s = space.buffer_w(w_param, space.BUF_SIMPLE).as_str()
+        with rffi.scoped_nonmovingbuffer(s) as buf:
+            rc = sqlite3_bind_blob(stmt, idx, buf, len(s))
+    else:
+        return space.newint(-1)
+    return space.newint(intmask(rc))
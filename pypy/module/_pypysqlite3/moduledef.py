@@ -0,0 +1,15 @@
+from pypy.interpreter.mixedmodule import MixedModule
+
+class Module(MixedModule):
+    """Row fetching and parameter binding for the _sqlite3 module.
+    The statements are the 'sqlite3_stmt *' cdata objects of _sqlite3_cffi,
+    which must be linked to the same libsqlite3."""
+
+    appleveldefs = {}
+
+    interpleveldefs = {
+        'sqlite_version_number': 'interp_sqlite3.sqlite_version_number',
+        'fetch_row': 'interp_sqlite3.fetch_row',
+        'step_row': 'interp_sqlite3.step_row',
+        'bind_param': 'interp_sqlite3.bind_param',
+        }
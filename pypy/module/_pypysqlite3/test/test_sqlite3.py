@@ -0,0 +1,117 @@
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.module._pypysqlite3.interp_sqlite3 import eci, sqlite3_stmt
+from rpython.rtyper.lltypesystem import lltype, rffi
+
+sqlite3 = rffi.COpaquePtr('sqlite3')
+sqlite3_open = rffi.llexternal('sqlite3_open',
+                               [rffi.CCHARP, rffi.CArrayPtr(sqlite3)],
+                               rffi.INT, compilation_info=eci)
+sqlite3_exec = rffi.llexternal('sqlite3_exec',
+                               [sqlite3, rffi.CCHARP, rffi.VOIDP, rffi.VOIDP,
+                                rffi.VOIDP], rffi.INT, compilation_info=eci)
+sqlite3_prepare_v2 = rffi.llexternal('sqlite3_prepare_v2',
+                                     [sqlite3, rffi.CCHARP, rffi.INT,
+                                      rffi.CArrayPtr(sqlite3_stmt),
+                                      rffi.VOIDP], rffi.INT,
+                                     compilation_info=eci)
+sqlite3_finalize = rffi.llexternal('sqlite3_finalize', [sqlite3_stmt],
+                                   rffi.INT, compilation_info=eci)
+sqlite3_close = rffi.llexternal('sqlite3_close', [sqlite3], rffi.INT,
+                                compilation_info=eci)
+
+
+class AppTestSqlite3:
+    spaceconfig = dict(usemodules=['_pypysqlite3', '_cffi_backend'])
+
+    def setup_class(cls):
+        space = cls.space
+        with lltype.scoped_alloc(rffi.CArray(sqlite3), 1) as p_db:
+            with rffi.scoped_str2charp(":memory:") as name:
+                assert sqlite3_open(name, p_db) == 0
+            db = p_db[0]
+        cls.db = db
+        cls.stmts = []
+
+        def execute(sql):
+            with rffi.scoped_str2charp(sql) as c_sql:
+                assert sqlite3_exec(db, c_sql, rffi.cast(rffi.VOIDP, 0),
+                                    rffi.cast(rffi.VOIDP, 0),
+                                    rffi.cast(rffi.VOIDP, 0)) == 0
+
+        @unwrap_spec(sql='text')
+        def prepare(space, sql):
+            with lltype.scoped_alloc(rffi.CArray(sqlite3_stmt), 1) as p_stmt:
+                with rffi.scoped_str2charp(sql) as c_sql:
+                    rc = sqlite3_prepare_v2(db, c_sql, -1, p_stmt,
+                                            rffi.cast(rffi.VOIDP, 0))
+                    assert rc == 0
+                stmt = p_stmt[0]
+            cls.stmts.append(stmt)
+            address = rffi.cast(lltype.Signed, stmt)
+            return space.newint(address)
+
+        execute("create table t (i integer, f float, s text, b blob)")
+        execute("insert into t values (1, 2.5, 'abc', x'0001')")
+        execute("insert into t values (null, -1.0, 'd\xc3\xa9', null)")
+        execute("insert into t values (12345678901, 0.0, '', x'')")
+        cls.w_prepare = space.wrap(interp2app(prepare))
+
+    def teardown_class(cls):
+        for stmt in cls.stmts:
+            sqlite3_finalize(stmt)
+        sqlite3_close(cls.db)
+
+    def w_statement(self, sql):
+        import _cffi_backend
+        voidp = _cffi_backend.new_pointer_type(
+            _cffi_backend.new_void_type())
+        return _cffi_backend.cast(voidp, self.prepare(sql))
+
+    def test_version(self):
+        import _pypysqlite3
+        assert _pypysqlite3.sqlite_version_number() >= 3000000
+
+    def test_step_row(self):
+        import _pypysqlite3
+        stmt = self.statement("select * from t")
+        row = _pypysqlite3.step_row(stmt, None, None)
+        assert row == (1, 2.5, u'abc', buffer('\x00\x01'))
+        assert type(row[2]) is unicode
+        assert type(row[3]) is buffer
+        assert _pypysqlite3.fetch_row(stmt, None, None) == row
+        row = _pypysqlite3.step_row(stmt, str, None)
+        assert row == (None, -1.0, 'd\xc3\xa9', None)
+        assert type(row[2]) is str
+        row = _pypysqlite3.step_row(stmt, None, None)
+        assert row == (12345678901, 0.0, u'', buffer(''))
+        assert _pypysqlite3.step_row(stmt, None, None) == 101  # SQLITE_DONE
+
+    def test_cast_map(self):
+        import _pypysqlite3
+        stmt = self.statement("select i, s from t")
+        row = _pypysqlite3.step_row(stmt, None, [None, lambda s: s * 2])
+        assert row == (1, 'abcabc')
+        row = _pypysqlite3.step_row(stmt, None, [lambda s: s * 2, None])
+        assert row == (None, u'd\xe9')
+        raises(ZeroDivisionError, _pypysqlite3.fetch_row, stmt, None,
+               [None, lambda s: 1 / 0])
+
+    def test_bad_utf8(self):
+        import _pypysqlite3
+        stmt = self.statement("select cast(x'ff' as text)")
+        raises(UnicodeDecodeError, _pypysqlite3.step_row, stmt, None, None)
+
+    def test_bind_param(self):
+        import _pypysqlite3
+        stmt = self.statement("select ?, ?, ?, ?, ?, ?, ?")
+        params = [None, True, 2 ** 40, 1.5, u'\xe9', 'x', buffer('y\x00')]
+        for i, param in enumerate(params):
+            assert _pypysqlite3.bind_param(stmt, i + 1, param) == 0
+        row = _pypysqlite3.step_row(stmt, None, None)
+        assert row == (None, 1, 2 ** 40, 1.5, u'\xe9', u'x', buffer('y\x00'))
+        assert _pypysqlite3.bind_param(stmt, 1, object()) == -1
+        raises(OverflowError, _pypysqlite3.bind_param, stmt, 1, 2 ** 64)
+
+    def test_not_a_pointer(self):
+        import _pypysqlite3
+        raises(TypeError, _pypysqlite3.step_row, 42, None, None)
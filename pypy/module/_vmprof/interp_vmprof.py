@@ -4,6 +4,8 @@ from pypy.interpreter.pyframe import PyFrame
 from pypy.interpreter.pycode import PyCode
 from pypy.interpreter.baseobjspace import W_Root
 from rpython.rlib import rvmprof, jit
+from rpython.rlib.rvmprof.rvmprof import (
+    VMPROF_CODE_TAG, VMPROF_JITTED_TAG, VMPROF_NATIVE_TAG)
 from pypy.interpreter.error import oefmt
 
 # ____________________________________________________________
@@ -74,6 +76,77 @@ def disable(space):
     except rvmprof.VMProfError as e:
         raise VMProfError(space, e)
 
+@unwrap_spec(period=float, max_nodes=int, native=int, real_time=int)
+def enable_aggregation(space, period, max_nodes=100000, native=0,
+                       real_time=0):
+    """Enable vmprof without writing a file: the samples are counted in
+    memory, in a tree of at most 'max_nodes' stacks, returned by
+    get_aggregated().  When the tree is full, new stacks are counted in
+    their deepest frame that is already in the tree.  Call disable() to
+    stop.
+    """
+    try:
+        rvmprof.enable_aggregation(period, max_nodes, native, real_time)
+    except rvmprof.VMProfError as e:
+        raise VMProfError(space, e)
+
+def _get_frame_name(kind, value, code_names, native_names):
+    if kind == VMPROF_CODE_TAG or kind == VMPROF_JITTED_TAG:
+        name = code_names.get(value, "")
+        if not name:
+            name = "<unknown code %d>" % (value,)
+        if kind == VMPROF_JITTED_TAG:
+            name += "_[j]"      # flamegraph.pl's annotation for jitted code
+        return name
+    if kind == VMPROF_NATIVE_TAG:
+        addr = value & ~1
+        try:
+            return native_names[addr]
+        except KeyError:
+            name = rvmprof.resolve_native_addr(addr)
+            native_names[addr] = name
+            return name
+    return "<%d:%d>" % (kind, value)
+
+@unwrap_spec(reset=bool)
+def get_aggregated(space, reset=False):
+    """Return the samples counted since enable_aggregation(), as a dict
+    mapping tuples of frame names, from the outermost to the innermost
+    frame, to the number of samples taken in that stack.  The names of
+    jitted frames end with '_[j]', so that '"%s %d" % (";".join(stack),
+    count)' for every item gives the input of flamegraph.pl.  With
+    'reset', the counts start again from zero.
+    """
+    try:
+        nodes = rvmprof.get_aggregated(reset)
+    except rvmprof.VMProfError as e:
+        raise VMProfError(space, e)
+    code_names = {}
+    for parent, kind, value, count in nodes:
+        if kind == VMPROF_CODE_TAG or kind == VMPROF_JITTED_TAG:
+            code_names[value] = ""
+    rvmprof.get_code_names(code_names)
+    native_names = {}
+    frame_names = [_get_frame_name(kind, value, code_names, native_names)
+                   for parent, kind, value, count in nodes]
+    w_result = space.newdict()
+    for i in range(len(nodes)):
+        count = nodes[i][3]
+        if count == 0:
+            continue
+        names_w = []
+        j = i
+        while j > 0:    # the root has no name
+            names_w.append(space.newtext(frame_names[j]))
+            j = nodes[j][0]
+        names_w.reverse()
+        w_stack = space.newtuple(names_w[:])
+        w_count = space.finditem(w_result, w_stack)
+        if w_count is not None:
+            count += space.int_w(w_count)
+        space.setitem(w_result, w_stack, space.newint(count))
+    return w_result
+
 def is_enabled(space):
     return space.newbool(rvmprof.is_enabled())
 
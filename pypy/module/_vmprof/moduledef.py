@@ -13,6 +13,8 @@ class Module(MixedModule):
     interpleveldefs = {
         'enable': 'interp_vmprof.enable',
         'disable': 'interp_vmprof.disable',
+        'enable_aggregation': 'interp_vmprof.enable_aggregation',
+        'get_aggregated': 'interp_vmprof.get_aggregated',
         'is_enabled': 'interp_vmprof.is_enabled',
         'get_profile_path': 'interp_vmprof.get_profile_path',
         'stop_sampling': 'interp_vmprof.stop_sampling',
@@ -152,3 +152,27 @@ class AppTestVMProf(object):
         assert pos3 > pos
         _vmprof.disable()
 
+
+    def test_aggregation(self):
+        import _vmprof, time
+        tmpfile = open(self.tmpfilename, 'wb')
+        raises(_vmprof.VMProfError, _vmprof.enable_aggregation, 0.004, 0)
+        _vmprof.enable_aggregation(0.004, 1000)
+        assert _vmprof.is_enabled() is True
+        raises(_vmprof.VMProfError, _vmprof.enable, tmpfile.fileno(),
+               0.01, 0, 0, 0, 0)
+        t = time.time()
+        while time.time() - t < 0.3:
+            pass
+        assert sum(_vmprof.get_aggregated().values()) > 0
+        _vmprof.disable()
+        assert _vmprof.is_enabled() is False
+        stacks = _vmprof.get_aggregated(reset=True)
+        assert sum(stacks.values()) > 0
+        for stack, count in stacks.items():
+            assert type(stack) is tuple
+            assert count > 0
+        assert _vmprof.get_aggregated() == {}
+        _vmprof.enable(tmpfile.fileno(), 0.01, 0, 0, 0, 0)
+        _vmprof.disable()
+        raises(_vmprof.VMProfError, _vmprof.get_aggregated)
@@ -0,0 +1,80 @@
+""" Opt-in accounting of the calls from Python code to the functions and
+slot wrappers of C extension modules: for each of them, the number of
+calls, the time spent and how many PyObjects were created or objects
+realized from PyObjects during the calls.  The time and the counts are
+inclusive: they contain what is done by nested calls.
+"""
+
+import time
+
+from rpython.rlib import jit
+from pypy.interpreter.gateway import unwrap_spec
+
+
+class CallStat(object):
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.refs_created = 0
+        self.objects_realized = 0
+
+
+class CallStats(object):
+    _immutable_fields_ = ['enabled?']
+
+    def __init__(self, space):
+        self.enabled = False
+        # always counted, even when not enabled: the calls only record the
+        # difference between before and after
+        self.refs_created = 0
+        self.objects_realized = 0
+        self.stats = {}     # {name: CallStat}
+
+    @jit.dont_look_inside
+    def start_call(self):
+        return time.time(), self.refs_created, self.objects_realized
+
+    @jit.dont_look_inside
+    def end_call(self, name, start):
+        start_time, refs_created, objects_realized = start
+        stat = self.stats.get(name, None)
+        if stat is None:
+            stat = self.stats[name] = CallStat()
+        stat.calls += 1
+        stat.time += time.time() - start_time
+        stat.refs_created += self.refs_created - refs_created
+        stat.objects_realized += self.objects_realized - objects_realized
+
+
+@unwrap_spec(enabled=bool)
+def record_call_stats(space, enabled=True):
+    """ record_call_stats(enabled=True)
+
+    Start (or stop) counting the calls to functions, methods and slot
+    wrappers of C extension modules, to be returned by get_call_stats().
+    """
+    space.fromcache(CallStats).enabled = enabled
+
+
+@unwrap_spec(clear=bool)
+def get_call_stats(space, clear=False):
+    """ get_call_stats(clear=False)
+
+    Return a dict mapping the names of the C functions and slot wrappers
+    called since record_call_stats() to tuples (calls, time,
+    refs_created, objects_realized).  The time is in seconds.
+    refs_created counts the PyObjects made for interpreter objects, and
+    objects_realized the interpreter objects made for PyObjects created
+    in C.  Pass clear=True to also reset the counts.
+    """
+    callstats = space.fromcache(CallStats)
+    w_result = space.newdict()
+    for name, stat in callstats.stats.items():
+        space.setitem(w_result, space.newtext(name),
+                      space.newtuple([space.newint(stat.calls),
+                                      space.newfloat(stat.time),
+                                      space.newint(stat.refs_created),
+                                      space.newint(stat.objects_realized)]))
+    if clear:
+        callstats.stats = {}
+    return w_result
@@ -16,7 +16,9 @@ from pypy.module.cpyext.api import (
 from pypy.module.cpyext.pyobject import (
     decref, from_ref, make_ref, as_pyobj, make_typedescr)
 from pypy.module.cpyext.state import State
-from pypy.module.cpyext.tupleobject import tuple_from_args_w
+from pypy.module.cpyext.callstats import CallStats
+from pypy.module.cpyext.tupleobject import (
+    new_args_tuple, release_args_tuple)
 
 PyMethodDef = cts.gettype('PyMethodDef')
 PyCFunction = cts.gettype('PyCFunction')
@@ -59,6 +61,7 @@ def w_kwargs_from_args(space, __args__):
 
 class W_PyCFunctionObject(W_Root):
     _immutable_fields_ = ["flags"]
+    w_objclass = None    # the type, for the method descriptors
 
     def __init__(self, space, ml, w_self, w_module=None):
         self.ml = ml
@@ -71,6 +74,28 @@ class W_PyCFunctionObject(W_Root):
         return self.call(space, self.w_self, __args__)
 
     def call(self, space, w_self, __args__):
+        callstats = space.fromcache(CallStats)
+        if callstats.enabled:
+            start = callstats.start_call()
+            try:
+                return self._call(space, w_self, __args__)
+            finally:
+                callstats.end_call(self.get_stats_name(space), start)
+        return self._call(space, w_self, __args__)
+
+    def get_stats_name(self, space):
+        # 'Type.method' for the method descriptors, 'module.function' for
+        # the functions of a module, like the names of the slot wrappers
+        w_objclass = self.w_objclass
+        if w_objclass is not None:
+            assert isinstance(w_objclass, W_TypeObject)
+            return '%s.%s' % (w_objclass.name, self.name)
+        w_module = self.w_module
+        if w_module is not None and space.isinstance_w(w_module, space.w_text):
+            return '%s.%s' % (space.text_w(w_module), self.name)
+        return self.name
+
+    def _call(self, space, w_self, __args__):
         flags = self.flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST)
         length = len(__args__.arguments_w)
         if not flags & METH_KEYWORDS and __args__.keywords:
@@ -106,20 +131,20 @@ class W_PyCFunctionObject(W_Root):
     def call_varargs(self, space, w_self, __args__):
         state = space.fromcache(State)
         func = self.ml.c_ml_meth
-        py_args = tuple_from_args_w(space, __args__.arguments_w)
+        py_args = new_args_tuple(space, __args__.arguments_w)
         try:
             return generic_cpy_call(space, func, w_self, py_args)
         finally:
-            decref(space, py_args)
+            release_args_tuple(space, py_args)
 
     def call_keywords(self, space, w_self, __args__):
         func = rffi.cast(PyCFunctionKwArgs, self.ml.c_ml_meth)
-        py_args = tuple_from_args_w(space, __args__.arguments_w)
+        py_args = new_args_tuple(space, __args__.arguments_w)
         w_kwargs = w_kwargs_from_args(space, __args__)
         try:
             return generic_cpy_call(space, func, w_self, py_args, w_kwargs)
         finally:
-            decref(space, py_args)
+            release_args_tuple(space, py_args)
 
     def call_oldargs(self, space, w_self, __args__):
         func = self.ml.c_ml_meth
@@ -129,11 +154,14 @@ class W_PyCFunctionObject(W_Root):
         elif length == 1:
             py_args = make_ref(space, __args__.arguments_w[0])
         else:
-            py_args = tuple_from_args_w(space, __args__.arguments_w)
+            py_args = new_args_tuple(space, __args__.arguments_w)
         try:
             return generic_cpy_call(space, func, w_self, py_args)
         finally:
-            decref(space, py_args)
+            if length > 1:
+                release_args_tuple(space, py_args)
+            else:
+                decref(space, py_args)
 
     def get_doc(self, space):
         doc = self.ml.c_ml_doc
@@ -246,6 +274,14 @@ class W_PyCWrapperObject(W_Root):
         self.w_objclass = w_type
 
     def descr_call(self, space, w_self, __args__):
+        callstats = space.fromcache(CallStats)
+        if callstats.enabled:
+            start = callstats.start_call()
+            try:
+                return self.call(space, w_self, __args__)
+            finally:
+                callstats.end_call('%s.%s' % (self.w_objclass.name,
+                                              self.method_name), start)
         return self.call(space, w_self, __args__)
 
     def call(self, space, w_self, __args__):
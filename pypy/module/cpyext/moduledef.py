@@ -6,6 +6,8 @@ class Module(MixedModule):
     interpleveldefs = {
         'load_module': 'api.load_extension_module',
         'is_cpyext_function': 'interp_cpyext.is_cpyext_function',
+        'record_call_stats': 'callstats.record_call_stats',
+        'get_call_stats': 'callstats.get_call_stats',
         'FunctionType': 'methodobject.W_PyCFunctionObject',
     }
 
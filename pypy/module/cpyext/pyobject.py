@@ -9,6 +9,7 @@ from pypy.module.cpyext.api import (
     CANNOT_FAIL, Py_TPFLAGS_HEAPTYPE, PyTypeObjectPtr, is_PyObject,
     PyVarObject, Py_ssize_t, init_function, cts)
 from pypy.module.cpyext.state import State
+from pypy.module.cpyext.callstats import CallStats
 from pypy.objspace.std.typeobject import W_TypeObject
 from pypy.objspace.std.noneobject import W_NoneObject
 from pypy.objspace.std.boolobject import W_BoolObject
@@ -223,6 +224,7 @@ def create_ref(space, w_obj, w_userdata=None, immortal=False):
         itemcount = 0
     py_obj = typedescr.allocate(space, w_type, itemcount=itemcount, immortal=immortal)
     track_reference(space, py_obj, w_obj)
+    space.fromcache(CallStats).refs_created += 1
     #
     # py_obj.c_ob_refcnt should be exactly REFCNT_FROM_PYPY + 1 here,
     # and we want only REFCNT_FROM_PYPY, i.e. only count as attached
@@ -286,6 +288,7 @@ def from_ref(space, ref):
         raise InvalidPointerException(str(ref))
     w_type = from_ref(space, ref_type)
     assert isinstance(w_type, W_TypeObject)
+    space.fromcache(CallStats).objects_realized += 1
     return get_typedescr(w_type.layout.typedef).realize(space, ref)
 
 @jit.dont_look_inside
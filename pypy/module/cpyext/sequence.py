@@ -1,6 +1,7 @@
 
 from rpython.rlib import rerased, jit
 from rpython.rlib.objectmodel import keepalive_until_here
+from rpython.rlib.longlong2float import float2longlong
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.objspace.std.listobject import (
     ListStrategy, UNROLL_CUTOFF, W_ListObject, ObjectListStrategy)
@@ -9,6 +10,7 @@ from pypy.module.cpyext.api import (
     generic_cpy_call)
 from pypy.module.cpyext.pyobject import PyObject, make_ref, from_ref
 from pypy.module.cpyext.pyobject import as_pyobj, incref
+from pypy.module.cpyext.state import State
 from rpython.rtyper.lltypesystem import rffi, lltype
 from pypy.objspace.std import tupleobject
 
@@ -350,7 +352,7 @@ class CPyListStrategy(ListStrategy):
 
     def getstorage_copy(self, w_list):
         lst = self.getitems(w_list)
-        return self.erase(CPyListStorage(w_list.space, lst))
+        return self.erase(CPyListStorage.from_list_w(w_list.space, lst))
 
     #------------------------------------------
     # all these methods fail or switch strategy and then call ListObjectStrategy's method
@@ -420,13 +422,69 @@ class CPyListStrategy(ListStrategy):
 PyObjectList = lltype.Ptr(lltype.Array(PyObject, hints={'nolength': True}))
 
 class CPyListStorage(object):
-    def __init__(self, space, lst):
+    def __init__(self, space, length):
         self.space = space
-        self._elems = lltype.malloc(PyObjectList.TO, len(lst), flavor='raw')
-        self._length = len(lst)
-        self._allocated = len(lst)
+        # zero-filled, so that __del__ works if filling it fails half-way
+        self._elems = lltype.malloc(PyObjectList.TO, length, flavor='raw',
+                                    zero=True)
+        self._length = length
+        self._allocated = length
+
+    @staticmethod
+    def from_list_w(space, lst):
+        storage = CPyListStorage(space, len(lst))
         for i, item in enumerate(lst):
-            self._elems[i] = make_ref(space, lst[i])
+            storage._elems[i] = make_ref(space, lst[i])
+        return storage
+
+    @staticmethod
+    def from_list(space, w_list):
+        """Make the storage for the items of 'w_list' in a single pass.
+        Lists of ints or floats are converted from their unwrapped items,
+        and equal items share a single PyObject: this avoids allocating
+        a wrapped object and a PyObject for every item."""
+        intlist = w_list.getitems_int()
+        if intlist is not None:
+            storage = CPyListStorage(space, len(intlist))
+            storage._fill_from_ints(intlist)
+            return storage
+        floatlist = w_list.getitems_float()
+        if floatlist is not None:
+            storage = CPyListStorage(space, len(floatlist))
+            storage._fill_from_floats(floatlist)
+            return storage
+        return CPyListStorage.from_list_w(space, w_list.getitems())
+
+    def _fill_from_ints(self, intlist):
+        space = self.space
+        state = space.fromcache(State)
+        refs = {}
+        for i in range(len(intlist)):
+            value = intlist[i]
+            py_item = refs.get(value, lltype.nullptr(PyObject.TO))
+            if py_item:
+                incref(space, py_item)
+            else:
+                py_item = state.ccall("PyInt_FromLong", value)
+                if not py_item:
+                    state.check_and_raise_exception(always=True)
+                refs[value] = py_item
+            self._elems[i] = py_item
+
+    def _fill_from_floats(self, floatlist):
+        space = self.space
+        refs = {}
+        for i in range(len(floatlist)):
+            value = floatlist[i]
+            # by bit pattern, to keep 0.0 and -0.0 apart and to share NaNs
+            key = float2longlong(value)
+            py_item = refs.get(key, lltype.nullptr(PyObject.TO))
+            if py_item:
+                incref(space, py_item)
+            else:
+                py_item = make_ref(space, space.newfloat(value))
+                refs[key] = py_item
+            self._elems[i] = py_item
 
     def __del__(self):
         for i in range(self._length):
@@ -19,8 +19,9 @@ from pypy.module.cpyext.memoryobject import fill_Py_buffer
 from pypy.module.cpyext.state import State
 from pypy.module.cpyext import userslot
 from pypy.module.cpyext.buffer import CBuffer, CPyBuffer, fq
-from pypy.module.cpyext.methodobject import (W_PyCWrapperObject, tuple_from_args_w,
+from pypy.module.cpyext.methodobject import (W_PyCWrapperObject,
                                              w_kwargs_from_args)
+from pypy.module.cpyext.tupleobject import new_args_tuple, release_args_tuple
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.argument import Arguments
 from rpython.rlib.unroll import unrolling_iterable
@@ -60,12 +61,12 @@ class wrap_init(W_PyCWrapperObject):
     def call(self, space, w_self, __args__):
         func = self.get_func_to_call()
         func_init = rffi.cast(initproc, func)
-        py_args = tuple_from_args_w(space, __args__.arguments_w)
+        py_args = new_args_tuple(space, __args__.arguments_w)
         w_kwargs = w_kwargs_from_args(space, __args__)
         try:
             res = generic_cpy_call(space, func_init, w_self, py_args, w_kwargs)
         finally:
-            decref(space, py_args)
+            release_args_tuple(space, py_args)
         if rffi.cast(lltype.Signed, res) == -1:
             space.fromcache(State).check_and_raise_exception(always=True)
         return None
@@ -245,12 +246,12 @@ class wrap_call(W_PyCWrapperObject):
     def call(self, space, w_self, __args__):
         func = self.get_func_to_call()
         func_target = rffi.cast(ternaryfunc, func)
-        py_args = tuple_from_args_w(space, __args__.arguments_w)
+        py_args = new_args_tuple(space, __args__.arguments_w)
         w_kwargs = w_kwargs_from_args(space, __args__)
         try:
             ret = generic_cpy_call(space, func_target, w_self, py_args, w_kwargs)
         finally:
-            decref(space, py_args)
+            release_args_tuple(space, py_args)
         return ret
 
 class wrap_ssizessizeobjargproc(W_PyCWrapperObject):
@@ -211,6 +211,40 @@ class AppTestListObject(AppTestCpythonExtensionBase):
              """)])
         assert module.test_get_item() == b'test_get_item0'
 
+    def test_int_and_float_lists(self):
+        module = self.import_extension('foo', [
+             ("same_item", "METH_VARARGS",
+             """
+                PyObject *l;
+                Py_ssize_t i, j;
+                if (!PyArg_ParseTuple(args, "Onn", &l, &i, &j))
+                    return NULL;
+                return PyBool_FromLong(PyList_GET_ITEM(l, i) ==
+                                       PyList_GET_ITEM(l, j));
+             """),
+             ("get_item", "METH_VARARGS",
+             """
+                PyObject *l, *item;
+                Py_ssize_t i;
+                if (!PyArg_ParseTuple(args, "On", &l, &i))
+                    return NULL;
+                item = PyList_GET_ITEM(l, i);
+                Py_INCREF(item);
+                return item;
+             """)])
+        l = [5, 7, 5, 10**9, 10**9]
+        assert module.same_item(l, 0, 2)
+        assert module.same_item(l, 3, 4)
+        assert not module.same_item(l, 0, 1)
+        assert [module.get_item(l, i) for i in range(5)] == l
+        l.append(8)
+        assert l == [5, 7, 5, 10**9, 10**9, 8]
+        l = [0.0, -0.0, 1.5, 1.5]
+        assert module.same_item(l, 2, 3)
+        assert not module.same_item(l, 0, 1)
+        assert str(module.get_item(l, 1)) == '-0.0'
+        assert [module.get_item(l, i) for i in range(4)] == l
+
     def test_item_refcounts(self):
         """PyList_SET_ITEM leaks a reference to the target."""
         module = self.import_extension('foo', [
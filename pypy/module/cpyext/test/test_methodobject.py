@@ -254,3 +254,64 @@ class AppTestMethodObject(AppTestCpythonExtensionBase):
         mod = self.import_module(name="specmethdocstring")
         c = mod.C()
         assert c.__iter__.__doc__ == "usable docstring"
+
+    def test_call_stats(self):
+        import cpyext
+        mod = self.import_extension('MyModule', [
+            ('make_tuple', 'METH_O',
+             '''
+             return PyTuple_New(0);
+             '''
+             ),
+            ])
+        cpyext.get_call_stats(clear=True)
+        mod.make_tuple(None)
+        assert 'MyModule.make_tuple' not in cpyext.get_call_stats()
+        cpyext.record_call_stats()
+        try:
+            for i in range(3):
+                assert mod.make_tuple(object()) == ()
+            stats = cpyext.get_call_stats(clear=True)
+            calls, time, refs_created, objects_realized = stats[
+                'MyModule.make_tuple']
+            assert calls == 3
+            assert time >= 0.0
+            assert refs_created >= 3
+            assert objects_realized == 3
+            assert cpyext.get_call_stats() == {}
+            mod2 = self.import_module(name="specmethdocstring")
+            c = mod2.C()
+            c.__iter__()
+            stats = cpyext.get_call_stats()
+            names = [name for name in stats if name.endswith('.__iter__')]
+            assert len(names) == 1
+            assert stats[names[0]][0] == 1
+        finally:
+            cpyext.record_call_stats(False)
+
+    def test_args_tuple_reused(self):
+        mod = self.import_extension('MyModule', [
+            ('args_address', 'METH_VARARGS',
+             '''
+             return PyLong_FromVoidPtr(args);
+             '''
+             ),
+            ('keep_args', 'METH_VARARGS',
+             '''
+             static PyObject *kept = NULL;
+             Py_XDECREF(kept);
+             Py_INCREF(args);
+             kept = args;
+             return args;
+             '''
+             ),
+            ])
+        a = mod.args_address(1, 2)
+        assert mod.args_address(3, 4) == a
+        assert mod.args_address(5) != a
+        t1 = mod.keep_args(1, 2)
+        t2 = mod.keep_args(3, 4)
+        assert t1 == (1, 2)
+        assert t2 == (3, 4)
+        assert mod.keep_args("x", "y", "z") == ("x", "y", "z")
+        assert t2 == (3, 4)
@@ -128,6 +128,48 @@ def tuple_from_args_w(space, args_w):
         py_tuple.c_ob_item[i] = make_ref(space, w_obj)
     return rffi.cast(PyObject, py_tuple)
 
+# Calls to METH_VARARGS functions need a PyTupleObject for the arguments.
+# Usually nobody else references it once the function returned, and then
+# we keep it as the spare tuple of its size, to be refilled by the next
+# call instead of going through PyTuple_New() and _Py_Dealloc() each time.
+ARGS_TUPLE_CACHE_SIZE = 8
+
+class ArgsTupleCache(object):
+    def __init__(self, space):
+        self.spare = [lltype.nullptr(PyObject.TO)] * ARGS_TUPLE_CACHE_SIZE
+
+def new_args_tuple(space, args_w):
+    """Like tuple_from_args_w(), for the arguments of a call.  Release the
+    result with release_args_tuple() instead of decref()."""
+    n = len(args_w)
+    if 0 < n < ARGS_TUPLE_CACHE_SIZE:
+        cache = space.fromcache(ArgsTupleCache)
+        py_obj = cache.spare[n]
+        if py_obj:
+            cache.spare[n] = lltype.nullptr(PyObject.TO)
+            py_tuple = rffi.cast(PyTupleObject, py_obj)
+            for i in range(n):
+                py_tuple.c_ob_item[i] = make_ref(space, args_w[i])
+            return py_obj
+    return tuple_from_args_w(space, args_w)
+
+def release_args_tuple(space, py_obj):
+    py_tuple = rffi.cast(PyTupleObject, py_obj)
+    n = py_tuple.c_ob_size
+    if (py_obj.c_ob_refcnt == 1 and py_obj.c_ob_pypy_link == 0 and
+            0 < n < ARGS_TUPLE_CACHE_SIZE):
+        # the decrefs below may run arbitrary code, including other calls
+        # that keep their own tuple as the spare
+        for i in range(n):
+            py_item = py_tuple.c_ob_item[i]
+            py_tuple.c_ob_item[i] = lltype.nullptr(PyObject.TO)
+            decref(space, py_item)
+        cache = space.fromcache(ArgsTupleCache)
+        if not cache.spare[n]:
+            cache.spare[n] = py_obj
+            return
+    decref(space, py_obj)
+
 @cpython_api([PyObject, Py_ssize_t, PyObject], rffi.INT_real, error=-1)
 def PyTuple_SetItem(space, ref, index, py_obj):
     if not tuple_check_ref(space, ref):
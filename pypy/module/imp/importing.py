@@ -968,6 +968,7 @@ def update_code_filenames(space, code_w, pathname, oldname=None):
         return
 
     code_w.co_filename = pathname
+    code_w.materialize_consts()
     constants = code_w.co_consts_w
     for const in constants:
         if const is not None and isinstance(const, PyCode):
@@ -1,9 +1,12 @@
 from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.gateway import WrappedDefault, unwrap_spec
+from pypy.interpreter.buffer import BufferInterfaceNotFound
+from pypy.interpreter.pycode import W_LazyCode
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib import rstackovf
 from pypy.module._file.interp_file import W_File
-from pypy.objspace.std.marshal_impl import marshal, get_unmarshallers
+from pypy.objspace.std.marshal_impl import (marshal, get_unmarshallers,
+    skip_object, unmarshal_pycode, TYPE_CODE)
 
 
 Py_MARSHAL_VERSION = 2
@@ -46,10 +49,24 @@ def load(space, w_f):
     finally:
         reader.finished()
 
-def loads(space, w_str):
+@unwrap_spec(lazy=bool)
+def loads(space, w_str, lazy=False):
     """Convert a string back to a value.  Extra characters in the string are
-ignored."""
-    u = StringUnmarshaller(space, w_str)
+ignored.  Read-only buffers, like mmap objects, are read in place.  If
+'lazy' is true, the code objects nested in another code object are only
+built the first time they are used."""
+    if (space.isinstance_w(w_str, space.w_bytes) or
+            space.isinstance_w(w_str, space.w_unicode)):
+        u = StringUnmarshaller(space, w_str)
+    else:
+        try:
+            buf = w_str.readbuf_w(space)
+        except BufferInterfaceNotFound:
+            # raises the usual TypeError
+            u = StringUnmarshaller(space, w_str)
+        else:
+            u = BufferUnmarshaller(space, buf)
+    u.lazy = lazy
     obj = u.load_w_obj()
     return obj
 
@@ -441,8 +458,26 @@ class Unmarshaller(_Base):
         self.raise_exc('object too deeply nested to unmarshal')
 
 
+def unmarshal_lazy_pycode(space, u, tc):
+    assert isinstance(u, StringUnmarshaller)
+    if u.lazy and u.code_depth > 0:
+        return u.get_lazy_code()
+    u.code_depth += 1
+    w_code = unmarshal_pycode(space, u, tc)
+    u.code_depth -= 1
+    return w_code
+
+
 class StringUnmarshaller(Unmarshaller):
     # Unmarshaller with inlined buffer string
+    _dispatch = Unmarshaller._dispatch[:]
+    _dispatch[ord(TYPE_CODE)] = unmarshal_lazy_pycode
+
+    # with 'lazy', the code objects nested in the outermost one are
+    # W_LazyCode
+    lazy = False
+    code_depth = 0
+
     def __init__(self, space, w_str):
         Unmarshaller.__init__(self, space, None)
         self.bufstr = space.getarg_w('s#', w_str)
@@ -461,6 +496,25 @@ class StringUnmarshaller(Unmarshaller):
         self.bufpos = newpos
         return self.bufstr[pos : newpos]
 
+    def skip(self, n):
+        newpos = self.bufpos + n
+        if n < 0 or newpos > self.limit:
+            self.raise_eof()
+        assert newpos >= 0
+        self.bufpos = newpos
+
+    def getslice(self, start, stop):
+        return self.bufstr[start:stop]
+
+    def get_lazy_code(self):
+        start = self.bufpos - 1     # the TYPE_CODE was already read
+        assert start >= 0
+        nstrings = len(self.stringtable_w)
+        self.bufpos = start
+        skip_object(self.space, self)
+        return W_LazyCode(self.getslice(start, self.bufpos),
+                          self.stringtable_w, nstrings)
+
     def get1(self):
         pos = self.bufpos
         if pos >= self.limit:
@@ -498,3 +552,45 @@ class StringUnmarshaller(Unmarshaller):
             return x
         else:
             self.raise_exc('bad marshal data')
+
+
+class BufferUnmarshaller(StringUnmarshaller):
+    # reads from a buffer, without making a string of all of it
+    def __init__(self, space, buf):
+        Unmarshaller.__init__(self, space, None)
+        self.buf = buf
+        self.bufpos = 0
+        self.limit = buf.getlength()
+
+    def get(self, n):
+        pos = self.bufpos
+        newpos = pos + n
+        if newpos > self.limit:
+            self.raise_eof()
+        self.bufpos = newpos
+        return self.buf.getslice(pos, 1, n)
+
+    def get1(self):
+        pos = self.bufpos
+        if pos >= self.limit:
+            self.raise_eof()
+        self.bufpos = pos + 1
+        return self.buf.getitem(pos)
+
+    def get_int(self):
+        return Unmarshaller.get_int(self)
+
+    def get_lng(self):
+        return Unmarshaller.get_lng(self)
+
+    def getslice(self, start, stop):
+        return self.buf.getslice(start, 1, stop - start)
+
+
+def load_lazy_code(space, data, stringtable_w):
+    """Build the code object of a W_LazyCode.  The code objects nested in
+    it are lazy too."""
+    u = StringUnmarshaller(space, space.newbytes(data))
+    u.lazy = True
+    u.stringtable_w = stringtable_w
+    return u.load_w_obj()
@@ -6,6 +6,17 @@ import sys
 class AppTestMarshalMore:
     spaceconfig = dict(usemodules=('array',))
 
+    def setup_class(cls):
+        from pypy.interpreter.gateway import interp2app
+        from pypy.interpreter.pycode import PyCode
+        from pypy.module.imp.importing import update_code_filenames
+        def remove_docstrings_and_update_filenames(space, w_code):
+            code = space.interp_w(PyCode, w_code)
+            code.remove_docstrings(space)
+            update_code_filenames(space, code, 'new_name')
+        cls.w_remove_docstrings_and_update_filenames = cls.space.wrap(
+            interp2app(remove_docstrings_and_update_filenames))
+
     def test_long_0(self):
         import marshal
         z = 0L
@@ -54,6 +65,64 @@ class AppTestMarshalMore:
         z = marshal.loads('I\x00\x1c\xf4\xab\xfd\xff\xff\xff')
         assert z == -10000000000
 
+    def test_buffer_larger(self):
+        import marshal, array
+        data = ([1, 2.5, 3j, 2**100, u'\xe9', 'abc', None],
+                {'abc': (True, False, frozenset([4]))})
+        s = marshal.dumps(data)
+        assert marshal.loads(buffer(s + 'junk')) == data
+        assert marshal.loads(array.array('c', s)) == data
+        raises(EOFError, marshal.loads, buffer(s[:-1]))
+
+    def test_lazy_code(self):
+        import marshal
+        source = '''if 1:
+            def f(x):
+                def g(y):
+                    return x + y
+                return g
+            class A(object):
+                def meth(self):
+                    return 'meth'
+        '''
+        code = compile(source, 'test_lazy', 'exec')
+        s = marshal.dumps(code)
+        lazy_code = marshal.loads(s, True)
+        assert lazy_code == code
+        assert hash(lazy_code) == hash(code)
+        assert lazy_code.co_consts == code.co_consts
+        assert marshal.dumps(lazy_code) == s
+        lazy_code = marshal.loads(buffer(s), True)
+        d = {}
+        exec lazy_code in d
+        assert d['f'](40)(2) == 42
+        assert d['A']().meth() == 'meth'
+        assert d['f'].func_code.co_filename == 'test_lazy'
+
+    def test_lazy_code_bad_data(self):
+        import marshal
+        s = marshal.dumps(compile('def f(): pass', 'test', 'exec'))
+        i = s.index('c', 1)    # the code of f
+        assert s[i + 26:i + 32] == '(\x01\x00\x00\x00N'     # co_consts
+        code = marshal.loads(s[:i + 31] + '0' + s[i + 32:], True)
+        raises(TypeError, "code.co_consts")
+        raises(EOFError, marshal.loads, s[:-4], True)
+
+
+    def test_lazy_code_changed(self):
+        import marshal
+        source = '''if 1:
+            def f():
+                "docstring"
+        '''
+        s = marshal.dumps(compile(source, 'test_lazy', 'exec'))
+        code = marshal.loads(s, True)
+        self.remove_docstrings_and_update_filenames(code)
+        d = {}
+        exec code in d
+        assert d['f'].__doc__ is None
+        assert d['f'].func_code.co_filename == 'new_name'
+
 
 class AppTestMarshalSmallLong(AppTestMarshalMore):
     spaceconfig = dict(usemodules=('array',),
@@ -3,7 +3,8 @@ from pypy.interpreter.typedef import TypeDef, GetSetProperty
 from pypy.interpreter.gateway import interp2app, unwrap_spec, WrappedDefault
 from pypy.interpreter.error import OperationError, oefmt
 from rpython.rlib import rgc, jit, rutf8
-from rpython.rlib.objectmodel import specialize
+from rpython.rlib.objectmodel import specialize, newlist_hint
+from rpython.rlib.unroll import unrolling_iterable
 from rpython.rtyper.lltypesystem import rffi, lltype
 from rpython.rtyper.tool import rffi_platform
 from rpython.translator.tool.cbuild import ExternalCompilationInfo
@@ -210,6 +211,14 @@ class CallbackData(W_Root):
         self.space = space
         self.parser = weakref.ref(parser)
 
+# the events that SetEventBatchHandler() collects, and the name of the
+# Cache attribute that is their first item
+BATCHED_EVENTS = {
+    'StartElementHandler': 'w_start',
+    'EndElementHandler': 'w_end',
+    'CharacterDataHandler': 'w_data',
+    }
+
 SETTERS = {}
 for index, (name, params) in enumerate(HANDLERS.items()):
     arg_names = ['arg%d' % (i,) for i in range(len(params))]
@@ -269,7 +278,23 @@ for index, (name, params) in enumerate(HANDLERS.items()):
     if name == 'CharacterDataHandler':
         pre_code = 'if parser.buffer_string(space, w_arg0, arg1): return'
     else:
-        pre_code = 'parser.flush_character_buffer(space)'
+        pre_code = ('parser.flush_events(space); '
+                    'parser.flush_character_buffer(space)')
+
+    if name in BATCHED_EVENTS:
+        batch_code = """
+        if parser.w_batch_handler is not None:
+            try:
+                %s
+                parser.add_event(space, space.fromcache(Cache).%s, %s)
+            except OperationError, e:
+                if not parser._exc_info: # don't override an existing exception
+                     parser._exc_info = e
+                XML_StopParser(parser.itself, XML_FALSE)
+            return %s
+""" % (converters, BATCHED_EVENTS[name], wargs, result_error)
+    else:
+        batch_code = ''
 
     if name == 'ExternalEntityRefHandler':
         first_arg = 'll_parser'
@@ -289,7 +314,7 @@ for index, (name, params) in enumerate(HANDLERS.items()):
         userdata = global_storage.get_object(id)
         space = userdata.space
         parser = userdata.parser()
-
+        %(batch_code)s
         handler = parser.handlers[%(index)s]
         if not handler:
             return %(result_error)s
@@ -317,6 +342,9 @@ for index, (name, params) in enumerate(HANDLERS.items()):
                           [XML_Parser, callback_type], lltype.Void)
     SETTERS[name] = (index, func, callback)
 
+batched_setters = unrolling_iterable([SETTERS[name][1:]
+                                      for name in BATCHED_EVENTS])
+
 # special case for UnknownEncodingHandlerData:
 # XML_SetUnknownEncodingHandler() needs an additional argument,
 # and it's not modifiable via user code anyway
@@ -410,6 +438,9 @@ def get_expat_version_info(space):
 class Cache:
     def __init__(self, space):
         self.w_error = space.new_exception_class("pyexpat.ExpatError")
+        self.w_start = space.newtext("start")
+        self.w_end = space.newtext("end")
+        self.w_data = space.newtext("data")
 
 
 class W_XMLParserType(W_Root):
@@ -433,6 +464,14 @@ class W_XMLParserType(W_Root):
         self.buffer_used = 0
         self.w_character_data_handler = None
 
+        self.w_batch_handler = None
+        self.batch_size = 0
+        self.events_w = []
+
+        # names already converted, by their utf-8 bytes, if w_intern is used
+        self.interned_w = {}
+        self.interned_unicode = True
+
         self._exc_info = None
 
         # Set user data for callback function
@@ -500,16 +539,29 @@ getting the advantage of providing document type information to the parser.
     def w_convert_interned(self, space, data):
         if not data:
             return space.w_None
-        w_data = self.w_convert(space, rffi.constcharp2str(data))
+        s = rffi.constcharp2str(data)
         if not self.w_intern:
-            return w_data
-
+            return self.w_convert(space, s)
+
+        # tag and attribute names repeat a lot: look them up by their bytes
+        # first, which avoids decoding them and hashing the result again
+        if self.interned_unicode != self.returns_unicode:
+            self.interned_w = {}
+            self.interned_unicode = self.returns_unicode
+        w_data = self.interned_w.get(s, None)
+        if w_data is not None:
+            # but the intern dict is public: return the name only if it is
+            # still the one found there
+            if space.finditem(self.w_intern, w_data) is w_data:
+                return w_data
+        w_data = self.w_convert(space, s)
         try:
-            return space.getitem(self.w_intern, w_data)
+            w_data = space.getitem(self.w_intern, w_data)
         except OperationError as e:
             if not e.match(space, space.w_KeyError):
                 raise
-        space.setitem(self.w_intern, w_data, w_data)
+            space.setitem(self.w_intern, w_data, w_data)
+        self.interned_w[s] = w_data
         return w_data
 
     def w_convert_charp_n(self, space, data, length):
@@ -575,6 +627,45 @@ getting the advantage of providing document type information to the parser.
                 self.buffer_used = 0
         return False
 
+    def add_event(self, space, w_kind, w_arg, w_arg2=None):
+        if w_arg2 is None:
+            w_event = space.newtuple([w_kind, w_arg])
+        else:
+            w_event = space.newtuple([w_kind, w_arg, w_arg2])
+        self.events_w.append(w_event)
+        if len(self.events_w) >= self.batch_size:
+            self.flush_events(space)
+
+    def flush_events(self, space):
+        if not self.events_w:
+            return
+        w_events = space.newlist(self.events_w)
+        self.events_w = newlist_hint(self.batch_size)
+        space.call_function(self.w_batch_handler, w_events)
+
+    @unwrap_spec(size=int)
+    def SetEventBatchHandler(self, space, w_handler, size=1024):
+        """SetEventBatchHandler(handler[, size])
+Collect the start element, end element and character data events in a
+list of tuples ('start', name, attributes), ('end', name) and ('data',
+text), and call handler(events) when it contains 'size' events, before
+calling any other handler, and at the end of Parse().  The handlers of
+these three events are not called in the meantime.  Pass None to go back
+to calling them."""
+        if size <= 0:
+            raise oefmt(space.w_ValueError, "size must be greater than zero")
+        self.flush_events(space)
+        self.flush_character_buffer(space)
+        if space.is_w(w_handler, space.w_None):
+            self.w_batch_handler = None
+            self.events_w = []
+            return
+        self.w_batch_handler = w_handler
+        self.batch_size = size
+        self.events_w = newlist_hint(size)
+        for setter, handler in batched_setters:
+            setter(self.itself, handler)
+
     def gethandler(self, space, name, index):
         if name == 'CharacterDataHandler':
             return self.w_character_data_handler or space.w_None
@@ -656,6 +747,7 @@ Parse XML data.  `isfinal' should be true at end of input."""
         elif res == 0:
             exc = self.set_error(space, XML_GetErrorCode(self.itself))
             raise exc
+        self.flush_events(space)
         self.flush_character_buffer(space)
         return space.newint(res)
 
@@ -776,7 +868,7 @@ def bool_property(name, cls, doc=None):
     return GetSetProperty(fget, fset, cls=cls, doc=doc)
 
 XMLParser_methods = ['Parse', 'ParseFile', 'SetBase', 'SetParamEntityParsing',
-                     'ExternalEntityParserCreate']
+                     'ExternalEntityParserCreate', 'SetEventBatchHandler']
 if XML_COMBINED_VERSION >= 19505:
     XMLParser_methods.append('UseForeignDTD')
 
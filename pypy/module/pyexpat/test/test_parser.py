@@ -86,6 +86,69 @@ class AppTestPyexpat:
         p.Parse("<xml></xml>")
         assert len(p.intern) == 1
 
+    def test_intern_same_objects(self):
+        import pyexpat
+        p = pyexpat.ParserCreate()
+        names = []
+        p.StartElementHandler = lambda name, attrs: names.append(name)
+        p.Parse("<xml><a/><a/></xml>", True)
+        assert names == [u'xml', u'a', u'a']
+        assert names[1] is names[2]
+        assert p.intern[u'a'] is names[1]
+
+    def test_intern_changed(self):
+        import pyexpat
+        p = pyexpat.ParserCreate()
+        names = []
+        p.StartElementHandler = lambda name, attrs: names.append(name)
+        p.Parse("<xml><a/>", False)
+        p.intern.clear()
+        p.Parse("<a/>", False)
+        assert p.intern == {u'a': u'a'}
+        assert p.intern[u'a'] is names[2]
+        a = p.intern[u'a'] = u''.join([u'a'])
+        p.Parse("<a/></xml>", True)
+        assert names == [u'xml', u'a', u'a', u'a']
+        assert names[3] is a
+
+    def test_event_batch_handler(self):
+        import pyexpat
+        p = pyexpat.ParserCreate()
+        calls = []
+        p.StartElementHandler = lambda *args: calls.append(args)
+        p.CommentHandler = lambda text: calls.append(('comment', text))
+        p.SetEventBatchHandler(calls.append, 3)
+        p.Parse("<xml a='1'>text<b/><!--x--></xml>", True)
+        assert calls == [
+            [('start', u'xml', {u'a': u'1'}), ('data', u'text'),
+             ('start', u'b', {})],
+            [('end', u'b')],
+            ('comment', u'x'),
+            [('end', u'xml')]]
+        raises(ValueError, p.SetEventBatchHandler, calls.append, 0)
+
+    def test_event_batch_handler_stop(self):
+        import pyexpat
+        p = pyexpat.ParserCreate()
+        batches = []
+        p.SetEventBatchHandler(batches.append)
+        p.Parse("<xml><a>", False)
+        assert batches == [[('start', u'xml', {}), ('start', u'a', {})]]
+        p.SetEventBatchHandler(None)
+        names = []
+        p.EndElementHandler = names.append
+        p.Parse("</a></xml>", True)
+        assert names == [u'a', u'xml']
+        assert len(batches) == 1
+
+    def test_event_batch_handler_error(self):
+        import pyexpat
+        p = pyexpat.ParserCreate()
+        def handler(events):
+            raise ZeroDivisionError
+        p.SetEventBatchHandler(handler, 1)
+        raises(ZeroDivisionError, p.Parse, "<xml></xml>", True)
+
     def test_set_buffersize(self):
         import pyexpat, sys
         p = pyexpat.ParserCreate()
@@ -0,0 +1,31 @@
+
+def warm_start(filename):
+    """ warm_start(filename)
+
+    Load the warm-up profile saved in 'filename' by a previous run, if
+    any, and save an updated profile there when the process exits.  The
+    loops listed in the profile are traced as soon as they are reached,
+    instead of after the usual number of iterations.  Call this early,
+    e.g. from sitecustomize: only the code objects created afterwards
+    benefit from the profile.
+    """
+    import pypyjit, marshal, atexit, os
+    try:
+        with open(filename, 'rb') as f:
+            previous = marshal.load(f)
+    except (IOError, EOFError, ValueError, TypeError):
+        previous = []
+    pypyjit.set_warmup_profile(previous)
+    pypyjit.record_warmup_profile(True)
+
+    def save():
+        entries = set([tuple(entry) for entry in previous])
+        entries.update(pypyjit.get_warmup_profile())
+        tmpname = '%s.%d.tmp' % (filename, os.getpid())
+        try:
+            with open(tmpname, 'wb') as f:
+                marshal.dump(sorted(entries), f)
+            os.rename(tmpname, filename)
+        except (IOError, OSError):
+            pass
+    atexit.register(save)
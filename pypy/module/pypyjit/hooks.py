@@ -5,6 +5,8 @@ from rpython.rlib.jit import JitHookInterface, Counters
 from pypy.interpreter.error import OperationError
 from pypy.module.pypyjit.interp_resop import (Cache, wrap_greenkey,
     WrappedOp, W_JitLoopInfo, wrap_oplist)
+from pypy.module.pypyjit.interp_warmup import WarmupCache, record_loop
+from pypy.module.pypyjit.interp_loopstats import LoopStatsCache, add_loop_stats
 
 class PyPyJitIface(JitHookInterface):
     def are_hooks_enabled(self):
@@ -12,7 +14,9 @@ class PyPyJitIface(JitHookInterface):
         cache = space.fromcache(Cache)
         return (cache.w_compile_hook is not None or
                 cache.w_abort_hook is not None or
-                cache.w_trace_too_long_hook is not None)
+                cache.w_trace_too_long_hook is not None or
+                space.fromcache(WarmupCache).recording or
+                space.fromcache(LoopStatsCache).recording)
 
 
     def on_abort(self, reason, jitdriver, greenkey, greenkey_repr, logops, operations):
@@ -67,6 +71,11 @@ class PyPyJitIface(JitHookInterface):
 
     def _compile_hook(self, debug_info, is_bridge):
         space = self.space
+        if (not is_bridge and space.fromcache(WarmupCache).recording and
+                debug_info.get_jitdriver().name == 'pypyjit'):
+            record_loop(space, debug_info.greenkey)
+        if space.fromcache(LoopStatsCache).recording:
+            add_loop_stats(space, debug_info, is_bridge)
         cache = space.fromcache(Cache)
         if cache.in_recursion:
             return
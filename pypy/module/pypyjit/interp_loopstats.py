@@ -0,0 +1,188 @@
+""" Per-loop accounting of what the JIT spent compiling each loop and
+bridge: the time taken by tracing, by the optimizer and by the backend,
+the size of the machine code and the number of guards.  Once recording
+is enabled, one record is kept for every loop and bridge compiled, until
+they are fetched with get_loop_stats(clear=True).
+"""
+
+import weakref
+
+from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import (TypeDef, GetSetProperty,
+     interp_attrproperty)
+from rpython.rlib.objectmodel import compute_unique_id
+from rpython.rlib.rweakref import dead_ref
+
+
+class LoopStatsCache(object):
+    def __init__(self, space):
+        self.recording = False
+        self.stats_w = []
+
+
+class W_LoopStats(W_Root):
+    """ What the JIT spent compiling one loop or bridge """
+
+    jd_name = ''
+    type = ''
+    loop_no = 0
+    bridge_no = -1
+    greenkey_repr = None
+    tracing_time = 0.0
+    optimize_time = 0.0
+    backend_time = 0.0
+    asmlen = 0
+    guards = 0
+    looptoken_wref = dead_ref
+
+    def __init__(self, debug_info, is_bridge):
+        self.jd_name = debug_info.get_jitdriver().name
+        self.type = debug_info.type
+        self.loop_no = debug_info.looptoken.number
+        if is_bridge:
+            self.bridge_no = compute_unique_id(debug_info.fail_descr)
+        else:
+            self.greenkey_repr = debug_info.get_greenkey_repr()
+        self.tracing_time = debug_info.tracing_time
+        self.optimize_time = debug_info.optimize_time
+        self.backend_time = debug_info.backend_time
+        self.asmlen = 0
+        if debug_info.asminfo is not None:
+            self.asmlen = debug_info.asminfo.asmlen
+        self.guards = 0
+        for op in debug_info.operations:
+            if op.is_guard():
+                self.guards += 1
+        # don't keep the loop alive, the memory manager may want to free it
+        self.looptoken_wref = weakref.ref(debug_info.looptoken)
+
+    def _get_compiled_loop_token(self):
+        looptoken = self.looptoken_wref()
+        if looptoken is None:
+            return None
+        return looptoken.compiled_loop_token
+
+    def descr_get_greenkey(self, space):
+        if self.greenkey_repr is None:
+            return space.w_None
+        return space.newtext(self.greenkey_repr)
+
+    def descr_get_bridge_no(self, space):
+        if self.greenkey_repr is None:
+            return space.newint(self.bridge_no)
+        return space.w_None
+
+    def descr_get_guard_failures(self, space):
+        clt = self._get_compiled_loop_token()
+        if clt is None:
+            return space.w_None
+        return space.newint(clt.guard_failures)
+
+    def descr_get_alive(self, space):
+        return space.newbool(self._get_compiled_loop_token() is not None)
+
+    def descr_repr(self, space):
+        if self.greenkey_repr is None:
+            where = 'bridge no %d of loop %d' % (self.bridge_no, self.loop_no)
+        else:
+            where = self.greenkey_repr
+        return space.newtext('<LoopStats %s %s, %d bytes, %d guards>' %
+                             (self.type, where, self.asmlen, self.guards))
+
+
+@unwrap_spec(jd_name='text', type='text', loop_no=int, bridge_no=int,
+             greenkey='text_or_none', tracing_time=float,
+             optimize_time=float, backend_time=float, asmlen=int, guards=int)
+def descr_new_loop_stats(space, w_subtype, jd_name, type, loop_no, bridge_no,
+                         greenkey, tracing_time, optimize_time, backend_time,
+                         asmlen, guards):
+    w_stats = space.allocate_instance(W_LoopStats, w_subtype)
+    w_stats.jd_name = jd_name
+    w_stats.type = type
+    w_stats.loop_no = loop_no
+    w_stats.bridge_no = bridge_no
+    w_stats.greenkey_repr = greenkey
+    w_stats.tracing_time = tracing_time
+    w_stats.optimize_time = optimize_time
+    w_stats.backend_time = backend_time
+    w_stats.asmlen = asmlen
+    w_stats.guards = guards
+    w_stats.looptoken_wref = dead_ref
+    return w_stats
+
+W_LoopStats.typedef = TypeDef(
+    'LoopStats',
+    __doc__ = W_LoopStats.__doc__,
+    __new__ = interp2app(descr_new_loop_stats),
+    jitdriver_name = interp_attrproperty('jd_name', cls=W_LoopStats,
+                       doc="Name of the JitDriver, pypyjit for the main one",
+                       wrapfn="newtext"),
+    type = interp_attrproperty('type', cls=W_LoopStats,
+                               doc="Loop type", wrapfn="newtext"),
+    loop_no = interp_attrproperty('loop_no', cls=W_LoopStats,
+                                  doc="Number of the loop, or of the loop "
+                                      "the bridge is attached to",
+                                  wrapfn="newint"),
+    bridge_no = GetSetProperty(W_LoopStats.descr_get_bridge_no,
+                               doc="bridge number, or None for a loop"),
+    greenkey = GetSetProperty(W_LoopStats.descr_get_greenkey,
+                              doc="Where the loop starts, or None for a "
+                                  "bridge"),
+    tracing_time = interp_attrproperty('tracing_time', cls=W_LoopStats,
+                                       doc="Seconds spent tracing",
+                                       wrapfn="newfloat"),
+    optimize_time = interp_attrproperty('optimize_time', cls=W_LoopStats,
+                                        doc="Seconds spent optimizing",
+                                        wrapfn="newfloat"),
+    backend_time = interp_attrproperty('backend_time', cls=W_LoopStats,
+                                       doc="Seconds spent generating "
+                                           "machine code",
+                                       wrapfn="newfloat"),
+    asmlen = interp_attrproperty('asmlen', cls=W_LoopStats,
+                                 doc="Length of machine code",
+                                 wrapfn="newint"),
+    guards = interp_attrproperty('guards', cls=W_LoopStats,
+                                 doc="Number of guards", wrapfn="newint"),
+    guard_failures = GetSetProperty(W_LoopStats.descr_get_guard_failures,
+        doc="How many times so far a guard of the loop, or of any of its "
+            "bridges, failed without a bridge to jump to.  None if the "
+            "loop was freed"),
+    alive = GetSetProperty(W_LoopStats.descr_get_alive,
+                           doc="False if the loop was freed since"),
+    __repr__ = interp2app(W_LoopStats.descr_repr),
+)
+W_LoopStats.typedef.acceptable_as_base_class = False
+
+
+def add_loop_stats(space, debug_info, is_bridge):
+    """ Called from the compile hook for every loop and bridge """
+    cache = space.fromcache(LoopStatsCache)
+    cache.stats_w.append(W_LoopStats(debug_info, is_bridge))
+
+
+@unwrap_spec(enabled=bool)
+def record_loop_stats(space, enabled=True):
+    """ record_loop_stats(enabled=True)
+
+    Start (or stop) keeping a LoopStats record for every loop and bridge
+    compiled, to be returned by get_loop_stats().
+    """
+    space.fromcache(LoopStatsCache).recording = enabled
+
+
+@unwrap_spec(clear=bool)
+def get_loop_stats(space, clear=False):
+    """ get_loop_stats(clear=False)
+
+    Return the list of LoopStats records of the loops and bridges compiled
+    since record_loop_stats() was called.  Pass clear=True to also forget
+    them, so that records don't accumulate in a long-running process.
+    """
+    cache = space.fromcache(LoopStatsCache)
+    stats_w = cache.stats_w
+    if clear:
+        cache.stats_w = []
+    else:
+        stats_w = stats_w[:]
+    return space.newlist(stats_w)
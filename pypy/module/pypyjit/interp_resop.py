@@ -397,6 +397,18 @@ def get_stats_asmmemmgr(space):
     m2 = jit_hooks.stats_asmmemmgr_used(None)
     return space.newtuple2(space.newint(m1), space.newint(m2))
 
+def get_stats_memmgr(space):
+    """Returns a tuple (code_size, evicted_loops, evicted_code_size):
+    the size of the machine code of the loops that the JIT keeps alive,
+    and how many loops were freed so far because the 'code_budget'
+    parameter was exceeded, with the size of their machine code."""
+    code_size = jit_hooks.stats_memmgr_code_size(None)
+    evicted_loops = jit_hooks.stats_memmgr_evicted_loops(None)
+    evicted_code_size = jit_hooks.stats_memmgr_evicted_code_size(None)
+    return space.newtuple([space.newint(code_size),
+                           space.newint(evicted_loops),
+                           space.newint(evicted_code_size)])
+
 def enable_debug(space):
     """ Set the jit debugging - completely necessary for some stats to work,
     most notably assembler counters.
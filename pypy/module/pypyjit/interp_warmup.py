@@ -0,0 +1,130 @@
+""" Warm start: remember where loops were compiled in a previous run of the
+program, and ask the JIT to trace them as soon as they are reached again.
+
+Loops are identified by (co_filename, co_name, co_firstlineno, next_instr,
+is_being_profiled), which is stable from one process to the next, as
+opposed to the code objects themselves.  The traces are not kept: they
+contain addresses and constants that are only valid in the process that
+recorded them.
+"""
+
+from rpython.rlib import jit, jit_hooks
+from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.rarithmetic import r_uint
+from rpython.rtyper.annlowlevel import (cast_instance_to_gcref,
+                                       cast_base_ptr_to_instance)
+from rpython.rtyper.lltypesystem import lltype
+from rpython.rtyper.rclass import OBJECT
+
+from pypy.interpreter.error import oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.pycode import PyCode, CodeHookCache
+
+
+class WarmupCache(object):
+    def __init__(self, space):
+        self.recording = False
+        self.recorded = {}
+
+
+class WarmupProfile(object):
+    """ The loops to trace eagerly, by code object """
+
+    def __init__(self):
+        # {(co_filename, co_name, co_firstlineno): [(next_instr, profiled)]}
+        self.entries = {}
+        self.seeded = 0
+
+    def add(self, filename, name, firstlineno, next_instr, is_being_profiled):
+        key = (filename, name, firstlineno)
+        lst = self.entries.get(key, None)
+        if lst is None:
+            lst = self.entries[key] = []
+        lst.append((next_instr, is_being_profiled))
+
+    @jit.dont_look_inside
+    def new_code(self, pycode):
+        key = (pycode.co_filename, pycode.co_name, pycode.co_firstlineno)
+        lst = self.entries.get(key, None)
+        if lst is None:
+            return
+        for next_instr, is_being_profiled in lst:
+            if not 0 <= next_instr < len(pycode.co_code):
+                continue     # the source changed since the profile was made
+            if we_are_translated():
+                jit_hooks.trace_next_iteration('pypyjit', r_uint(next_instr),
+                    int(is_being_profiled), cast_instance_to_gcref(pycode))
+            self.seeded += 1
+
+
+def record_loop(space, greenkey):
+    """ Called from the compile hook for every loop of the 'pypyjit'
+    jitdriver """
+    cache = space.fromcache(WarmupCache)
+    next_instr = greenkey[0].getint()
+    is_being_profiled = greenkey[1].getint() != 0
+    ll_code = lltype.cast_opaque_ptr(lltype.Ptr(OBJECT),
+                                     greenkey[2].getref_base())
+    pycode = cast_base_ptr_to_instance(PyCode, ll_code)
+    key = (pycode.co_filename, pycode.co_name, pycode.co_firstlineno,
+           next_instr, is_being_profiled)
+    cache.recorded[key] = None
+
+
+@unwrap_spec(enabled=bool)
+def record_warmup_profile(space, enabled=True):
+    """ record_warmup_profile(enabled=True)
+
+    Start (or stop) remembering where loops are compiled, so that
+    get_warmup_profile() can return them.
+    """
+    space.fromcache(WarmupCache).recording = enabled
+
+
+def get_warmup_profile(space):
+    """ Return the loops compiled since record_warmup_profile() was
+    called, as a list of (co_filename, co_name, co_firstlineno, next_instr,
+    is_being_profiled) tuples.
+    """
+    cache = space.fromcache(WarmupCache)
+    result_w = []
+    for key in cache.recorded:
+        filename, name, firstlineno, next_instr, is_being_profiled = key
+        result_w.append(space.newtuple([space.newtext(filename),
+                                        space.newtext(name),
+                                        space.newint(firstlineno),
+                                        space.newint(next_instr),
+                                        space.newbool(is_being_profiled)]))
+    return space.newlist(result_w)
+
+
+def set_warmup_profile(space, w_entries):
+    """ set_warmup_profile(entries)
+
+    Take a list in the format returned by get_warmup_profile(), usually
+    from a previous run of the same program.  From now on, when a code
+    object matching one of the entries is created, the JIT is told to
+    trace that loop the next time it is reached instead of waiting for
+    its counter to reach the threshold.  Code objects that already exist
+    are not affected.  Pass None to stop.  Returns the number of loops
+    seeded so far by the previous profile.
+    """
+    hookcache = space.fromcache(CodeHookCache)
+    old = hookcache._warmup_profile
+    if space.is_none(w_entries):
+        profile = None
+    else:
+        profile = WarmupProfile()
+        for w_entry in space.listview(w_entries):
+            items_w = space.fixedview(w_entry)
+            if len(items_w) != 5:
+                raise oefmt(space.w_ValueError,
+                            "expected tuples of length 5, got %d items",
+                            len(items_w))
+            profile.add(space.text_w(items_w[0]), space.text_w(items_w[1]),
+                        space.int_w(items_w[2]), space.int_w(items_w[3]),
+                        space.is_true(items_w[4]))
+    hookcache._warmup_profile = profile
+    if old is None:
+        return space.newint(0)
+    return space.newint(old.seeded)
@@ -2,6 +2,7 @@ from pypy.interpreter.mixedmodule import MixedModule
 
 class Module(MixedModule):
     appleveldefs = {
+        'warm_start': 'app_warmup.warm_start',
     }
 
     interpleveldefs = {
@@ -14,11 +15,18 @@ class Module(MixedModule):
         'trace_next_iteration': 'interp_jit.trace_next_iteration',
         'trace_next_iteration_hash': 'interp_jit.trace_next_iteration_hash',
         'releaseall': 'interp_jit.releaseall',
+        'record_warmup_profile': 'interp_warmup.record_warmup_profile',
+        'get_warmup_profile': 'interp_warmup.get_warmup_profile',
+        'set_warmup_profile': 'interp_warmup.set_warmup_profile',
+        'record_loop_stats': 'interp_loopstats.record_loop_stats',
+        'get_loop_stats': 'interp_loopstats.get_loop_stats',
+        'LoopStats': 'interp_loopstats.W_LoopStats',
         'set_compile_hook': 'interp_resop.set_compile_hook',
         'set_abort_hook': 'interp_resop.set_abort_hook',
         'set_trace_too_long_hook': 'interp_resop.set_trace_too_long_hook',
         'get_stats_snapshot': 'interp_resop.get_stats_snapshot',
         'get_stats_asmmemmgr': 'interp_resop.get_stats_asmmemmgr',
+        'get_stats_memmgr': 'interp_resop.get_stats_memmgr',
         # those things are disabled because they have bugs, but if
         # they're found to be useful, fix test_ztranslation_jit_stats
         # in the backend first. get_stats_snapshot still produces
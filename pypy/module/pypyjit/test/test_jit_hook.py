@@ -83,13 +83,19 @@ class AppTestJitHook(object):
         oplist[-1].setdescr(FailDescr())
         oplist[-2].setdescr(FailDescr())
 
+        class CompiledLoopToken(object):
+            guard_failures = 3
+
         token = JitCellToken()
         token.number = 0
+        token.compiled_loop_token = CompiledLoopToken()
         di_loop = JitDebugInfo(MockJitDriverSD, logger, token, oplist, 'loop',
                    greenkey)
         di_loop_optimize = JitDebugInfo(MockJitDriverSD, logger, JitCellToken(),
                                         oplist, 'loop', greenkey)
         di_loop.asminfo = AsmInfo(offset, 0x42, 12)
+        di_loop.tracing_time = 0.5
+        di_loop.backend_time = 0.25
         di_bridge = JitDebugInfo(MockJitDriverSD, logger, JitCellToken(),
                                  oplist, 'bridge', fail_descr=FailDescr())
         di_bridge.asminfo = AsmInfo(offset, 0, 0)
@@ -269,6 +275,71 @@ class AppTestJitHook(object):
         raises(AttributeError, 'op.pycode')
         assert op.call_depth == 5
 
+    def test_warmup_profile(self):
+        import pypyjit
+        pypyjit.record_warmup_profile()
+        try:
+            self.on_compile()
+            self.on_compile_bridge()
+        finally:
+            pypyjit.record_warmup_profile(False)
+        self.on_compile()
+        code = self.f.func_code
+        assert pypyjit.get_warmup_profile() == [
+            (code.co_filename, 'function', code.co_firstlineno, 0, False)]
+
+        profile = [('<warmup>', 'g', 1, 3, False),
+                   ('<warmup>', 'g', 1, 10000, False),
+                   ('<warmup>', 'h', 1, 3, False)]
+        assert pypyjit.set_warmup_profile(profile) == 0
+        exec compile("def g():\n    pass\n", '<warmup>', 'exec')
+        assert pypyjit.set_warmup_profile(None) == 1
+        raises(ValueError, pypyjit.set_warmup_profile, [('<warmup>', 'g')])
+
+    def test_loop_stats(self):
+        import pypyjit
+        pypyjit.record_loop_stats()
+        try:
+            self.on_compile()
+            self.on_compile_bridge()
+        finally:
+            pypyjit.record_loop_stats(False)
+        self.on_compile()
+        loop, bridge = pypyjit.get_loop_stats()
+        assert isinstance(loop, pypyjit.LoopStats)
+        assert loop.jitdriver_name == 'pypyjit'
+        assert loop.type == 'loop'
+        assert loop.loop_no == 0
+        assert loop.greenkey == 'function'
+        assert loop.bridge_no is None
+        assert loop.tracing_time == 0.5
+        assert loop.optimize_time == 0.0
+        assert loop.backend_time == 0.25
+        assert loop.asmlen == 12
+        assert loop.guards == 2
+        assert loop.guard_failures == 3
+        assert loop.alive
+        assert bridge.type == 'bridge'
+        assert bridge.greenkey is None
+        assert isinstance(bridge.bridge_no, int)
+        assert bridge.guard_failures is None
+        assert not bridge.alive
+        assert len(pypyjit.get_loop_stats(clear=True)) == 2
+        assert pypyjit.get_loop_stats() == []
+
+    def test_loop_stats_new(self):
+        import pypyjit
+        stats = pypyjit.LoopStats('pypyjit', 'bridge', 3, 17, None,
+                                  0.5, 0.25, 0.125, 40, 5)
+        assert stats.bridge_no == 17
+        assert stats.greenkey is None
+        assert stats.backend_time == 0.125
+        assert stats.guards == 5
+        assert stats.guard_failures is None
+        assert not stats.alive
+        assert repr(stats) == ('<LoopStats bridge bridge no 17 of loop 3, '
+                               '40 bytes, 5 guards>')
+
     def test_get_stats_snapshot(self):
         skip("a bit no idea how to test it")
         from pypyjit import get_stats_snapshot
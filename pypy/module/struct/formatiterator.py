@@ -202,3 +202,129 @@ class UnpackFormatIterator(FormatIterator):
 
     def skip(self, size):
         self.read(size) # XXX, could avoid taking the slice
+
+
+class Column(object):
+    """The values of one field of all the records, unwrapped as long as
+    they are all ints, all floats or all strings."""
+
+    def __init__(self):
+        self.ints = []
+        self.floats = []
+        self.strs = []
+        self.items_w = None     # once values of mixed kinds were added
+
+    def append_int(self, space, value):
+        if self.items_w is None and not self.floats and not self.strs:
+            self.ints.append(value)
+        else:
+            self.append_w(space, space.newint(value))
+
+    def append_float(self, space, value):
+        if self.items_w is None and not self.ints and not self.strs:
+            self.floats.append(value)
+        else:
+            self.append_w(space, space.newfloat(value))
+
+    def append_str(self, space, value):
+        if self.items_w is None and not self.ints and not self.floats:
+            self.strs.append(value)
+        else:
+            self.append_w(space, space.newbytes(value))
+
+    def append_w(self, space, w_value):
+        if self.items_w is None:
+            items_w = [space.newint(i) for i in self.ints]
+            items_w += [space.newfloat(f) for f in self.floats]
+            items_w += [space.newbytes(s) for s in self.strs]
+            self.items_w = items_w
+            self.ints = []
+            self.floats = []
+            self.strs = []
+        self.items_w.append(w_value)
+
+    def wrap(self, space):
+        if self.items_w is not None:
+            return space.newlist(self.items_w)
+        if self.floats:
+            return space.newlist_float(self.floats)
+        if self.strs:
+            return space.newlist_bytes(self.strs)
+        return space.newlist_int(self.ints)
+
+
+class ColumnUnpackFormatIterator(UnpackFormatIterator):
+    """Unpacks 'count' records of 'recsize' bytes one field at a time: the
+    format is interpreted only once, and operate() loops over the records
+    for each field, appending the values to one Column per field."""
+
+    def __init__(self, space, buf, recsize, count):
+        UnpackFormatIterator.__init__(self, space, buf)
+        self.recsize = recsize
+        self.count = count
+        self.fieldpos = 0       # offset of the current field in a record
+        self.columns = []
+        self.column = None
+
+    @jit.unroll_safe
+    @specialize.arg(1)
+    def operate(self, fmtdesc, repetitions):
+        if fmtdesc.needcount:
+            self.unpack_field(fmtdesc, repetitions)
+        else:
+            for i in range(repetitions):
+                self.unpack_field(fmtdesc, 1)
+    _operate_is_specialized_ = True
+
+    @specialize.arg(1)
+    def unpack_field(self, fmtdesc, count):
+        offset = self.fieldpos
+        if fmtdesc.fmtchar != 'x':
+            self.column = Column()
+            self.columns.append(self.column)
+            for i in range(self.count):
+                self.pos = i * self.recsize + offset
+                if fmtdesc.needcount:
+                    fmtdesc.unpack(self, count)
+                else:
+                    fmtdesc.unpack(self)
+        self.fieldpos = offset + fmtdesc.size * count
+
+    def align(self, mask):
+        self.fieldpos = (self.fieldpos + mask) & ~mask
+
+    def finished(self):
+        assert self.fieldpos == self.recsize
+
+    @specialize.argtype(1)
+    def appendobj(self, value):
+        space = self.space
+        is_unsigned = (isinstance(value, r_uint) or
+                       isinstance(value, r_ulonglong))
+        if is_unsigned:
+            if value <= maxint:
+                self.column.append_int(space, intmask(value))
+            else:
+                self.column.append_w(space, space.newint(value))
+        elif isinstance(value, r_longlong):
+            if value == r_longlong(intmask(value)):
+                self.column.append_int(space, intmask(value))
+            else:
+                self.column.append_w(space, space.newint(value))
+        elif isinstance(value, bool):
+            self.column.append_w(space, space.newbool(value))
+        elif isinstance(value, int):
+            self.column.append_int(space, value)
+        elif isinstance(value, float):
+            self.column.append_float(space, value)
+        elif isinstance(value, str):
+            self.column.append_str(space, value)
+        elif isinstance(value, unicode):
+            self.column.append_w(space, space.newutf8(value.decode('utf-8'),
+                                                      len(value)))
+        else:
+            assert 0, "unreachable"
+
+    def append_utf8(self, value):
+        w_ch = self.space.newutf8(rutf8.unichr_as_utf8(r_uint(value)), 1)
+        self.column.append_w(self.space, w_ch)
@@ -10,7 +10,7 @@ from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter.typedef import TypeDef, interp_attrproperty
 from pypy.interpreter.typedef import make_weakref_descr
 from pypy.module.struct.formatiterator import (
-    PackFormatIterator, UnpackFormatIterator
+    PackFormatIterator, UnpackFormatIterator, ColumnUnpackFormatIterator
 )
 
 
@@ -119,6 +119,83 @@ fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
     return _unpack(space, format, buf)
 
 
+def _get_record_count(space, size, buf, funcname):
+    if size == 0:
+        raise oefmt(get_error(space),
+                    "cannot iteratively unpack with a struct of length 0")
+    length = buf.getlength()
+    if length % size != 0:
+        raise oefmt(get_error(space),
+                    "%s requires a buffer whose length is a multiple of %d",
+                    funcname, size)
+    return length // size
+
+
+class W_UnpackIter(W_Root):
+    def __init__(self, space, format, size, buf):
+        self.format = format
+        self.size = size
+        self.buf = buf
+        self.index = 0
+        self.count = _get_record_count(space, size, buf, "iter_unpack")
+
+    def descr_iter(self, space):
+        return self
+
+    def descr_next(self, space):
+        buf = self.buf
+        if buf is None:
+            raise OperationError(space.w_StopIteration, space.w_None)
+        if self.index >= self.count:
+            self.buf = None
+            raise OperationError(space.w_StopIteration, space.w_None)
+        size = self.size
+        buf = SubBuffer(buf, self.index * size, size)
+        self.index += 1
+        return _unpack(space, jit.promote_string(self.format), buf)
+
+    def descr_length_hint(self, space):
+        if self.buf is None:
+            return space.newint(0)
+        return space.newint(self.count - self.index)
+
+W_UnpackIter.typedef = TypeDef("unpack_iterator",
+    __iter__=interp2app(W_UnpackIter.descr_iter),
+    next=interp2app(W_UnpackIter.descr_next),
+    __length_hint__=interp2app(W_UnpackIter.descr_length_hint),
+)
+W_UnpackIter.typedef.acceptable_as_base_class = False
+
+
+@unwrap_spec(format='text')
+def iter_unpack(space, format, w_buffer):
+    """Return an iterator yielding tuples unpacked from the buffer according
+to fmt, one record of calcsize(fmt) bytes after the other.  The length of
+the buffer must be a multiple of calcsize(fmt)."""
+    size = _calcsize(space, format)
+    buf = space.getarg_w('s*', w_buffer)
+    return W_UnpackIter(space, format, size, buf)
+
+
+@unwrap_spec(format='text')
+def unpack_array(space, format, w_buffer):
+    """Unpack all the records of calcsize(fmt) bytes in the buffer according
+to fmt, and return one list per field instead of one tuple per record.
+The lists of integers, floats and strings are stored without boxing
+their items."""
+    size = _calcsize(space, format)
+    buf = space.getarg_w('s*', w_buffer)
+    count = _get_record_count(space, size, buf, "unpack_array")
+    fmtiter = ColumnUnpackFormatIterator(space, buf, size, count)
+    try:
+        fmtiter.interpret(format)
+    except StructOverflowError as e:
+        raise OperationError(space.w_OverflowError, space.newtext(e.msg))
+    except StructError as e:
+        raise OperationError(get_error(space), space.newtext(e.msg))
+    return space.newlist([column.wrap(space) for column in fmtiter.columns])
+
+
 class W_Struct(W_Root):
     _immutable_fields_ = ["format", "size"]
 
@@ -147,6 +224,13 @@ class W_Struct(W_Root):
     def descr_unpack_from(self, space, w_buffer, offset=0):
         return unpack_from(space, jit.promote_string(self.format), w_buffer, offset)
 
+    def descr_iter_unpack(self, space, w_buffer):
+        buf = space.getarg_w('s*', w_buffer)
+        return W_UnpackIter(space, self.format, self.size, buf)
+
+    def descr_unpack_array(self, space, w_buffer):
+        return unpack_array(space, self.format, w_buffer)
+
 W_Struct.typedef = TypeDef("Struct",
     __new__=interp2app(W_Struct.descr__new__.im_func),
     __init__=interp2app(W_Struct.descr__init__),
@@ -157,6 +241,8 @@ W_Struct.typedef = TypeDef("Struct",
     unpack=interp2app(W_Struct.descr_unpack),
     pack_into=interp2app(W_Struct.descr_pack_into),
     unpack_from=interp2app(W_Struct.descr_unpack_from),
+    iter_unpack=interp2app(W_Struct.descr_iter_unpack),
+    unpack_array=interp2app(W_Struct.descr_unpack_array),
     __weakref__=make_weakref_descr(W_Struct),
 )
 
@@ -6,7 +6,7 @@ from rpython.rlib.rstruct.nativefmttable import native_is_bigendian
 
 
 class AppTestStruct(object):
-    spaceconfig = dict(usemodules=['struct', 'array'])
+    spaceconfig = dict(usemodules=['struct', 'array', '__pypy__'])
 
     def setup_class(cls):
         """
@@ -462,6 +462,52 @@ class AppTestStruct(object):
         assert val == sys.maxint+1
         assert type(val) is long
 
+    def test_iter_unpack(self):
+        import array
+        data = self.struct.pack('<hdh', 1, 2.5, 3) + \
+               self.struct.pack('<hdh', 4, 5.5, 6)
+        it = self.struct.iter_unpack('<hdh', data)
+        assert iter(it) is it
+        assert it.__length_hint__() == 2
+        assert list(it) == [(1, 2.5, 3), (4, 5.5, 6)]
+        assert it.__length_hint__() == 0
+        raises(StopIteration, next, it)
+        s = self.struct.Struct('<hdh')
+        assert list(s.iter_unpack(buffer(data))) == [(1, 2.5, 3), (4, 5.5, 6)]
+        assert list(s.iter_unpack(array.array('c', data))) == [
+            (1, 2.5, 3), (4, 5.5, 6)]
+        assert list(s.iter_unpack('')) == []
+        raises(self.struct.error, self.struct.iter_unpack, '<hdh', data[:-1])
+        raises(self.struct.error, self.struct.iter_unpack, '', '')
+
+    def test_unpack_array(self):
+        import sys
+        records = [(1, 2.5, 'ab', True, sys.maxint + 1),
+                   (-3, 4.0, 'cd', False, 5)]
+        fmt = '<i d 2s x ? Q'
+        data = ''.join([self.struct.pack(fmt, *r) for r in records])
+        columns = self.struct.unpack_array(fmt, data)
+        assert columns == [list(column) for column in zip(*records)]
+        assert type(columns[4][0]) is long
+        assert type(columns[4][1]) is int
+        assert self.struct.Struct(fmt).unpack_array(buffer(data)) == columns
+        assert self.struct.unpack_array(fmt, '') == [[], [], [], [], []]
+        assert self.struct.unpack_array('2h', '\x01\x00\x02\x00' * 3) == [
+            [1, 1, 1], [2, 2, 2]]
+        raises(self.struct.error, self.struct.unpack_array, fmt, data + 'x')
+        raises(self.struct.error, self.struct.unpack_array, '0p', 'x')
+
+    def test_unpack_array_strategies(self):
+        import __pypy__
+        data = self.struct.pack('=ids', 1, 2.5, 'x') * 3
+        ints, floats, strs = self.struct.unpack_array('=ids', data)
+        assert ints == [1, 1, 1]
+        assert floats == [2.5, 2.5, 2.5]
+        assert strs == ['x', 'x', 'x']
+        assert __pypy__.strategy(ints) == "IntegerListStrategy"
+        assert __pypy__.strategy(floats) == "FloatListStrategy"
+        assert __pypy__.strategy(strs) == "BytesListStrategy"
+
     def test_bpo35714(self):
         # why not "bad char in struct format"??
         for s in '\0', '2\0i', b'\0':
@@ -115,6 +115,10 @@ W_ZipCache.typedef = TypeDef(
 zip_cache = W_ZipCache()
 
 class W_ZipImporter(W_Root):
+    # the size and mtime of the archive when zip_file was read
+    archive_size = -1
+    archive_mtime = 0.0
+
     def __init__(self, space, name, filename, zip_file, prefix):
         self.space = space
         self.name = name
@@ -122,6 +126,13 @@ class W_ZipImporter(W_Root):
         self.zip_file = zip_file
         self.prefix = prefix
 
+    def reusable_zip_file(self, size, mtime):
+        """Return zip_file if the archive did not change since it was read,
+        or None."""
+        if size == self.archive_size and mtime == self.archive_mtime:
+            return self.zip_file
+        return None
+
     def getprefix(self, space):
         if ZIPSEP == os.path.sep:
             return space.newtext(self.prefix)
@@ -245,10 +256,14 @@ class W_ZipImporter(W_Root):
     @unwrap_spec(fullname='text')
     def load_module(self, space, fullname):
         filename = self.make_filename(fullname)
+        try:
+            self.zip_file.check_truncated()
+        except (OSError, BadZipfile):
+            raise oefmt(get_error(space), "can't find module '%s'", fullname)
         for compiled, is_package, ext in ENUMERATE_EXTS:
             fname = filename + ext
             try:
-                buf = self.zip_file.read(fname)
+                buf = self.zip_file.read(fname, check_truncated=False)
             except (KeyError, OSError, BadZipfile):
                 pass
             except RZlibError as e:
@@ -368,6 +383,8 @@ def descr_new_zipimporter(space, w_type, name):
                     if name[i] == os.path.sep or name[i] == ZIPSEP]
     parts_ends.append(len(name))
     filename = "" # make annotator happy
+    archive_size = -1
+    archive_mtime = 0.0
     for i in parts_ends:
         filename = name[:i]
         if not filename:
@@ -377,6 +394,8 @@ def descr_new_zipimporter(space, w_type, name):
         except OSError:
             raise oefmt(get_error(space), "Cannot find name %s", filename)
         if not stat.S_ISDIR(s.st_mode):
+            archive_size = s.st_size
+            archive_mtime = s.st_mtime
             ok = True
             break
     if not ok:
@@ -390,14 +409,26 @@ def descr_new_zipimporter(space, w_type, name):
                         "already tried and failed", name)
     except KeyError:
         zip_cache.cache[filename] = None
-    try:
-        zip_file = RZipFile(filename, 'r')
-    except (BadZipfile, OSError):
-        raise oefmt(get_error(space), "%s seems not to be a zipfile", filename)
-    except RZlibError as e:
-        # in this case, CPython raises the direct exception coming
-        # from the zlib module: let's do the same
-        raise zlib_error(space, e.msg)
+        w_result = None
+    # importers of the same archive, with different prefixes, share the
+    # directory and the mapping of the archive
+    zip_file = None
+    if isinstance(w_result, W_ZipImporter):
+        zip_file = w_result.reusable_zip_file(archive_size, archive_mtime)
+        if zip_file is None:
+            # the archive changed: release the mapping of the old one.
+            # Importers still using it fall back to opening the file
+            w_result.zip_file.close()
+    if zip_file is None:
+        try:
+            zip_file = RZipFile(filename, 'r', use_mmap=True)
+        except (BadZipfile, OSError):
+            raise oefmt(get_error(space), "%s seems not to be a zipfile",
+                        filename)
+        except RZlibError as e:
+            # in this case, CPython raises the direct exception coming
+            # from the zlib module: let's do the same
+            raise zlib_error(space, e.msg)
 
     prefix = name[len(filename):]
     if prefix.startswith(os.path.sep) or prefix.startswith(ZIPSEP):
@@ -405,6 +436,8 @@ def descr_new_zipimporter(space, w_type, name):
     if prefix and not prefix.endswith(ZIPSEP) and not prefix.endswith(os.path.sep):
         prefix += ZIPSEP
     w_result = W_ZipImporter(space, name, filename, zip_file, prefix)
+    w_result.archive_size = archive_size
+    w_result.archive_mtime = archive_mtime
     zip_cache.set(filename, w_result)
     return w_result
 
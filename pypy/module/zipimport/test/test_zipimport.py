@@ -137,6 +137,23 @@ class AppTestZipimport:
         assert main_importer is not sub_importer
         assert main_importer.prefix == ""
         assert sub_importer.prefix == "sub" + os.path.sep
+        assert sub_importer.get_data('sub/yy.py') == ''
+        assert main_importer.get_data('x.py') == ''
+
+    def test_cache_archive_changed(self):
+        import os
+        self.writefile('x.py', 'y')
+        from zipimport import zipimporter
+        importer = zipimporter(self.zipfile)
+        assert importer.find_module('z') is None
+        self.writefile('z.py', 'z = 42')
+        os.utime(self.zipfile, (self.now + 10, self.now + 10))
+        old_importer = importer
+        importer = zipimporter(self.zipfile)
+        assert importer.find_module('z') is importer
+        assert importer.get_data('z.py') == 'z = 42'
+        # the old importer lost its mapping, but can still read the file
+        assert old_importer.get_data('x.py') == 'y'
 
     def test_good_bad_arguments(self):
         from zipimport import zipimporter
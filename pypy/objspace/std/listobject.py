@@ -290,9 +290,9 @@ class W_ListObject(W_Root):
         cpy_strategy = self.space.fromcache(CPyListStrategy)
         if self.strategy is cpy_strategy:
             return
-        lst = self.getitems()
+        storage = CPyListStorage.from_list(space, self)
         self.strategy = cpy_strategy
-        self.lstorage = cpy_strategy.erase(CPyListStorage(space, lst))
+        self.lstorage = cpy_strategy.erase(storage)
 
     # ___________________________________________________
 
@@ -1145,7 +1145,8 @@ class EmptyListStrategy(ListStrategy):
     def _extend_from_iterable(self, w_list, w_iterable):
         space = self.space
         if (isinstance(w_iterable, W_AbstractTupleObject)
-                and space._uses_tuple_iter(w_iterable)):
+                and space._uses_tuple_iter(w_iterable)
+                and not w_iterable.has_numeric_storage()):
             w_list.__init__(space, w_iterable.getitems_copy())
             return
 
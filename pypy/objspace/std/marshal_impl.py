@@ -346,7 +346,7 @@ def marshal_pycode(space, w_pycode, m):
     m.put_int(x.co_stacksize)
     m.put_int(x.co_flags)
     m.atom_str(TYPE_STRING, x.co_code)
-    m.put_tuple_w(TYPE_TUPLE, x.co_consts_w)
+    m.put_tuple_w(TYPE_TUPLE, x.getconsts_w())
     m.put_tuple_w(TYPE_TUPLE, x.co_names_w)
     _put_interned_str_list(space, m, x.co_varnames)
     _put_interned_str_list(space, m, x.co_freevars)
@@ -395,6 +395,51 @@ def unmarshal_pycode(space, u, tc):
                   name, firstlineno, lnotab, freevars, cellvars)
 
 
+def skip_object(space, u):
+    """Move past the next object without building it, for the lazy code
+    objects.  Returns its type code.  The interned strings are still
+    recorded, because what follows may refer to them."""
+    tc = u.get1()
+    if tc == TYPE_INT or tc == TYPE_STRINGREF:
+        u.skip(4)
+    elif tc == TYPE_INT64 or tc == TYPE_BINARY_FLOAT:
+        u.skip(8)
+    elif tc == TYPE_BINARY_COMPLEX:
+        u.skip(16)
+    elif tc == TYPE_FLOAT:
+        u.skip(ord(u.get1()))
+    elif tc == TYPE_COMPLEX:
+        u.skip(ord(u.get1()))
+        u.skip(ord(u.get1()))
+    elif tc == TYPE_LONG:
+        lng = u.get_int()
+        if lng < 0:
+            lng = -lng
+        u.skip(lng * 2)
+    elif tc == TYPE_STRING or tc == TYPE_UNICODE:
+        u.skip(u.get_lng())
+    elif tc == TYPE_INTERNED:
+        unmarshal_interned(space, u, tc)
+    elif (tc == TYPE_TUPLE or tc == TYPE_LIST or tc == TYPE_SET or
+          tc == TYPE_FROZENSET):
+        for i in range(u.get_lng()):
+            skip_object(space, u)
+    elif tc == TYPE_DICT:
+        while skip_object(space, u) != TYPE_NULL:
+            skip_object(space, u)
+    elif tc == TYPE_CODE:
+        u.skip(16)      # argcount, nlocals, stacksize, flags
+        # code, consts, names, varnames, freevars, cellvars, filename, name
+        for i in range(8):
+            skip_object(space, u)
+        u.skip(4)       # firstlineno
+        skip_object(space, u)   # lnotab
+    elif not (tc == TYPE_NULL or tc == TYPE_NONE or tc == TYPE_FALSE or
+              tc == TYPE_TRUE or tc == TYPE_STOPITER or tc == TYPE_ELLIPSIS):
+        u.raise_exc("bad marshal data (unknown type code)")
+    return tc
+
+
 @marshaller(W_UnicodeObject)
 def marshal_unicode(space, w_unicode, m):
     s = space.utf8_w(w_unicode)
@@ -2,7 +2,8 @@ from pypy.interpreter.error import oefmt
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.util import negate
 from rpython.rlib import jit
-from rpython.rlib.objectmodel import specialize
+from rpython.rlib.debug import make_sure_not_resized
+from rpython.rlib.objectmodel import specialize, compute_hash
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.unroll import unrolling_iterable
 from rpython.tool.sourcetools import func_with_new_name
@@ -151,10 +152,219 @@ Cls_ii = make_specialised_class((int, int))
 Cls_oo = make_specialised_class((object, object))
 Cls_ff = make_specialised_class((float, float))
 
+# ---------- homogeneous tuples of any length ----------
+# Tuples whose items are all exactly ints, all exactly floats or all
+# exactly strs store the unwrapped values in a fixed-size RPython list,
+# instead of a list of W_IntObject/W_FloatObject/W_BytesObject.  Hashing,
+# comparison and slicing work on the unwrapped storage directly.
+
+def _wrap_int(x):
+    from pypy.objspace.std.intobject import W_IntObject
+    return W_IntObject(x)
+
+def _wrap_float(x):
+    from pypy.objspace.std.floatobject import W_FloatObject
+    return W_FloatObject(x)
+
+def _wrap_bytes(x):
+    from pypy.objspace.std.bytesobject import W_BytesObject
+    return W_BytesObject(x)
+
+def _hash_item_int(space, x):
+    from pypy.objspace.std.intobject import _hash_int
+    return _hash_int(x)
+
+def _hash_item_float(space, x):
+    from pypy.objspace.std.floatobject import _hash_float
+    return _hash_float(space, x)
+
+def _hash_item_bytes(space, x):
+    x = compute_hash(x)
+    x -= (x == -1)
+    return x
+
+def _eq_item_float(x, y):
+    # NaNs are equal here if they are the same NaN, like in
+    # W_SpecialisedTupleObject_ff
+    return x == y or float2longlong(x) == float2longlong(y)
+
+@specialize.argtype(0)
+def _eq_item(x, y):
+    return x == y
+
+
+def make_homogeneous_class(typ):
+    if typ == int:
+        wrap, hash_item, eq_item = _wrap_int, _hash_item_int, _eq_item
+    elif typ == float:
+        wrap, hash_item, eq_item = _wrap_float, _hash_item_float, _eq_item_float
+    elif typ == str:
+        wrap, hash_item, eq_item = _wrap_bytes, _hash_item_bytes, _eq_item
+    else:
+        assert 0
+
+    def _unroll_condition_cmp(self, space, w_other):
+        return self._unroll_condition() or w_other._unroll_condition()
+
+    class cls(W_AbstractTupleObject):
+        _immutable_fields_ = ['storage[*]']
+
+        def __init__(self, storage):
+            make_sure_not_resized(storage)
+            self.storage = storage
+
+        def length(self):
+            return len(self.storage)
+
+        @jit.look_inside_iff(lambda self: self._unroll_condition())
+        def tolist(self):
+            storage = self.storage
+            list_w = [None] * len(storage)
+            for i in range(len(storage)):
+                list_w[i] = wrap(storage[i])
+            return list_w
+
+        # same source code, but builds and returns a resizable list
+        getitems_copy = func_with_new_name(tolist, 'getitems_copy')
+
+        def getitem(self, space, index):
+            try:
+                return wrap(self.storage[index])
+            except IndexError:
+                raise oefmt(space.w_IndexError, "tuple index out of range")
+
+        def descr_hash(self, space):
+            return space.newint(self._descr_hash(space))
+
+        @jit.look_inside_iff(lambda self, space: self._unroll_condition())
+        def _descr_hash(self, space):
+            mult = 1000003
+            x = 0x345678
+            z = len(self.storage)
+            for value in self.storage:
+                y = hash_item(space, value)
+                x = (x ^ y) * mult
+                z -= 1
+                mult += 82520 + z + z
+            x += 97531
+            return intmask(x)
+
+        def descr_eq(self, space, w_other):
+            if not isinstance(w_other, W_AbstractTupleObject):
+                return space.w_NotImplemented
+            if isinstance(w_other, cls):
+                return space.newbool(self._eq_same_class(space, w_other))
+            return self._eq_generic(space, w_other)
+
+        @jit.look_inside_iff(_unroll_condition_cmp)
+        def _eq_same_class(self, space, w_other):
+            storage1 = self.storage
+            storage2 = w_other.storage
+            if len(storage1) != len(storage2):
+                return False
+            for i in range(len(storage1)):
+                if not eq_item(storage1[i], storage2[i]):
+                    return False
+            return True
+
+        @jit.look_inside_iff(_unroll_condition_cmp)
+        def _eq_generic(self, space, w_other):
+            items2 = w_other.tolist()
+            if len(self.storage) != len(items2):
+                return space.w_False
+            for i in range(len(items2)):
+                if not space.eq_w(wrap(self.storage[i]), items2[i]):
+                    return space.w_False
+            return space.w_True
+
+        descr_ne = negate(descr_eq)
+
+        def _getslice(self, space, w_index):
+            length = len(self.storage)
+            start, stop, step, slicelength = w_index.indices4(space, length)
+            assert slicelength >= 0
+            if step == 1:
+                assert start >= 0
+                return _from_storage(space, self.storage[start:start +
+                                                         slicelength])
+            subitems = [self.storage[0]] * slicelength
+            for i in range(slicelength):
+                subitems[i] = self.storage[start]
+                start += step
+            return _from_storage(space, subitems)
+
+        def _getslice_simple(self, space, start, stop):
+            return _from_storage(space, self.storage[start:stop])
+
+        def has_numeric_storage(self):
+            return typ is not str
+
+        if typ is int:
+            def unpackiterable_int(self, space):
+                if space._uses_tuple_iter(self):
+                    return self.storage[:]
+                return None
+        elif typ is float:
+            def unpackiterable_float(self, space):
+                if space._uses_tuple_iter(self):
+                    return self.storage[:]
+                return None
+
+        def _unroll_condition(self):
+            return jit.loop_unrolling_heuristic(
+                    self.storage, len(self.storage), UNROLL_CUTOFF)
+
+    def _from_storage(space, storage):
+        # keep the invariant that tuples of length 2 use the
+        # W_SpecialisedTupleObject_* classes, and the empty tuple
+        # is a plain W_TupleObject
+        if len(storage) == 0:
+            from pypy.objspace.std.tupleobject import W_TupleObject
+            return W_TupleObject([])
+        if len(storage) == 2:
+            return makespecialisedtuple2(space, wrap(storage[0]),
+                                                wrap(storage[1]))
+        return cls(storage[:])
+
+    cls.__name__ = 'W_HomogeneousTupleObject_' + typ.__name__[0]
+    _specialisations.append(cls)
+    return cls
+
+Cls_i = make_homogeneous_class(int)
+Cls_f = make_homogeneous_class(float)
+Cls_s = make_homogeneous_class(str)
+
+@specialize.arg(1)
+@jit.look_inside_iff(lambda list_w, W_Type: jit.loop_unrolling_heuristic(
+        list_w, len(list_w), UNROLL_CUTOFF))
+def _all_of_type(list_w, W_Type):
+    for w_item in list_w:
+        if type(w_item) is not W_Type:
+            return False
+    return True
+
+def makehomogeneoustuple(space, list_w):
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    from pypy.objspace.std.bytesobject import W_BytesObject
+    w_first = list_w[0]
+    if type(w_first) is W_IntObject:
+        if _all_of_type(list_w, W_IntObject):
+            return Cls_i([space.int_w(w_item) for w_item in list_w])
+    elif type(w_first) is W_FloatObject:
+        if _all_of_type(list_w, W_FloatObject):
+            return Cls_f([space.float_w(w_item) for w_item in list_w])
+    elif type(w_first) is W_BytesObject:
+        if _all_of_type(list_w, W_BytesObject):
+            return Cls_s([space.bytes_w(w_item) for w_item in list_w])
+    raise NotSpecialised
+
 def makespecialisedtuple(space, list_w):
     if len(list_w) == 2:
         w_arg1, w_arg2 = list_w
         return makespecialisedtuple2(space, w_arg1, w_arg2)
+    elif len(list_w) > 0:
+        return makehomogeneoustuple(space, list_w)
     else:
         raise NotSpecialised
 
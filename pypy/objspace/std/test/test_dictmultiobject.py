@@ -156,6 +156,18 @@ class TestW_DictObject(object):
         w_d.initialize_content([(w(1), w("a")), (w(2), w("b"))])
         assert self.space.listview_int(w_d) == [1, 2]
 
+    def test_listview_float_dict(self):
+        w = self.space.wrap
+        w_d = self.space.newdict()
+        w_d.initialize_content([(w(1.5), w("a")), (w(2.5), w("b"))])
+        assert self.space.listview_float(w_d) == [1.5, 2.5]
+
+    def test_listview_int_float_dict(self):
+        w = self.space.wrap
+        w_d = self.space.newdict()
+        w_d.initialize_content([(w(1), w(1.5)), (w(2), w(2.5))])
+        assert self.space.listview_int(w_d) == [1, 2]
+
     def test_keys_on_string_unicode_int_dict(self, monkeypatch):
         w = self.space.wrap
         wb = self.space.newbytes
@@ -1194,6 +1206,103 @@ class AppTestStrategies(object):
         assert "IntDictStrategy" in self.get_strategy(d)
         assert d[1L] == "hi"
 
+    def test_empty_to_float(self):
+        d = {}
+        d[1.5] = "hi"
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+        d[-0.0] = "zero"
+        assert d[0.0] == "zero"
+        assert d.keys()[1] == -0.0 and str(d.keys()[1]) == "-0.0"
+        assert d.get(None) is None
+        assert d.get("x") is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[2.5] = 3
+        assert d.pop(2.5) == 3
+        assert sorted(d.items()) == [(-0.0, "zero"), (1.5, "hi")]
+        assert d.get(1) is None
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[1.5] == "hi"
+
+    def test_float_dict_int_lookup(self):
+        d = {1.0: "one"}
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        assert d[1] == "one"
+        assert d[1L] == "one"
+
+    def test_float_dict_nan(self):
+        nan = float("nan")
+        d = {1.5: 1}
+        assert d.get(nan) is None
+        assert "FloatDictStrategy" in self.get_strategy(d)
+        d[nan] = 2
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d[nan] == 2
+        d = {}
+        d[nan] = 3
+        assert d[nan] == 3
+        assert d.setdefault(nan, 4) == 3
+
+    def test_empty_to_int_float(self):
+        d = {}
+        d[1] = 1.5
+        assert "IntFloatDictStrategy" in self.get_strategy(d)
+        for i in range(10):
+            d[i] = d.get(i, 0.0) + 0.25
+        assert "IntFloatDictStrategy" in self.get_strategy(d)
+        assert d[1] == 1.75
+        assert type(d[2]) is float
+        assert d.setdefault(2, 5.0) == 0.25
+        assert d.setdefault(20, 5.0) == 5.0
+        assert d.setdefault(2, "x") == 0.25
+        assert "IntFloatDictStrategy" in self.get_strategy(d)
+        assert len(d) == 11
+        assert sorted(d.values())[-1] == 5.0
+        assert sorted(d.items())[:2] == [(0, 0.25), (1, 1.75)]
+        assert sorted(d.iteritems())[:2] == [(0, 0.25), (1, 1.75)]
+        assert sorted(d.itervalues())[-1] == 5.0
+        assert sorted(d.keys()) == range(10) + [20]
+        assert d.pop(20) == 5.0
+        assert d.pop(20, None) is None
+        raises(KeyError, d.pop, 20)
+        assert d.get("x") is None
+        d2 = d.copy()
+        assert "IntFloatDictStrategy" in self.get_strategy(d2)
+        assert d2 == d
+        k, v = d2.popitem()
+        assert d[k] == v and k not in d2
+        d2.update(d)
+        assert "IntFloatDictStrategy" in self.get_strategy(d2)
+        assert d2 == d
+        assert {1: 1.0} == {1: 1}
+        assert d[1L] == 1.75
+
+    def test_int_float_switch_to_int(self):
+        d = {1: 1.5, 2: 2.5}
+        assert "IntFloatDictStrategy" in self.get_strategy(d)
+        d[3] = "x"
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert d == {1: 1.5, 2: 2.5, 3: "x"}
+        d = {1: 1.5}
+        assert d.setdefault(3, 7) == 7
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert d == {1: 1.5, 3: 7}
+        d = {1: 1.5}
+        class F(float):
+            pass
+        d[2] = F(2.5)
+        assert "IntDictStrategy" in self.get_strategy(d)
+        assert type(d[2]) is F
+
+    def test_int_float_switch_to_object(self):
+        d = {1: 1.5, 2: 2.5}
+        d["a"] = 3.5
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+        assert d == {1: 1.5, 2: 2.5, "a": 3.5}
+        d = {1: 1.5, 2: 2.5}
+        assert d.get(1.0) == 1.5
+        assert "ObjectDictStrategy" in self.get_strategy(d)
+
     def test_iter_dict_length_change(self):
         d = {1: 2, 3: 4, 5: 6}
         it = d.iteritems()
@@ -51,6 +51,36 @@ class TestW_SpecialisedTupleObject():
         hash_test([1, 2, 3], must_be_specialized=False)
         hash_test([1 << 62, 0])
 
+    def test_homogeneous_tuples(self):
+        space = self.space
+        for values, cls in [([1, 2, 3], W_HomogeneousTupleObject_i),
+                            ([1.5, -2.0, 3.0, 4.0], W_HomogeneousTupleObject_f),
+                            (['a', 'bc', 'def'], W_HomogeneousTupleObject_s),
+                            ([42], W_HomogeneousTupleObject_i)]:
+            w_tuple = space.newtuple([space.wrap(value) for value in values])
+            assert type(w_tuple) is cls
+            assert w_tuple.storage == values
+            N_w_tuple = W_TupleObject([space.wrap(value) for value in values])
+            assert space.eq_w(w_tuple, N_w_tuple)
+            assert space.eq_w(N_w_tuple, w_tuple)
+            assert space.eq_w(space.hash(w_tuple), space.hash(N_w_tuple))
+
+    def test_not_homogeneous(self):
+        space = self.space
+        for values in [[1, 2.0, 3], [1, 2, 'a'], [1, 2, 3L], [1, 2, None]]:
+            w_tuple = space.newtuple([space.wrap(value) for value in values])
+            assert type(w_tuple) is W_TupleObject
+        assert type(space.newtuple([])) is W_TupleObject
+
+    def test_homogeneous_list_from_tuple(self):
+        space = self.space
+        w_tuple = space.newtuple([space.wrap(i) for i in range(5)])
+        w_list = space.call_function(space.w_list, w_tuple)
+        assert w_list.getitems_int() == range(5)
+        w_tuple = space.newtuple([space.wrap(i + 0.5) for i in range(5)])
+        w_list = space.call_function(space.w_list, w_tuple)
+        assert w_list.getitems_float() == [i + 0.5 for i in range(5)]
+
     try:
         from hypothesis import given, strategies
     except ImportError:
@@ -103,6 +133,70 @@ class AppTestW_SpecialisedTupleObject:
         assert not self.isspecialised((42, 43, 44, 45))
         assert not self.isspecialised((1.5,))
 
+    def w_ishomogeneous(self, obj, expected=''):
+        import __pypy__
+        r = __pypy__.internal_repr(obj)
+        return ("HomogeneousTupleObject" + expected) in r
+
+    def test_homogeneous(self):
+        assert self.ishomogeneous((42, 43, 44, 45), '_i')
+        assert self.ishomogeneous((1.5,), '_f')
+        assert self.ishomogeneous(('a', 'b', 'c'), '_s')
+        assert not self.ishomogeneous((1, 2.5, 3))
+        assert not self.ishomogeneous((1, 2, 3L))
+        assert not self.ishomogeneous((u'a', u'b', u'c'))
+        class I(int): pass
+        assert not self.ishomogeneous((1, I(2), 3))
+
+    def test_homogeneous_slicing(self):
+        t = tuple(range(10))
+        assert t[2:5] == (2, 3, 4)
+        assert self.ishomogeneous(t[2:5], '_i')
+        assert t[1:8:3] == (1, 4, 7)
+        assert self.ishomogeneous(t[1:8:3], '_i')
+        assert t[::-1] == tuple(range(9, -1, -1))
+        assert self.isspecialised(t[3:5], '_ii')
+        assert t[5:2] == ()
+        assert t[5:2:1] == ()
+        assert t[-3:] == (7, 8, 9)
+        t = (1.5, 2.5, 3.5, 4.5)
+        assert t[1:3] == (2.5, 3.5)
+        assert self.isspecialised(t[1:3], '_ff')
+        assert t[1:] == (2.5, 3.5, 4.5)
+        assert self.ishomogeneous(t[1:], '_f')
+
+    def test_homogeneous_eq_hash(self):
+        a = (1, 2, 3, 4)
+        b = tuple([1, 2, 3, 4])
+        assert a == b and not a != b
+        assert hash(a) == hash(b)
+        assert a == (1.0, 2.0, 3.0, 4.0)
+        assert hash(a) == hash((1.0, 2.0, 3.0, 4.0))
+        assert a == (1L, 2, 3, 4)
+        assert hash(a) == hash((1L, 2, 3, 4))
+        assert a != (1, 2, 3)
+        assert a != (1, 2, 3, 5)
+        assert a < (1, 2, 3, 5)
+        assert hash(('a', 'b', 'c')) == hash(tuple(['a', 'b'] + [u'c']))
+        assert ('a', 'b', 'c') == ('a', 'b', u'c')
+        N = float('nan')
+        assert (N, N, N) == (N, N, N)
+        assert (0.0, 0.0, 0.0) == (-0.0, -0.0, -0.0)
+        d = {(1, 2, 3): 'x', (1.5, 2.5, 3.5): 'y'}
+        assert d[tuple(range(1, 4))] == 'x'
+        assert d[(1.5, 2.5, 3.5)] == 'y'
+
+    def test_homogeneous_unpack(self):
+        x, y, z = (1, 2, 3)
+        assert (x, y, z) == (1, 2, 3)
+        a, b, c = t = (1.5, 2.5, 3.5)
+        assert type(a) is float and c == 3.5
+        assert list(t) == [1.5, 2.5, 3.5]
+        assert [i for i in (4, 5, 6)] == [4, 5, 6]
+        assert (1, 2, 3) + (4, 5) == (1, 2, 3, 4, 5)
+        assert 2 in (1, 2, 3) and 4 not in (1, 2, 3)
+        assert (1, 2, 3).index(3) == 2
+
     def test_slicing_to_specialised(self):
         t = (1, 2, 3)
         assert self.isspecialised(t[0:2])
@@ -82,6 +82,11 @@ class W_AbstractTupleObject(W_Root):
     def getitem(self, space, item):
         raise NotImplementedError
 
+    def has_numeric_storage(self):
+        """True if the items are stored as unwrapped ints or floats, in
+        which case unpackiterable_int() or unpackiterable_float() succeeds."""
+        return False
+
     def descr_len(self, space):
         result = self.length()
         return space.newint(result)
@@ -212,6 +217,9 @@ class W_AbstractTupleObject(W_Root):
     def descr_getslice(self, space, w_start, w_stop):
         length = self.length()
         start, stop = normalize_simple_slice(space, length, w_start, w_stop)
+        return self._getslice_simple(space, start, stop)
+
+    def _getslice_simple(self, space, start, stop):
         return space.newtuple(self.tolist()[start:stop])
 
     def descr_getnewargs(self, space):
@@ -298,6 +298,9 @@ class CompiledLoopToken(object):
         self.cpu = cpu
         self.number = number
         self.bridges_count = 0
+        # number of times a guard of this loop or of its bridges failed
+        # without a bridge to jump to
+        self.guard_failures = 0
         self.invalidate_positions = []
         # a list of weakrefs to looptokens that has been redirected to
         # this one
@@ -313,6 +316,15 @@ class CompiledLoopToken(object):
         debug_print("allocating Bridge #", self.bridges_count, "of Loop #", self.number)
         debug_stop("jit-mem-looptoken-alloc")
 
+    def get_code_size(self):
+        """Size of the blocks of machine code and data allocated for
+        the loop and its bridges so far."""
+        size = 0
+        if self.asmmemmgr_blocks is not None:
+            for rawstart, rawstop in self.asmmemmgr_blocks:
+                size += rawstop - rawstart
+        return size
+
     def update_frame_info(self, oldlooptoken, baseofs):
         new_fi = self.frame_info
         new_loop_tokens = []
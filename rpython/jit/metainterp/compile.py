@@ -1,3 +1,4 @@
+import time
 import weakref
 from rpython.rtyper.lltypesystem import lltype, llmemory
 from rpython.rtyper.annlowlevel import (
@@ -52,9 +53,11 @@ class CompileData(object):
         self.box_names_memo = memo
         optimizations = build_opt_chain(self.enable_opts)
         debug_start("jit-optimize")
+        t0 = time.time()
         try:
             return self.optimize(metainterp_sd, jitdriver_sd, optimizations)
         finally:
+            metainterp_sd.globaldata.optimize_time += time.time() - t0
             self.forget_optimization_info()
             debug_stop("jit-optimize")
 
@@ -497,6 +500,26 @@ def forget_optimization_info(lst, reset_values=False):
         if reset_values:
             item.reset_value()
 
+def record_compile_times(metainterp_sd, debug_info, backend_start):
+    """ Fill the times of 'debug_info', where 'backend_start' is when
+    the backend was called.  The tracing time is what remains of the time
+    since tracing started, once the optimizer is subtracted.  Start again
+    from now, in case the same tracing produces more code.
+    """
+    globaldata = metainterp_sd.globaldata
+    now = time.time()
+    debug_info.backend_time = now - backend_start
+    debug_info.optimize_time = globaldata.optimize_time
+    tracing_time = (backend_start - globaldata.trace_start_time -
+                    globaldata.optimize_time)
+    debug_info.tracing_time = max(tracing_time, 0.0)
+    globaldata.start_compile_times(now)
+
+def record_code_size(memmgr, jitcell_token):
+    clt = jitcell_token.compiled_loop_token
+    if clt is not None:
+        memmgr.set_code_size(jitcell_token, clt.get_code_size())
+
 def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
                          orig_inpargs, memo):
     forget_optimization_info(loop.operations)
@@ -528,6 +551,7 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
     metainterp_sd.profiler.start_backend()
     debug_start("jit-backend")
     log = have_debug_prints() or jl.jitlog_enabled()
+    t0 = time.time()
     try:
         loopname = jitdriver_sd.warmstate.get_location_str(greenkey)
         unique_id = jitdriver_sd.warmstate.get_unique_id(greenkey)
@@ -542,6 +566,7 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
     metainterp_sd.profiler.end_backend()
     if hooks is not None:
         debug_info.asminfo = asminfo
+        record_compile_times(metainterp_sd, debug_info, t0)
         hooks.after_compile(debug_info)
     metainterp_sd.stats.add_new_loop(loop)
     if not we_are_translated():
@@ -557,7 +582,9 @@ def send_loop_to_backend(greenkey, jitdriver_sd, metainterp_sd, loop, type,
                                       name=loopname)
     #
     if metainterp_sd.warmrunnerdesc is not None:    # for tests
-        metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(original_jitcell_token)
+        memmgr = metainterp_sd.warmrunnerdesc.memory_manager
+        memmgr.keep_loop_alive(original_jitcell_token)
+        record_code_size(memmgr, original_jitcell_token)
 
 def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
                            operations, original_loop_token, memo):
@@ -582,6 +609,7 @@ def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
     metainterp_sd.profiler.start_backend()
     debug_start("jit-backend")
     log = have_debug_prints() or jl.jitlog_enabled()
+    t0 = time.time()
     try:
         asminfo = do_compile_bridge(metainterp_sd, faildescr, inputargs,
                                     operations,
@@ -592,6 +620,7 @@ def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
     metainterp_sd.profiler.end_backend()
     if hooks is not None:
         debug_info.asminfo = asminfo
+        record_compile_times(metainterp_sd, debug_info, t0)
         hooks.after_compile_bridge(debug_info)
     if not we_are_translated():
         metainterp_sd.stats.compiled()
@@ -607,6 +636,9 @@ def send_bridge_to_backend(jitdriver_sd, metainterp_sd, faildescr, inputargs,
     #if metainterp_sd.warmrunnerdesc is not None:    # for tests
     #    metainterp_sd.warmrunnerdesc.memory_manager.keep_loop_alive(
     #        original_loop_token)
+    if metainterp_sd.warmrunnerdesc is not None:    # for tests
+        record_code_size(metainterp_sd.warmrunnerdesc.memory_manager,
+                         original_loop_token)
     return asminfo
 
 # ____________________________________________________________
@@ -690,6 +722,7 @@ class AbstractResumeGuardDescr(ResumeDescr):
         raise NotImplementedError("abstract base class")
 
     def handle_fail(self, deadframe, metainterp_sd, jitdriver_sd):
+        self.rd_loop_token.guard_failures += 1
         if (self.must_compile(deadframe, metainterp_sd, jitdriver_sd)
                 and not rstack.stack_almost_full()):
             self.start_compiling()
@@ -771,8 +804,13 @@ class AbstractResumeGuardDescr(ResumeDescr):
             hash = r_uint(current_object_addr_as_int(self) * 777767777 +
                           intval * 1442968193)
         #
-        increment = jitdriver_sd.warmstate.increment_trace_eagerness
-        return jitcounter.tick(hash, increment)
+        warmstate = jitdriver_sd.warmstate
+        if not jitcounter.tick(hash, warmstate.increment_trace_eagerness):
+            return False
+        if warmstate.defer_compilation:
+            warmstate.defer(hash)
+            return False
+        return True
 
     def start_compiling(self):
         # start tracing and compiling from this guard.
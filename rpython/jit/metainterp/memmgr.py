@@ -2,6 +2,7 @@ import math
 from rpython.rlib.rarithmetic import r_int64
 from rpython.rlib.debug import debug_start, debug_print, debug_stop
 from rpython.rlib.objectmodel import we_are_translated
+from rpython.rlib.listsort import make_timsort_class
 
 #
 # Logic to decide which loops are old and not used any more.
@@ -19,6 +20,13 @@ from rpython.rlib.objectmodel import we_are_translated
 # 'generation' field is much smaller than the current generation, and
 # removed from the set.
 #
+# In addition, there can be a budget for the size of the machine code of
+# the loops in 'alive_loops'.  When it is exceeded, the loops that were
+# least recently used (i.e. have the smallest 'generation') are removed
+# from the set until we are back to 3/4 of the budget.
+#
+
+TokenSort = make_timsort_class(lt=lambda a, b: a.generation < b.generation)
 
 class MemoryManager(object):
 
@@ -38,6 +46,12 @@ class MemoryManager(object):
         self.current_generation = r_int64(1)
         self.next_check = r_int64(-1)
         self.alive_loops = {}
+        # the machine code budget, in bytes, and the sum of 'code_size'
+        # of the loops in 'alive_loops'
+        self.code_budget = 0
+        self.total_code_size = 0
+        self.evicted_loops = 0
+        self.evicted_code_size = 0
 
     def set_max_age(self, max_age, check_frequency=0):
         if max_age <= 0:
@@ -49,6 +63,10 @@ class MemoryManager(object):
             self.check_frequency = check_frequency
             self.next_check = self.current_generation + 1
 
+    def set_code_budget(self, code_budget):
+        self.code_budget = code_budget
+        self._check_code_budget()
+
     def next_generation(self):
         self.current_generation += 1
         if self.current_generation == self.next_check:
@@ -58,7 +76,41 @@ class MemoryManager(object):
     def keep_loop_alive(self, looptoken):
         if looptoken.generation != self.current_generation:
             looptoken.generation = self.current_generation
-            self.alive_loops[looptoken] = None
+            if looptoken not in self.alive_loops:
+                self.alive_loops[looptoken] = None
+                self.total_code_size += looptoken.code_size
+
+    def set_code_size(self, looptoken, code_size):
+        """Record the size of the machine code of the loop and all its
+        bridges, after it changed."""
+        if looptoken in self.alive_loops:
+            self.total_code_size += code_size - looptoken.code_size
+        looptoken.code_size = code_size
+        self._check_code_budget()
+
+    def _check_code_budget(self):
+        if 0 < self.code_budget < self.total_code_size:
+            self._evict_cold_loops_now()
+
+    def _evict_cold_loops_now(self):
+        debug_start("jit-mem-evict")
+        debug_print("Code size before:", self.total_code_size)
+        target = self.code_budget - self.code_budget // 4
+        # the loops used in the current generation are not candidates:
+        # they include the one that was just compiled
+        candidates = [looptoken for looptoken in self.alive_loops
+                      if looptoken.generation != self.current_generation]
+        TokenSort(candidates).sort()
+        for looptoken in candidates:
+            if self.total_code_size <= target:
+                break
+            del self.alive_loops[looptoken]
+            self.total_code_size -= looptoken.code_size
+            self.evicted_loops += 1
+            self.evicted_code_size += looptoken.code_size
+        debug_print("Code size after: ", self.total_code_size)
+        debug_print("Loop tokens left:", len(self.alive_loops))
+        debug_stop("jit-mem-evict")
 
     def _kill_old_loops_now(self):
         debug_start("jit-mem-collect")
@@ -71,6 +123,7 @@ class MemoryManager(object):
             if (0 <= looptoken.generation < max_generation or
                 looptoken.invalidated):
                 del self.alive_loops[looptoken]
+                self.total_code_size -= looptoken.code_size
         newtotal = len(self.alive_loops)
         debug_print("Loop tokens freed: ", oldtotal - newtotal)
         debug_print("Loop tokens left:  ", newtotal)
@@ -86,4 +139,5 @@ class MemoryManager(object):
         debug_start("jit-mem-releaseall")
         debug_print("Loop tokens cleared:", len(self.alive_loops))
         self.alive_loops.clear()
+        self.total_code_size = 0
         debug_stop("jit-mem-releaseall")
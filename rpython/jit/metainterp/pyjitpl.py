@@ -1,4 +1,5 @@
 import sys
+import time
 
 import py
 
@@ -2312,6 +2313,13 @@ class MetaInterpGlobalData(object):
         self.initialized = False
         self.indirectcall_dict = None
         self.addr2name = None
+        # see compile.record_compile_times()
+        self.trace_start_time = 0.0
+        self.optimize_time = 0.0
+
+    def start_compile_times(self, now):
+        self.trace_start_time = now
+        self.optimize_time = 0.0
 
 # ____________________________________________________________
 
@@ -2803,6 +2811,7 @@ class MetaInterp(object):
         debug_start('jit-tracing')
         self.staticdata._setup_once()
         self.staticdata.profiler.start_tracing()
+        self.staticdata.globaldata.start_compile_times(time.time())
         assert jitdriver_sd is self.jitdriver_sd
         self.staticdata.try_to_free_some_loops()
         try:
@@ -2829,6 +2838,7 @@ class MetaInterp(object):
     def handle_guard_failure(self, resumedescr, deadframe):
         debug_start('jit-tracing')
         self.staticdata.profiler.start_tracing()
+        self.staticdata.globaldata.start_compile_times(time.time())
         key = resumedescr.get_resumestorage()
         assert isinstance(key, compile.ResumeGuardDescr)
         # store the resumekey.wref_original_loop_token() on 'self' to make
@@ -119,6 +119,39 @@ class JitHookInterfaceTests(object):
         self.meta_interp(loop, [1, 10], policy=JitPolicy(MyJitIface()))
         assert called == ["compile", "before_compile_bridge", "compile_bridge"]
 
+    def test_compile_times_and_guard_failures(self):
+        infos = []
+
+        class MyJitIface(JitHookInterface):
+            def after_compile(self, di):
+                infos.append(di)
+
+            def after_compile_bridge(self, di):
+                infos.append(di)
+
+        driver = JitDriver(greens = [], reds = ['i', 'n'])
+
+        def loop(n):
+            i = 0
+            while i < n:
+                driver.can_enter_jit(n=n, i=i)
+                driver.jit_merge_point(n=n, i=i)
+                if i >= 30:
+                    i += 2
+                i += 1
+
+        self.meta_interp(loop, [40], policy=JitPolicy(MyJitIface()))
+        assert [di.type for di in infos] == ["loop"]
+        di = infos[0]
+        # the clock may be too coarse to see any time pass: only check
+        # that the times were filled in
+        for name in ['tracing_time', 'optimize_time', 'backend_time']:
+            assert name in di.__dict__
+            assert getattr(di, name) >= 0.0
+        # the guard 'i >= 30' fails, but not often enough to get a bridge
+        clt = di.looptoken.compiled_loop_token
+        assert clt.guard_failures > 0
+
     def test_get_stats(self):
         driver = JitDriver(greens = [], reds = ['i', 's'])
 
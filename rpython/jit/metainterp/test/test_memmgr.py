@@ -21,6 +21,7 @@ from rpython.rlib import rgc
 class FakeLoopToken:
     generation = 0
     invalidated = False
+    code_size = 0
 
 
 class _TestMemoryManager:
@@ -79,6 +80,53 @@ class _TestMemoryManager:
                 assert tokens[i] in memmgr.alive_loops
 
 
+    def test_code_budget(self):
+        memmgr = MemoryManager()
+        memmgr.set_code_budget(1000)
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.set_code_size(token, 200)
+            memmgr.next_generation()
+        # every time the budget is exceeded, the least recently used loops
+        # are freed until we are below 750 bytes
+        assert memmgr.alive_loops == dict.fromkeys(tokens[6:])
+        assert memmgr.total_code_size == 800
+        assert memmgr.evicted_loops == 6
+        assert memmgr.evicted_code_size == 1200
+
+    def test_code_budget_lru(self):
+        memmgr = MemoryManager()
+        memmgr.set_code_budget(1000)
+        tokens = [FakeLoopToken() for i in range(5)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.set_code_size(token, 200)
+            memmgr.next_generation()
+        memmgr.keep_loop_alive(tokens[0])   # tokens[0] is used again
+        memmgr.next_generation()
+        memmgr.set_code_size(tokens[4], 300)   # a bridge is added
+        assert memmgr.alive_loops == dict.fromkeys([tokens[0], tokens[3],
+                                                    tokens[4]])
+        assert memmgr.total_code_size == 700
+        # a loop that is used again after being evicted is counted again
+        memmgr.keep_loop_alive(tokens[1])
+        assert memmgr.total_code_size == 900
+
+    def test_code_budget_disabled(self):
+        memmgr = MemoryManager()
+        tokens = [FakeLoopToken() for i in range(10)]
+        for token in tokens:
+            memmgr.keep_loop_alive(token)
+            memmgr.set_code_size(token, 200)
+            memmgr.next_generation()
+        assert memmgr.total_code_size == 2000
+        memmgr.set_code_budget(1000)
+        assert memmgr.total_code_size == 600
+        memmgr.release_all_loops()
+        assert memmgr.total_code_size == 0
+
+
 class _TestIntegration(LLJitMixin):
     # See comments in TestMemoryManager.  To get temporarily the normal
     # behavior just rename this class to TestIntegration.
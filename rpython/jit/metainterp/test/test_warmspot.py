@@ -109,6 +109,31 @@ class TestLLWarmspot(LLJitMixin):
         assert res == 0
         self.check_resops(new_with_vtable=0)
 
+    def test_set_param_defer_compilation(self):
+        myjitdriver = JitDriver(greens = [], reds = ['n', 'res'])
+        def g(n):
+            res = 0
+            while n > 0:
+                myjitdriver.can_enter_jit(n=n, res=res)
+                myjitdriver.jit_merge_point(n=n, res=res)
+                res += n
+                n -= 1
+            return res
+        def f(n, resume):
+            set_param(None, 'defer_compilation', 1)
+            res = g(n)
+            if resume:
+                set_param(None, 'defer_compilation', 0)
+                res += g(n)
+            return res
+
+        res = self.meta_interp(f, [100, 0])
+        assert res == 5050
+        self.check_trace_count(0)
+        res = self.meta_interp(f, [100, 1])
+        assert res == 2 * 5050
+        self.check_trace_count(1)
+
     def test_unwanted_loops(self):
         mydriver = JitDriver(reds = ['n', 'total', 'm'], greens = [])
 
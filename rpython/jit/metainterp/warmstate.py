@@ -229,6 +229,8 @@ class BaseJitCell(object):
 
 
 class WarmEnterState(object):
+    defer_compilation = False
+    deferred_hashes = None
 
     def __init__(self, warmrunnerdesc, jitdriver_sd):
         "NOT_RPYTHON"
@@ -296,6 +298,12 @@ class WarmEnterState(object):
             self.warmrunnerdesc.memory_manager is not None):   # all for tests
             self.warmrunnerdesc.memory_manager.set_max_age(value)
 
+    def set_param_code_budget(self, value):
+        # note: it's a global parameter, not a per-jitdriver one
+        if (self.warmrunnerdesc is not None and
+            self.warmrunnerdesc.memory_manager is not None):   # all for tests
+            self.warmrunnerdesc.memory_manager.set_code_budget(value * 1024)
+
     def set_param_retrace_limit(self, value):
         if self.warmrunnerdesc:
             if self.warmrunnerdesc.memory_manager:
@@ -328,6 +336,26 @@ class WarmEnterState(object):
     def set_param_vec_cost(self, ivalue):
         self.vec_cost = ivalue
 
+    def set_param_defer_compilation(self, ivalue):
+        self.defer_compilation = bool(ivalue)
+        if not ivalue:
+            self.resume_deferred_compilation()
+
+    def defer(self, hash):
+        # called instead of starting to trace, if 'defer_compilation' is set
+        if self.deferred_hashes is None:
+            self.deferred_hashes = {}
+        self.deferred_hashes[hash] = None
+
+    def resume_deferred_compilation(self):
+        deferred_hashes = self.deferred_hashes
+        if deferred_hashes is None:
+            return
+        self.deferred_hashes = None
+        jitcounter = self.warmrunnerdesc.jitcounter
+        for hash in deferred_hashes:
+            jitcounter.change_current_fraction(hash, 0.98)
+
     def disable_noninlinable_function(self, greenkey):
         cell = self.JitCell.ensure_jit_cell_at_key(greenkey)
         cell.flags |= JC_DONT_TRACE_HERE
@@ -426,6 +454,9 @@ class WarmEnterState(object):
             from rpython.jit.metainterp.pyjitpl import MetaInterp
             if not confirm_enter_jit(*args):
                 return
+            if self.defer_compilation:
+                self.defer(hash)
+                return
             jitcounter.decay_all_counters()
             if rstack.stack_almost_full():
                 return
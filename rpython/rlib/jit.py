@@ -570,6 +570,8 @@ PARAMETER_DOCS = {
     'trace_limit': 'number of recorded operations before we abort tracing with ABORT_TOO_LONG',
     'inlining': 'inline python functions or not (1/0)',
     'loop_longevity': 'a parameter controlling how long loops will be kept before being freed, an estimate',
+    'code_budget': 'if not 0, the size in KB of machine code above which '
+                   'the least recently used loops are freed',
     'retrace_limit': 'how many times we can try retracing before giving up',
     'pureop_historylength': 'how many pure operations the optimizer should remember for CSE (internal)',
     'max_retrace_guards': 'number of extra guards a retrace can cause',
@@ -583,6 +585,9 @@ PARAMETER_DOCS = {
     'vec_cost': 'threshold for which traces to bail. Unpacking increases the counter,'\
                 ' vector operation decrease the cost',
     'vec_all': 'try to vectorize trace loops that occur outside of the numpypy library',
+    'defer_compilation': 'if 1, loops and bridges that become hot are only '
+                         'remembered; they are traced and compiled soon '
+                         'after this is set back to 0',
 }
 
 PARAMETERS = {'threshold': 1039, # just above 1024, prime
@@ -592,6 +597,7 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'trace_limit': 6000,
               'inlining': 1,
               'loop_longevity': 1000,
+              'code_budget': 0,
               'retrace_limit': 0,
               'pureop_historylength': 16,
               'max_retrace_guards': 15,
@@ -602,6 +608,7 @@ PARAMETERS = {'threshold': 1039, # just above 1024, prime
               'vec': 0,
               'vec_all': 0,
               'vec_cost': 0,
+              'defer_compilation': 0,
               }
 unroll_parameters = unrolling_iterable(PARAMETERS.items())
 
@@ -1083,9 +1090,15 @@ class JitDebugInfo(object):
     looptoken - description of a loop
     fail_descr - fail descr or None
     asminfo - extra assembler information
+    tracing_time - seconds spent tracing (only valid in after_compile*)
+    optimize_time - seconds spent in the optimizer (idem)
+    backend_time - seconds spent in the backend (idem)
     """
 
     asminfo = None
+    tracing_time = 0.0
+    optimize_time = 0.0
+    backend_time = 0.0
     def __init__(self, jitdriver_sd, logger, looptoken, operations, type,
                  greenkey=None, fail_descr=None):
         self.jitdriver_sd = jitdriver_sd
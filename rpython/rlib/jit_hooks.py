@@ -132,6 +132,18 @@ def stats_asmmemmgr_used(warmrunnerdesc):
 def stats_memmgr_release_all(warmrunnerdesc):
     warmrunnerdesc.memory_manager.release_all_loops()
 
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_code_size(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.total_code_size
+
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_evicted_loops(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.evicted_loops
+
+@register_helper(annmodel.SomeInteger())
+def stats_memmgr_evicted_code_size(warmrunnerdesc):
+    return warmrunnerdesc.memory_manager.evicted_code_size
+
 # ---------------------- jitcell interface ----------------------
 
 def _new_hook(name, resulttype):
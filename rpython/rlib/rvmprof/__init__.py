@@ -38,6 +38,18 @@ def enable(fileno, interval, memory=0, native=0, real_time=0):
 def disable():
     _get_vmprof().disable()
 
+def enable_aggregation(interval, max_nodes, native=0, real_time=0):
+    _get_vmprof().enable_aggregation(interval, max_nodes, native, real_time)
+
+def get_aggregated(reset=False):
+    return _get_vmprof().get_aggregated(reset)
+
+def get_code_names(names):
+    _get_vmprof().get_code_names(names)
+
+def resolve_native_addr(addr):
+    return _get_vmprof().resolve_native_addr(addr)
+
 def is_enabled():
     vmp = _get_vmprof()
     return vmp.is_enabled
@@ -89,6 +89,9 @@ def make_eci():
         eci_kwds['separate_module_files'].append(
             SHARED.join('vmprof_mt.c'),
         )
+        eci_kwds['separate_module_files'].append(
+            SHARED.join('vmprof_aggregate.c'),
+        )
     make_eci.called = True
     return ExternalCompilationInfo(**eci_kwds), eci_kwds
 make_eci.called = False
@@ -149,6 +152,28 @@ def setup():
                                             lltype.Void, compilation_info=eci,
                                             _nowrapper=True)
 
+    vmprof_aggregate_init = rffi.llexternal("vmprof_aggregate_init",
+                                            [lltype.Signed], rffi.INT,
+                                            compilation_info=eci)
+    vmprof_aggregate_teardown = rffi.llexternal("vmprof_aggregate_teardown",
+                                                [], lltype.Void,
+                                                compilation_info=eci)
+    vmprof_aggregate_count = rffi.llexternal("vmprof_aggregate_count", [],
+                                             lltype.Signed,
+                                             compilation_info=eci,
+                                             _nowrapper=True)
+    vmprof_aggregate_dump = rffi.llexternal("vmprof_aggregate_dump",
+                                            [rffi.SIGNEDP, lltype.Signed,
+                                             rffi.INT],
+                                            lltype.Signed,
+                                            compilation_info=eci,
+                                            _nowrapper=True)
+    vmprof_resolve_native_addr = rffi.llexternal(
+                                     "vmprof_resolve_native_addr",
+                                     [lltype.Signed, rffi.CCHARP, rffi.INT,
+                                      rffi.INTP, rffi.CCHARP, rffi.INT],
+                                     rffi.INT, compilation_info=eci)
+
     return CInterface(locals())
 
 
@@ -20,6 +20,18 @@ class DummyVMProf(object):
     def disable(self):
         pass
 
+    def enable_aggregation(self, interval, max_nodes, native=0, real_time=0):
+        pass
+
+    def get_aggregated(self, reset=False):
+        return []
+
+    def get_code_names(self, names):
+        pass
+
+    def resolve_native_addr(self, addr):
+        return ""
+
     def start_sampling(self):
         pass
 
@@ -21,6 +21,8 @@ VMPROF_BLACKHOLE_TAG = 2
 VMPROF_JITTED_TAG = 3
 VMPROF_JITTING_TAG = 4
 VMPROF_GC_TAG = 5
+VMPROF_ASSEMBLER_TAG = 6
+VMPROF_NATIVE_TAG = 7
 
 class VMProfError(Exception):
     msg = ''   # annotation hack
@@ -49,12 +51,16 @@ class VMProf(object):
         "use _get_vmprof()"
         self._code_classes = set()
         self._gather_all_code_objs = lambda: None
+        self._find_code_names = lambda names: None
         self._cleanup_()
         self._code_unique_id = 4
         self.cintf = cintf.setup()
 
     def _cleanup_(self):
         self.is_enabled = False
+        self.is_aggregating = False
+        self._has_aggregated_tree = False
+        self._null_fileno = -1
 
     @jit.dont_look_inside
     @specialize.argtype(1)
@@ -71,9 +77,9 @@ class VMProf(object):
             uid = self._code_unique_id + 4
             code._vmprof_unique_id = uid
             self._code_unique_id = uid
-            if self.is_enabled:
+            if self.is_enabled and not self.is_aggregating:
                 self._write_code_registration(uid, full_name_func(code))
-            elif self.use_weaklist:
+            if self.use_weaklist:
                 code._vmprof_weak_list.add_handle(code)
 
     @not_rpython
@@ -127,6 +133,18 @@ class VMProf(object):
         # the types of code objects
         prev = self._gather_all_code_objs
         self._gather_all_code_objs = gather_all_code_objs
+        #
+        def find_code_names(names):
+            all_code_wrefs = CodeClass._vmprof_weak_list.get_all_handles()
+            for wref in all_code_wrefs:
+                code = wref()
+                if code is not None:
+                    uid = code._vmprof_unique_id
+                    if uid in names:
+                        names[uid] = full_name_func(code)
+            prev_find(names)
+        prev_find = self._find_code_names
+        self._find_code_names = find_code_names
 
     @jit.dont_look_inside
     def enable(self, fileno, interval, memory=0, native=0, real_time=0):
@@ -143,6 +161,7 @@ class VMProf(object):
             native = 0 # force disabled on Windows
         lines = 0 # not supported on PyPy currently
 
+        self._free_aggregated_tree()
         p_error = self.cintf.vmprof_init(fileno, interval, memory, lines, "pypy", native, real_time)
         if p_error:
             raise VMProfError(rffi.charp2str(p_error))
@@ -162,8 +181,111 @@ class VMProf(object):
             raise VMProfError("vmprof is not enabled")
         self.is_enabled = False
         res = self.cintf.vmprof_disable()
+        if self.is_aggregating:
+            self.is_aggregating = False
+            os.close(self._null_fileno)
+            self._null_fileno = -1
+        if res < 0:
+            raise VMProfError(os.strerror(rposix.get_saved_errno()))
+
+    @jit.dont_look_inside
+    def enable_aggregation(self, interval, max_nodes, native=0, real_time=0):
+        """Enable vmprof without a file: the samples are counted in
+        memory, in a tree of stacks of at most 'max_nodes' nodes, which
+        get_aggregated() returns.  When the tree is full, a sample is
+        counted in the deepest of its frames that is already in the tree.
+        Raises VMProfError if something goes wrong.
+        """
+        if self.is_enabled:
+            raise VMProfError("vmprof is already enabled")
+        if PLAT_WINDOWS:
+            raise VMProfError("aggregation is not supported on Windows")
+        if max_nodes < 1:
+            raise VMProfError("bad value for 'max_nodes'")
+        self._free_aggregated_tree()
+        if self.cintf.vmprof_aggregate_init(max_nodes) < 0:
+            raise VMProfError("out of memory")
+        self._has_aggregated_tree = True
+        # the header is still written, but nothing else
+        try:
+            fileno = os.open('/dev/null', os.O_WRONLY, 0)
+        except OSError as e:
+            raise VMProfError(os.strerror(e.errno))
+        p_error = self.cintf.vmprof_init(fileno, interval, 0, 0, "pypy",
+                                         native, real_time)
+        if p_error:
+            os.close(fileno)
+            raise VMProfError(rffi.charp2str(p_error))
+        res = self.cintf.vmprof_enable(0, native, real_time)
         if res < 0:
+            os.close(fileno)
             raise VMProfError(os.strerror(rposix.get_saved_errno()))
+        self._null_fileno = fileno
+        self.is_aggregating = True
+        self.is_enabled = True
+
+    def _free_aggregated_tree(self):
+        if not PLAT_WINDOWS and self._has_aggregated_tree:
+            self.cintf.vmprof_aggregate_teardown()
+            self._has_aggregated_tree = False
+
+    @jit.dont_look_inside
+    def get_aggregated(self, reset=False):
+        """Return the tree of samples counted since enable_aggregation(),
+        as a list of tuples (parent, kind, value, count).  'parent' is
+        the index of the parent node in the list, or -1 for the root,
+        which is the first item.  'kind' and 'value' are one of the
+        VMPROF_xxx_TAG and the unique id of the code object, or the
+        address of the native function for VMPROF_NATIVE_TAG.  'count'
+        is the number of samples whose innermost frame is the node.
+        With 'reset', the tree is emptied.  This can also be called
+        after disable(), but not after enable() again.
+        """
+        if PLAT_WINDOWS or not self._has_aggregated_tree:
+            raise VMProfError("vmprof aggregation was not enabled")
+        if self.is_enabled:
+            self.stop_sampling()
+        try:
+            length = self.cintf.vmprof_aggregate_count()
+            array_p = lltype.malloc(rffi.SIGNEDP.TO, 4 * length, flavor='raw')
+            try:
+                n = self.cintf.vmprof_aggregate_dump(array_p, length,
+                                                     rffi.cast(rffi.INT, reset))
+                result = []
+                for i in range(n):
+                    result.append((array_p[4 * i], array_p[4 * i + 1],
+                                   array_p[4 * i + 2], array_p[4 * i + 3]))
+            finally:
+                lltype.free(array_p, flavor='raw')
+        finally:
+            if self.is_enabled:
+                self.start_sampling()
+        return result
+
+    def get_code_names(self, names):
+        """Fill the dict 'names', whose keys are unique ids, with the names
+        of the code objects that are still alive.
+        """
+        self._find_code_names(names)
+
+    def resolve_native_addr(self, addr):
+        """Return the name of the native function at 'addr', of the form
+        'n:func_name:line:filename'.
+        """
+        size = MAX_FUNC_NAME + 1
+        name = lltype.malloc(rffi.CCHARP.TO, size, flavor='raw', zero=True)
+        srcfile = lltype.malloc(rffi.CCHARP.TO, size, flavor='raw', zero=True)
+        lineno = lltype.malloc(rffi.INTP.TO, 1, flavor='raw', zero=True)
+        try:
+            self.cintf.vmprof_resolve_native_addr(addr, name, size - 1,
+                                                  lineno, srcfile, size - 1)
+            return "n:%s:%d:%s" % (rffi.charp2str(name),
+                                   rffi.cast(lltype.Signed, lineno[0]),
+                                   rffi.charp2str(srcfile))
+        finally:
+            lltype.free(lineno, flavor='raw')
+            lltype.free(srcfile, flavor='raw')
+            lltype.free(name, flavor='raw')
 
 
     def _write_code_registration(self, uid, name):
@@ -17,6 +17,7 @@
 #include "shared/vmprof_get_custom_offset.h"
 #ifdef VMPROF_UNIX
 #include "shared/vmprof_unix.h"
+#include "shared/symboltable.h"
 #else
 #include "shared/vmprof_win.h"
 #endif
@@ -46,3 +47,14 @@ void vmprof_start_sampling(void)
 {
     vmprof_ignore_signals(0);
 }
+
+int vmprof_resolve_native_addr(intptr_t addr, char *name, int name_len,
+                               int *lineno, char *srcfile, int srcfile_len)
+{
+#ifdef VMPROF_UNIX
+    return vmp_resolve_addr((void *)addr, name, name_len, lineno,
+                            srcfile, srcfile_len);
+#else
+    return 1;
+#endif
+}
@@ -40,6 +40,12 @@ RPY_EXTERN intptr_t vmprof_get_traceback(void *, void *, intptr_t*, intptr_t);
 RPY_EXTERN long vmprof_get_profile_path(char *, long);
 RPY_EXTERN int vmprof_stop_sampling(void);
 RPY_EXTERN void vmprof_start_sampling(void);
+RPY_EXTERN int vmprof_aggregate_init(long);
+RPY_EXTERN void vmprof_aggregate_teardown(void);
+RPY_EXTERN long vmprof_aggregate_count(void);
+RPY_EXTERN long vmprof_aggregate_dump(intptr_t *, long, int);
+RPY_EXTERN int vmprof_resolve_native_addr(intptr_t, char *, int, int *,
+                                          char *, int);
 
 long vmprof_write_header_for_jit_addr(intptr_t *result, long n,
                                       intptr_t addr, int max_depth);
@@ -0,0 +1,136 @@
+#include "vmprof_aggregate.h"
+
+#include <stdlib.h>
+
+typedef struct {
+    intptr_t kind;
+    intptr_t value;
+    long parent;
+    long first_child;
+    long next_sibling;
+    long count;          /* number of samples that ended in this node */
+} aggregate_node_t;
+
+/* node 0 is the root, it has no kind and no value */
+static aggregate_node_t *nodes = NULL;
+static long nodes_max = 0;
+static long nodes_used = 0;
+static volatile long nodes_lock = 0;
+
+static void _reset_nodes(void)
+{
+    nodes[0].kind = 0;
+    nodes[0].value = 0;
+    nodes[0].parent = -1;
+    nodes[0].first_child = -1;
+    nodes[0].next_sibling = -1;
+    nodes[0].count = 0;
+    nodes_used = 1;
+}
+
+int vmprof_aggregate_init(long max_nodes)
+{
+    /* must not be called while the signal handler can run */
+    if (max_nodes < 1)
+        return -1;
+    free(nodes);
+    nodes = malloc(max_nodes * sizeof(aggregate_node_t));
+    if (nodes == NULL) {
+        nodes_max = 0;
+        return -1;
+    }
+    nodes_max = max_nodes;
+    _reset_nodes();
+    return 0;
+}
+
+void vmprof_aggregate_teardown(void)
+{
+    /* must not be called while the signal handler can run */
+    free(nodes);
+    nodes = NULL;
+    nodes_max = 0;
+    nodes_used = 0;
+}
+
+int vmprof_aggregate_enabled(void)
+{
+    return nodes != NULL;
+}
+
+static long _find_or_add_child(long parent, intptr_t kind, intptr_t value)
+{
+    long i = nodes[parent].first_child;
+    while (i >= 0) {
+        if (nodes[i].kind == kind && nodes[i].value == value)
+            return i;
+        i = nodes[i].next_sibling;
+    }
+    if (nodes_used == nodes_max)
+        return -1;     /* full */
+    i = nodes_used++;
+    nodes[i].kind = kind;
+    nodes[i].value = value;
+    nodes[i].parent = parent;
+    nodes[i].first_child = -1;
+    nodes[i].next_sibling = nodes[parent].first_child;
+    nodes[i].count = 0;
+    nodes[parent].first_child = i;
+    return i;
+}
+
+void vmprof_aggregate_sample(void **stack, long depth)
+{
+    /* Called from the signal handler, with 'stack' containing 'depth'
+       items, which are (kind, value) pairs starting from the innermost
+       frame.  If the tree is full, the sample is counted in the deepest
+       node that already exists.  If another thread is adding a sample
+       at the same time, this one is dropped. */
+    long i, child, node = 0;
+
+    if (!__sync_bool_compare_and_swap(&nodes_lock, 0, 1))
+        return;
+    for (i = (depth & ~1L) - 2; i >= 0; i -= 2) {
+        intptr_t kind = (intptr_t)stack[i];
+        if (kind == VMPROF_ASSEMBLER_TAG)
+            continue;   /* the start address of the machine code */
+        child = _find_or_add_child(node, kind, (intptr_t)stack[i + 1]);
+        if (child < 0)
+            break;
+        node = child;
+    }
+    nodes[node].count++;
+    __sync_lock_release(&nodes_lock);
+}
+
+long vmprof_aggregate_count(void)
+{
+    return nodes_used;
+}
+
+long vmprof_aggregate_dump(intptr_t *result, long max_nodes, int reset)
+{
+    /* Write 4 items (parent, kind, value, count) per node in 'result',
+       parents before their children.  Returns the number of nodes, or
+       -1 if there are more than 'max_nodes'.  Call this only after
+       vmprof_stop_sampling(). */
+    long i, n;
+
+    while (!__sync_bool_compare_and_swap(&nodes_lock, 0, 1)) {
+    }
+    n = nodes_used;
+    if (n > max_nodes) {
+        __sync_lock_release(&nodes_lock);
+        return -1;
+    }
+    for (i = 0; i < n; i++) {
+        result[4 * i] = nodes[i].parent;
+        result[4 * i + 1] = nodes[i].kind;
+        result[4 * i + 2] = nodes[i].value;
+        result[4 * i + 3] = nodes[i].count;
+    }
+    if (reset && n > 0)
+        _reset_nodes();
+    __sync_lock_release(&nodes_lock);
+    return n;
+}
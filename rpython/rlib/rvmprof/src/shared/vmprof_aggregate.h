@@ -0,0 +1,20 @@
+#pragma once
+
+/* In-memory aggregation of the samples: instead of being written to the
+ * profile file, each stack trace is added to a tree of (kind, value)
+ * nodes, counting how many samples ended in each node.  The tree has a
+ * fixed maximum number of nodes, allocated by vmprof_aggregate_init().
+ */
+
+#include "vmprof.h"
+
+#include <stdint.h>
+
+RPY_EXTERN int vmprof_aggregate_init(long max_nodes);
+RPY_EXTERN void vmprof_aggregate_teardown(void);
+RPY_EXTERN long vmprof_aggregate_count(void);
+RPY_EXTERN long vmprof_aggregate_dump(intptr_t *result, long max_nodes,
+                                      int reset);
+
+int vmprof_aggregate_enabled(void);
+void vmprof_aggregate_sample(void **stack, long depth);
@@ -24,6 +24,7 @@
 #include "vmprof_getpc.h"
 #include "vmprof_common.h"
 #include "vmprof_memory.h"
+#include "vmprof_aggregate.h"
 #include "compat.h"
 
 
@@ -245,7 +246,11 @@ void sigprof_handler(int sig_nr, siginfo_t* info, void *ucontext)
 #else
             commit = _vmprof_sample_stack(p, tstate, (ucontext_t*)ucontext);
 #endif
-            if (commit) {
+            if (commit && vmprof_aggregate_enabled()) {
+                struct prof_stacktrace_s *st = (struct prof_stacktrace_s *)p->data;
+                vmprof_aggregate_sample(st->stack, st->depth);
+                cancel_buffer(p);
+            } else if (commit) {
                 commit_buffer(fd, p);
             } else {
 #if DEBUG
@@ -148,6 +148,41 @@ class TestEnable(RVMProfSamplingTest):
         assert all(p[-1] > 0 for p in prof.profiles)
 
 
+class TestAggregation(RVMProfSamplingTest):
+
+    ENTRY_POINT_ARGS = (int, float)
+    def entry_point(self, value, delta_t):
+        code = self.MyCode('py:code:52:test_aggregation')
+        rvmprof.register_code(code, self.MyCode.get_name)
+        rvmprof.enable_aggregation(self.SAMPLING_INTERVAL, 100)
+        start = time.time()
+        while time.time() < start+delta_t:
+            self.main(code, value)
+        rvmprof.disable()
+        uid = rvmprof.get_unique_id(code)
+        names = {uid: ''}
+        rvmprof.get_code_names(names)
+        assert names[uid] == 'py:code:52:test_aggregation'
+        res = 0
+        for parent, kind, code_id, count in rvmprof.get_aggregated(True):
+            if kind == rvmprof.rvmprof.VMPROF_CODE_TAG and code_id == uid:
+                res += count
+        nodes = rvmprof.get_aggregated()
+        assert len(nodes) == 1 and nodes[0][3] == 0     # only the root
+        return res
+
+    @rvmprof.vmprof_execute_code("xcode1", lambda self, code, count: code)
+    def main(self, code, count):
+        s = 0
+        for i in range(count):
+            s += (i << 1)
+        return s
+
+    def test(self):
+        res = self.rpy_entry_point(10**4, 0.5)
+        assert self.approx_equal(res, 0.5/self.SAMPLING_INTERVAL)
+
+
 class TestNative(RVMProfSamplingTest):
 
     @pytest.fixture
@@ -1,7 +1,8 @@
 
 from zipfile import ZIP_STORED, ZIP_DEFLATED
-from rpython.rlib.streamio import open_file_as_stream
+from rpython.rlib.streamio import open_file_as_stream, Stream
 from rpython.rlib.rstruct.runpack import runpack
+from rpython.rlib import rmmap
 from rpython.rlib.rarithmetic import r_uint, intmask
 from rpython.rtyper.tool.rffi_platform import CompilationError
 import os
@@ -191,8 +192,41 @@ class RZipInfo(object):
         # compress_size         Size of the compressed file
         # file_size             Size of the uncompressed file
 
+class MMapReader(Stream):
+    """The part of the stream interface that RZipFile needs, reading from
+    a read-only mapping of the whole archive."""
+
+    def __init__(self, map):
+        self.map = map
+        self.size = intmask(map.size)
+        self.pos = 0
+
+    def seek(self, offset, whence):
+        offset = intmask(offset)
+        if whence == 2:
+            offset += self.size
+        if not 0 <= offset <= self.size:
+            raise BadZipfile("Truncated zip file")
+        self.pos = offset
+
+    def tell(self):
+        return self.pos
+
+    def read(self, n):
+        pos = self.pos
+        n = min(intmask(n), self.size - pos)
+        self.pos = pos + n
+        return self.map.getslice(pos, n)
+
+    def readall(self):
+        return self.read(self.size)
+
+    def close(self):
+        pass      # the mapping belongs to the RZipFile, see RZipFile.close()
+
 class RZipFile(object):
-    def __init__(self, zipname, mode='r', compression=ZIP_STORED):
+    def __init__(self, zipname, mode='r', compression=ZIP_STORED,
+                 use_mmap=False):
         if mode != 'r':
             raise TypeError("Read only support by now")
         self.compression = compression
@@ -202,6 +236,18 @@ class RZipFile(object):
         if 'b' not in mode:
             mode += 'b'
         self.mode = mode
+        # with use_mmap, the archive is mapped once and the members are
+        # copied from the mapping, instead of opening the file every time
+        self.map = None
+        if use_mmap:
+            fd = os.open(zipname, os.O_RDONLY, 0)
+            try:
+                try:
+                    self.map = rmmap.mmap(fd, 0, access=rmmap.ACCESS_READ)
+                except rmmap.RMMapError:
+                    raise BadZipfile("File is not a zip file")
+            finally:
+                os.close(fd)
         fp = self.get_fp()
         try:
             self._GetContents(fp)
@@ -209,8 +255,25 @@ class RZipFile(object):
             fp.close()
 
     def get_fp(self):
+        if self.map is not None:
+            return MMapReader(self.map)
         return open_file_as_stream(self.filename, self.mode, 1024)
 
+    def check_truncated(self):
+        """With use_mmap, raise BadZipfile if the archive became shorter
+        than the mapping: reading past the end of the file would crash.
+        This costs an fstat(), so callers reading several members in a
+        row call it once and pass check_truncated=False to read()."""
+        if self.map is not None and self.map.file_size() < self.map.size:
+            raise BadZipfile("Zip file was truncated")
+
+    def close(self):
+        """Release the mapping of the archive, if any.  The members can
+        still be read afterwards, by opening the file again."""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
     def _GetContents(self, fp):
         endrec = _EndRecData(fp)
         if not endrec:
@@ -274,8 +337,10 @@ class RZipFile(object):
         """Return the instance of ZipInfo given 'filename'."""
         return self.NameToInfo[filename]
 
-    def read(self, filename):
+    def read(self, filename, check_truncated=True):
         zinfo = self.getinfo(filename)
+        if check_truncated:
+            self.check_truncated()
         fp = self.get_fp()
         try:
             filepos = fp.tell()
@@ -299,7 +364,11 @@ class RZipFile(object):
             else:
                 raise BadZipfile("Unsupported compression method %d for "
                                  "file %s" % (zinfo.compress_type, filename))
-            crc = crc32(bytes)
+            if rzlib is not None:
+                assert bytes is not None
+                crc = rzlib.crc32(bytes)
+            else:
+                crc = crc32(bytes)
             if crc != zinfo.CRC:
                 raise BadZipfile("Bad CRC-32 for file %s" % filename)
             return bytes
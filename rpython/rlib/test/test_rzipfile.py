@@ -43,6 +43,52 @@ class BaseTestRZipFile(BaseRtypingTest):
         assert one()
         assert self.interpret(one, [])
 
+    def test_rzipfile_mmap(self):
+        zipname = self.zipname
+        compression = self.compression
+        def one():
+            rzip = RZipFile(zipname, "r", compression, use_mmap=True)
+            return (rzip.read('one') == 'stuff\n' and
+                    rzip.read('dir' + os.path.sep + 'two') == 'otherstuff' and
+                    rzip.read('three') == 'hello, world')
+
+        assert one()
+        assert self.interpret(one, [])
+
+    def test_rzipfile_mmap_close(self):
+        zipname = self.zipname
+        compression = self.compression
+        def one():
+            rzip = RZipFile(zipname, "r", compression, use_mmap=True)
+            rzip.close()
+            rzip.close()
+            return (rzip.map is None and
+                    rzip.read('one') == 'stuff\n')
+
+        assert one()
+        assert self.interpret(one, [])
+
+    def test_rzipfile_mmap_truncated(self):
+        from rpython.rlib.rzipfile import BadZipfile
+        tmpdir = udir.ensure('zipimport_%s' % self.__class__.__name__, dir=1)
+        fn = tmpdir.join("truncated.zip")
+        fn.write(py.path.local(self.zipname).read('rb'), 'wb')
+        rzip = RZipFile(str(fn), "r", self.compression, use_mmap=True)
+        rzip.check_truncated()
+        with open(str(fn), 'r+b') as f:
+            f.truncate(10)
+        py.test.raises(BadZipfile, rzip.check_truncated)
+        py.test.raises(BadZipfile, rzip.read, 'one')
+        rzip.close()
+
+    def test_rzipfile_mmap_not_a_zip(self):
+        from rpython.rlib.rzipfile import BadZipfile
+        tmpdir = udir.ensure('zipimport_%s' % self.__class__.__name__, dir=1)
+        for data in ['', 'x', 'not a zip file' * 100]:
+            fn = tmpdir.join("notazip.zip")
+            fn.write(data)
+            py.test.raises(BadZipfile, RZipFile, str(fn), "r", use_mmap=True)
+
 class TestRZipFile(BaseTestRZipFile):
     compression = ZIP_STORED
 